@@ -0,0 +1,156 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import functools
+
+from openstack import proxy
+from rackspace.cdn.v1 import bulk
+from rackspace.cdn.v1 import service as _service
+
+
+class Proxy(proxy.BaseProxy):
+
+    def services(self, **query):
+        """Return a generator of services
+
+        :param kwargs \*\*query: Optional query parameters to be sent to limit
+                                 the resources being returned.
+
+        :returns: A generator of service objects
+        :rtype: :class:`~rackspace.cdn.v1.service.Service`
+        """
+        return self._list(_service.Service, paginated=True, **query)
+
+    def get_service(self, value):
+        """Get a single service
+
+        :param value: The value can be the ID of a service or a
+               :class:`~rackspace.cdn.v1.service.Service` instance.
+
+        :returns: One :class:`~rackspace.cdn.v1.service.Service`
+        :raises: :class:`~openstack.exceptions.ResourceNotFound`
+                 when no resource can be found.
+        """
+        return self._get(_service.Service, value)
+
+    def find_service(self, name_or_id, ignore_missing=True):
+        """Find a single service
+
+        :param name_or_id: The name or ID of a service.
+        :param bool ignore_missing: When set to ``False``
+                    :class:`~openstack.exceptions.ResourceNotFound` will be
+                    raised when the resource does not exist.
+                    When set to ``True``, None will be returned when
+                    attempting to find a nonexistent resource.
+        :returns: One :class:`~rackspace.cdn.v1.service.Service` or None
+        """
+        return self._find(_service.Service, name_or_id,
+                          ignore_missing=ignore_missing)
+
+    def delete_service(self, value, ignore_missing=True):
+        """Delete a service
+
+        :param value: The value can be either the ID of a service or a
+               :class:`~rackspace.cdn.v1.service.Service` instance.
+        :param bool ignore_missing: When set to ``False``
+                    :class:`~openstack.exceptions.ResourceNotFound` will be
+                    raised when the service does not exist.
+                    When set to ``True``, no exception will be set when
+                    attempting to delete a nonexistent service.
+        :returns: ``None``
+        """
+        self._delete(_service.Service, value, ignore_missing=ignore_missing)
+
+    def purge_assets(self, value, url=None):
+        """Purge cached content of a service from the edge
+
+        :param value: The value can be either the ID of a service or a
+               :class:`~rackspace.cdn.v1.service.Service` instance.
+        :param str url: The path of the asset to purge. When not given,
+            every asset of the service is purged.
+
+        :returns: ``None``
+        """
+        res = self._get_resource(_service.Service, value)
+        res.purge(self.session, url)
+
+    def purge_batcher(self, window=1.0, max_paths=None, workers=4, rate=10,
+                      retries=3):
+        """Create a batcher which collects purges and sends them together
+
+        :param float window: How long to hold paths for a service before
+            purging them, in seconds.
+        :param int max_paths: Purge every asset of a service instead when
+            more paths than this are queued for it. By default paths are
+            always purged one by one.
+        :param int workers: The most requests to have in flight at once.
+        :param float rate: The most requests to start per second.
+        :param int retries: The most times to retry a throttled request.
+
+        :rtype: :class:`~rackspace.cdn.v1.bulk.PurgeBatcher`
+        """
+        return bulk.PurgeBatcher(self.session, window=window,
+                                 max_paths=max_paths, workers=workers,
+                                 rate=rate, retries=retries)
+
+    def bulk_purge(self, purges, max_paths=None, workers=4, rate=10,
+                   retries=3):
+        """Purge many paths across services at once
+
+        Duplicate paths are purged once. When ``max_paths`` is set, services
+        with more paths than that have every asset purged in one request
+        instead.
+
+        :param purges: An iterable of ``(service, path)`` tuples, where
+            ``service`` is the ID of a service or a
+            :class:`~rackspace.cdn.v1.service.Service` instance.
+        :param int max_paths: The most paths to purge one by one for a
+            service. By default paths are always purged one by one.
+        :param int workers: The most requests to have in flight at once.
+        :param float rate: The most requests to start per second.
+        :param int retries: The most times to retry a throttled request.
+
+        :returns: A summary of the requests made
+        :rtype: :class:`~rackspace.cdn.v1.bulk.BatchResult`
+        """
+        batcher = bulk.PurgeBatcher(self.session, window=float("inf"),
+                                    max_paths=max_paths, workers=workers,
+                                    rate=rate, retries=retries)
+        for service, path in purges:
+            batcher.add(service, [path])
+        return batcher.flush()
+
+    def bulk_publish(self, updates, workers=4, rate=10, retries=3):
+        """Change the configuration of many services at once
+
+        The operations for each service are sent together in one request,
+        in the order they were given.
+
+        :param updates: An iterable of ``(service, operation)`` tuples,
+            where ``service`` is the ID of a service or a
+            :class:`~rackspace.cdn.v1.service.Service` instance and
+            ``operation`` is a JSON Patch operation.
+        :param int workers: The most requests to have in flight at once.
+        :param float rate: The most requests to start per second.
+        :param int retries: The most times to retry a throttled request.
+
+        :returns: A summary of the requests made
+        :rtype: :class:`~rackspace.cdn.v1.bulk.BatchResult`
+        """
+        calls = [(service_id, operations,
+                  functools.partial(
+                      _service.Service.existing(id=service_id).publish,
+                      operations=operations))
+                 for service_id, operations
+                 in bulk.group_operations(updates).items()]
+        return bulk.run(self.session, calls, workers, rate, retries)
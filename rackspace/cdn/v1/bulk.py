@@ -0,0 +1,195 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import collections
+import functools
+import threading
+import time
+
+from rackspace.cdn.v1 import service as _service
+from rackspace import utils
+
+
+class BatchResult(object):
+    """A summary of a batch of CDN requests
+
+    :ivar int sent: How many requests succeeded.
+    :ivar list failed: A ``(service_id, request, exception)`` tuple for
+        each request which failed, where ``request`` is the purged path,
+        ``None`` for a purge of every asset, or the list of operations
+        which could not be published.
+    """
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = []
+
+    def __repr__(self):
+        return "%s(sent=%d, failed=%d)" % (self.__class__.__name__,
+                                           self.sent, len(self.failed))
+
+
+def _normalize(path):
+    return path if path.startswith("/") else "/" + path
+
+
+def run(session, calls, workers=4, rate=10, retries=3):
+    """Make requests concurrently without exceeding a rate
+
+    :param calls: An iterable of ``(service_id, request, func)`` tuples,
+        with ``func`` taking a session and making the request.
+    :param int workers: The most requests to have in flight at once.
+    :param float rate: The most requests to start per second.
+    :param int retries: The most times to retry a throttled request.
+
+    :rtype: :class:`BatchResult`
+    """
+    limiter = utils.RateLimiter(rate)
+
+    def call(item):
+        def attempt():
+            limiter.wait()
+            return item[2](session)
+        try:
+            utils.retry(attempt, attempts=retries + 1,
+                        retry_on=utils.is_retryable)
+        except Exception as e:
+            return e
+
+    result = BatchResult()
+    for (service_id, request, _), error in utils.imap(
+            call, calls, workers=workers, ordered=False):
+        if error is None:
+            result.sent += 1
+        else:
+            result.failed.append((service_id, request, error))
+    return result
+
+
+class PurgeBatcher(object):
+    """Collect purges and send them in de-duplicated batches
+
+    Paths added for a service are held until ``window`` seconds after the
+    first of them, so a burst of purges for the same service is sent as
+    one batch with every duplicate removed. When ``max_paths`` is set, a
+    batch of more paths than that is collapsed into a single purge of every
+    asset of the service. Batches for different services are sent
+    concurrently.
+
+    Expired batches are sent as paths are added. Call :meth:`flush`, or
+    use the batcher as a context manager, to send the rest.
+
+    :param session: The session to use for making requests.
+    :type session: :class:`~openstack.session.Session`
+    :param float window: How long to hold paths for a service, in seconds.
+    :param int max_paths: The most paths to purge one by one. By default
+        paths are always purged one by one.
+    :param int workers: The most requests to have in flight at once.
+    :param float rate: The most requests to start per second.
+    :param int retries: The most times to retry a throttled request.
+    """
+
+    #: Stands for every asset of a service in place of a set of paths.
+    ALL = None
+
+    def __init__(self, session, window=1.0, max_paths=None, workers=4,
+                 rate=10, retries=3):
+        self.session = session
+        self.window = window
+        self.max_paths = max_paths
+        self.workers = workers
+        self.rate = rate
+        self.retries = retries
+        self._pending = collections.OrderedDict()
+        self._opened = {}
+        self._lock = threading.Lock()
+
+    def add(self, service, paths=None):
+        """Queue paths of a service to be purged
+
+        :param service: The value can be the ID of a service or a
+            :class:`~rackspace.cdn.v1.service.Service` instance.
+        :param paths: The paths to purge. When not given, every asset of
+            the service is purged.
+
+        :returns: What was sent because its window expired
+        :rtype: :class:`BatchResult`
+        """
+        service_id = _service.Service.from_id(service).id
+        with self._lock:
+            if service_id not in self._pending:
+                self._pending[service_id] = set()
+                self._opened[service_id] = time.time()
+
+            pending = self._pending[service_id]
+            if paths is None or pending is self.ALL:
+                self._pending[service_id] = self.ALL
+            else:
+                pending.update(_normalize(path) for path in paths)
+                if (self.max_paths is not None and
+                        len(pending) > self.max_paths):
+                    self._pending[service_id] = self.ALL
+
+        return self.flush(expired_only=True)
+
+    def flush(self, expired_only=False):
+        """Send the queued purges
+
+        :param bool expired_only: Only send batches whose window expired.
+
+        :rtype: :class:`BatchResult`
+        """
+        now = time.time()
+        with self._lock:
+            batches = [(service_id, pending) for service_id, pending
+                       in self._pending.items()
+                       if not expired_only or
+                       now - self._opened[service_id] >= self.window]
+            for service_id, _ in batches:
+                del self._pending[service_id]
+                del self._opened[service_id]
+
+        if not batches:
+            return BatchResult()
+        return run(self.session, self._calls(batches), self.workers,
+                   self.rate, self.retries)
+
+    def _calls(self, batches):
+        for service_id, pending in batches:
+            sot = _service.Service.existing(id=service_id)
+            if pending is self.ALL:
+                yield service_id, None, sot.purge
+                continue
+            for path in sorted(pending):
+                yield service_id, path, functools.partial(sot.purge, url=path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+def group_operations(updates):
+    """Group JSON Patch operations by the service they apply to
+
+    :param updates: An iterable of ``(service, operation)`` tuples.
+
+    :returns: The operations of each service ID in the order they were
+              given, an ``OrderedDict``
+    """
+    grouped = collections.OrderedDict()
+    for service, operation in updates:
+        service_id = _service.Service.from_id(service).id
+        grouped.setdefault(service_id, []).append(operation)
+    return grouped
@@ -0,0 +1,84 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+from openstack import resource
+from openstack import utils
+from rackspace.cdn import cdn_service
+
+
+class Service(resource.Resource):
+    base_path = '/services'
+    resources_key = 'services'
+    service = cdn_service.CDNService()
+
+    # capabilities
+    allow_delete = True
+    allow_retrieve = True
+    allow_list = True
+
+    # Properties
+    #: The name of the service
+    name = resource.prop('name')
+    #: The domains the service serves, each a dict with a ``domain`` and
+    #: optionally a ``protocol``. *Type: list*
+    domains = resource.prop('domains', type=list)
+    #: The origins content is pulled from, each a dict with an ``origin``
+    #: and its ``port`` and ``ssl`` settings. *Type: list*
+    origins = resource.prop('origins', type=list)
+    #: The caching rules of the service. *Type: list*
+    caching = resource.prop('caching', type=list)
+    #: The access restrictions of the service. *Type: list*
+    restrictions = resource.prop('restrictions', type=list)
+    #: The ID of the flavor the service uses
+    flavor_id = resource.prop('flavor_id')
+    #: Status of the service. Valid values are:
+    #: ``create_in_progress``, ``deployed``, ``update_in_progress``,
+    #: ``delete_in_progress`` or ``failed``.
+    status = resource.prop('status')
+    #: Errors reported while provisioning the service. *Type: list*
+    errors = resource.prop('errors', type=list)
+    #: Links to the service and its access URLs. *Type: list*
+    links = resource.prop('links', type=list)
+
+    def _assets_url(self):
+        return utils.urljoin(self.base_path, self.id, 'assets')
+
+    def purge(self, session, url=None):
+        """Purge cached content from the edge
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param str url: The path of the asset to purge, such as
+            ``/images/logo.png``. When not given, every asset of the
+            service is purged.
+
+        :returns: ``None``
+        """
+        params = {'all': 'true'} if url is None else {'url': url}
+        session.delete(self._assets_url(), endpoint_filter=self.service,
+                       params=params)
+
+    def publish(self, session, operations):
+        """Apply changes to the service's configuration
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param list operations: JSON Patch operations, each a dict with an
+            ``op``, a ``path`` and usually a ``value``, such as
+            ``{"op": "add", "path": "/domains/-",
+            "value": {"domain": "www.example.com"}}``.
+
+        :returns: ``None``
+        """
+        url = utils.urljoin(self.base_path, self.id)
+        session.patch(url, endpoint_filter=self.service, json=operations)
@@ -0,0 +1,133 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+from openstack import exceptions
+from openstack import resource
+
+from rackspace import utils
+
+#: The most items the API returns in one page.
+MAX_LIMIT = 1000
+
+
+class BaseResource(resource.Resource):
+    """A monitoring resource whose listings follow the API's markers
+
+    Each page of a monitoring listing carries the marker of the next page
+    in its ``metadata``, rather than expecting the last ID of the page to
+    be sent back.
+    """
+
+    @classmethod
+    def list(cls, session, path_args=None, paginated=False, params=None,
+             prefetch=False):
+        """This method is a generator which yields resource objects.
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param dict path_args: A dictionary of arguments to construct
+                               a compound URL.
+        :param bool paginated: ``True`` to follow ``metadata.next_marker``
+                               through every page, or ``False`` to return
+                               only the first page.
+        :param dict params: Query parameters to be passed into the underlying
+                            :meth:`~openstack.session.Session.get` method.
+                            When paginating, ``limit`` sets the page size,
+                            which defaults to and is capped at
+                            :data:`MAX_LIMIT`.
+        :param bool prefetch: Fetch the next page in the background while
+                              the current one is being consumed.
+
+        :return: A generator of :class:`Resource` objects.
+        :raises: :exc:`~openstack.exceptions.MethodNotSupported` if
+                 :data:`Resource.allow_list` is not set to ``True``.
+        """
+        if not cls.allow_list:
+            raise exceptions.MethodNotSupported(cls, 'list')
+
+        params = dict(params or {})
+        if paginated:
+            params['limit'] = min(int(params.get('limit', MAX_LIMIT)),
+                                  MAX_LIMIT)
+        url = cls._get_url(path_args)
+
+        def fetch(page_params):
+            resp = session.get(url, endpoint_filter=cls.service,
+                               headers={'Accept': 'application/json'},
+                               params=page_params)
+            return resp.json()
+
+        pool = utils.Pool(1) if paginated and prefetch else None
+        try:
+            next_page = pool.submit(fetch, dict(params)) if pool else None
+            while True:
+                body = next_page.result() if pool else fetch(dict(params))
+                marker = None
+                if paginated:
+                    marker = body.get('metadata', {}).get('next_marker')
+                if marker is not None:
+                    params['marker'] = marker
+                    if pool:
+                        next_page = pool.submit(fetch, dict(params))
+
+                values = body[cls.resources_key] if cls.resources_key else body
+                for data in values:
+                    yield cls.existing(**data)
+
+                if marker is None:
+                    return
+        finally:
+            if pool:
+                pool.close()
+
+    @classmethod
+    def find(cls, session, name_or_id, path_args=None, ignore_missing=True):
+        """Find a resource by its name or id, searching every page
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param name_or_id: The name or ID of the resource.
+        :param dict path_args: A dictionary of arguments to construct
+                               a compound URL.
+        :param bool ignore_missing: When set to ``False``
+                    :class:`~openstack.exceptions.ResourceNotFound` will be
+                    raised when the resource does not exist.
+                    When set to ``True``, None will be returned when
+                    attempting to find a nonexistent resource.
+
+        :return: The :class:`Resource` object matching the given name or id
+                 or None if nothing matches.
+        :raises: :class:`openstack.exceptions.DuplicateResource` if more
+                 than one resource is found for this request.
+        :raises: :class:`openstack.exceptions.ResourceNotFound` if nothing
+                 is found and ignore_missing is ``False``.
+        """
+        try:
+            if cls.allow_retrieve:
+                return cls.get_by_id(session, name_or_id, path_args=path_args)
+        except exceptions.NotFoundException:
+            pass
+
+        result = None
+        for value in cls.list(session, path_args=path_args, paginated=True):
+            if name_or_id in (getattr(value, cls.id_attribute, None),
+                              getattr(value, cls.name_attribute, None)):
+                if result is not None:
+                    raise exceptions.DuplicateResource(
+                        "More than one %s exists with the name '%s'." %
+                        (cls.get_resource_name(), name_or_id))
+                result = value
+        if result is not None or ignore_missing:
+            return result
+        raise exceptions.ResourceNotFound(
+            "No %s found for %s" % (cls.__name__, name_or_id))
@@ -10,24 +10,267 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+
+from openstack import exceptions
 from openstack import proxy
 from openstack import resource
 from rackspace.monitoring.v1 import agent as _agent
 from rackspace.monitoring.v1 import agent_token as _agent_token
 from rackspace.monitoring.v1 import alarm as _alarm
+from rackspace.monitoring.v1 import cache as _cache
+from rackspace.monitoring.v1 import catalog as _catalog
+from rackspace.monitoring.v1 import changelog as _changelog
 from rackspace.monitoring.v1 import check as _check
 from rackspace.monitoring.v1 import check_type as _check_type
+from rackspace.monitoring.v1 import criteria as _criteria
 from rackspace.monitoring.v1 import entity as _entity
+from rackspace.monitoring.v1 import fleet as _fleet
+from rackspace.monitoring.v1 import host_info as _host_info
+from rackspace.monitoring.v1 import label_index as _label_index
+from rackspace.monitoring.v1 import latency as _latency
 from rackspace.monitoring.v1 import monitoring_zone as _monitoring_zone
 from rackspace.monitoring.v1 import notification as _notification
 from rackspace.monitoring.v1 import notification_plan as _notification_plan
 from rackspace.monitoring.v1 import notification_type as _notification_type
 from rackspace.monitoring.v1 import overview as _overview
+from rackspace.monitoring.v1 import reconcile as _reconcile
 from rackspace.monitoring.v1 import suppression as _suppression
 from rackspace.monitoring.v1 import suppression_log as _suppression_log
+from rackspace import utils
 
 
 class Proxy(proxy.BaseProxy):
+    """Proxy for the monitoring service
+
+    Every listing follows the API's markers through all of its pages. Pass
+    ``limit`` to set the page size, up to
+    :data:`~rackspace.monitoring.v1._base.MAX_LIMIT`, and ``prefetch=True``
+    to fetch each next page in the background.
+
+    Call :meth:`enable_cache` to answer repeated ``find_*`` and ``get_*``
+    calls from memory, :meth:`enable_label_index` to resolve labels
+    without listing, and :meth:`enable_catalog_cache` to keep the check
+    type, notification type and monitoring zone catalogs on disk.
+    """
+
+    def __init__(self, session):
+        super(Proxy, self).__init__(session)
+        #: The :class:`~rackspace.monitoring.v1.cache.ResourceCache` in
+        #: use, or ``None`` when caching is off.
+        self.cache = None
+        #: The :class:`~rackspace.monitoring.v1.label_index.LabelIndex` in
+        #: use, or ``None`` when labels are resolved by listing.
+        self.label_index = None
+        #: The :class:`~rackspace.monitoring.v1.catalog.CatalogCache` in
+        #: use, or ``None`` when catalogs are fetched every time.
+        self.catalogs = None
+        #: The :class:`~rackspace.monitoring.v1.latency.TracerouteCache`
+        #: :meth:`latency_matrix` reuses traceroutes from.
+        self.traceroutes = _latency.TracerouteCache()
+
+    def enable_cache(self, max_size=_cache.MAX_SIZE, ttl=_cache.TTL,
+                     ttls=None):
+        """Cache the resources ``find_*`` and ``get_*`` calls return
+
+        Cached resources are dropped when they are created, updated or
+        deleted through this proxy. Changes made any other way are only
+        seen once a resource's time to live has run out.
+
+        :param int max_size: The most resources to hold. The least recently
+                             used are dropped to make room.
+        :param ttl: Seconds a resource is used for.
+        :param dict ttls: Seconds a resource is used for by resource type,
+                          for example ``{alarm.Alarm: 10}``. ``0`` turns
+                          caching off for a type.
+
+        :returns: The :class:`~rackspace.monitoring.v1.cache.ResourceCache`,
+                  whose ``hits`` and ``misses`` show how well it is sized.
+        """
+        self.cache = _cache.ResourceCache(max_size=max_size, ttl=ttl,
+                                          ttls=ttls)
+        return self.cache
+
+    def disable_cache(self):
+        """Stop caching resources and drop those already cached"""
+        self.cache = None
+
+    def enable_label_index(self, max_age=_label_index.MAX_AGE):
+        """Resolve labels given to ``find_*`` from an index of every label
+
+        Without the index, finding a resource by label lists every resource
+        of its type. With it, each type is listed once and a label is
+        resolved locally, so a find takes the single request needed to get
+        the resource by ID. Resources created, updated or deleted through
+        this proxy are indexed as they change. Changes made any other way
+        are picked up when the index is swept again after ``max_age``.
+
+        :param max_age: Seconds an index is used for before it is swept
+                        again.
+
+        :returns: The :class:`~rackspace.monitoring.v1.label_index.LabelIndex`
+        """
+        self.label_index = _label_index.LabelIndex(max_age=max_age)
+        return self.label_index
+
+    def disable_label_index(self):
+        """Go back to resolving labels by listing"""
+        self.label_index = None
+
+    def enable_catalog_cache(self, directory=None, max_age=_catalog.MAX_AGE,
+                             background=True, account=None, endpoint=None):
+        """Keep the monitoring catalogs on disk between runs
+
+        The catalogs are those of check types, notification types and
+        monitoring zones. Listing them, and ``find_*`` and ``get_*`` calls
+        for them, are answered from the file, so only the first run
+        fetches them.
+
+        :param str directory: Where to keep the file. Defaults to
+            :func:`~rackspace.monitoring.v1.catalog.default_directory`.
+        :param max_age: Seconds a catalog is used for before it is fetched
+                        again in the background.
+        :param bool background: When ``False``, an old catalog is fetched
+                                again before answering from it.
+        :param str account: The account the file is for. Defaults to the
+                            session's project.
+        :param str endpoint: The endpoint the file is for. Defaults to the
+                             session's monitoring endpoint.
+
+        :returns: The :class:`~rackspace.monitoring.v1.catalog.CatalogCache`
+        """
+        if account is None:
+            account = self.session.get_project_id()
+        if endpoint is None:
+            endpoint = self.session.get_endpoint(
+                service_type=_catalog.CATALOGS[0].service.service_type)
+        path = _catalog.path_for(directory or _catalog.default_directory(),
+                                 account, endpoint)
+
+        def fetch(resource_type):
+            return resource_type.list(self.session, paginated=True)
+
+        self.catalogs = _catalog.CatalogCache(path, fetch, max_age=max_age,
+                                              background=background)
+        return self.catalogs
+
+    def disable_catalog_cache(self):
+        """Go back to fetching catalogs every time"""
+        self.catalogs = None
+
+    def _in_catalog(self, resource_type, kwargs):
+        return (self.catalogs is not None and
+                resource_type in _catalog.CATALOGS and
+                not kwargs.get("path_args") and not kwargs.get("args"))
+
+    def _find(self, resource_type, name_or_id, **kwargs):
+        if self._in_catalog(resource_type, kwargs):
+            res = self.catalogs.find(resource_type, name_or_id)
+            if res is not None:
+                return res
+
+        if self.cache is None and self.label_index is None:
+            return super(Proxy, self)._find(resource_type, name_or_id,
+                                            **kwargs)
+
+        path_args = kwargs.get("path_args")
+        res = None
+        if self.cache is not None:
+            res = self.cache.get(resource_type, name_or_id, path_args)
+        if res is None:
+            if (self.label_index is not None and resource_type.allow_list and
+                    resource_type.allow_retrieve):
+                res = self._find_indexed(resource_type, name_or_id, **kwargs)
+            else:
+                res = super(Proxy, self)._find(resource_type, name_or_id,
+                                               **kwargs)
+            if self.cache is not None:
+                self.cache.put(resource_type, res, path_args, name_or_id)
+        return res
+
+    def _find_indexed(self, resource_type, name_or_id, path_args=None,
+                      ignore_missing=True):
+        def sweep():
+            return self._list(resource_type, paginated=True,
+                              path_args=path_args)
+
+        ids = self.label_index.lookup(resource_type, name_or_id, sweep,
+                                      path_args)
+        if len(ids) > 1:
+            raise exceptions.DuplicateResource(
+                "More than one %s exists with the name '%s'." %
+                (resource_type.get_resource_name(), name_or_id))
+
+        # A value which is not indexed may be the ID of a resource created
+        # since the last sweep, so it is still worth one request.
+        res_id = ids[0] if ids else name_or_id
+        try:
+            return super(Proxy, self)._get(resource_type, res_id,
+                                           path_args=path_args)
+        except exceptions.NotFoundException:
+            self.label_index.remove(resource_type, res_id, path_args)
+            if ignore_missing:
+                return None
+            raise exceptions.ResourceNotFound(
+                "No %s found for %s" % (resource_type.__name__, name_or_id))
+
+    def _get(self, resource_type, value=None, **kwargs):
+        if value is not None and self._in_catalog(resource_type, kwargs):
+            res = self.catalogs.get(resource_type,
+                                    resource.Resource.get_id(value))
+            if res is not None:
+                return res
+
+        if self.cache is None or value is None or kwargs.get("args"):
+            return super(Proxy, self)._get(resource_type, value, **kwargs)
+
+        path_args = kwargs.get("path_args")
+        res = self.cache.get(resource_type, value, path_args)
+        if res is None:
+            res = super(Proxy, self)._get(resource_type, value, **kwargs)
+            self.cache.put(resource_type, res, path_args)
+        return res
+
+    def _create(self, resource_type, **attrs):
+        res = super(Proxy, self)._create(resource_type, **attrs)
+        if self.cache is not None:
+            self.cache.invalidate(resource_type, res, attrs.get("path_args"))
+        if self.label_index is not None:
+            self.label_index.add(resource_type, res, attrs.get("path_args"))
+        return res
+
+    def _update(self, resource_type, value, **attrs):
+        path_args = attrs.get("path_args")
+        if self.cache is not None:
+            self.cache.invalidate(resource_type, value, path_args)
+        res = super(Proxy, self)._update(resource_type, value, **attrs)
+        if self.cache is not None:
+            self.cache.invalidate(resource_type, res, path_args)
+        if self.label_index is not None:
+            self.label_index.add(resource_type, res, path_args)
+        return res
+
+    def _delete(self, resource_type, value, **kwargs):
+        path_args = kwargs.get("path_args")
+        if self.cache is not None:
+            self.cache.invalidate(resource_type, value, path_args)
+            self.cache.invalidate_under(value)
+        if self.label_index is not None:
+            self.label_index.remove(resource_type, value, path_args)
+            self.label_index.remove_under(value)
+        return super(Proxy, self)._delete(resource_type, value, **kwargs)
+
+    def _list(self, resource_type, value=None, paginated=False,
+              path_args=None, prefetch=False, **query):
+        if (value is None and not path_args and not query and
+                self._in_catalog(resource_type, {})):
+            return iter(self.catalogs.values(resource_type))
+
+        res = self._get_resource(resource_type, value, path_args)
+
+        query = res.convert_ids(query)
+        return res.list(self.session, path_args=path_args, paginated=paginated,
+                        params=query, prefetch=prefetch)
 
     def agents(self, **query):
         """Return a generator of agents
@@ -38,7 +281,7 @@ class Proxy(proxy.BaseProxy):
         :returns: A generator of agent objects
         :rtype: :class:`~rackspace.monitoring.v1.agent.Agent`
         """
-        return self._list(_agent.Agent, paginated=False, **query)
+        return self._list(_agent.Agent, paginated=True, **query)
 
     def agent_connections(self, agent):
         """List currently active connections for the agent
@@ -53,6 +296,100 @@ class Proxy(proxy.BaseProxy):
         agent = _agent.Agent.from_id(agent)
         return agent.connections(self.session)
 
+    def _fetch_host_info(self, agents, types, concurrency, retries):
+        for name in types:
+            if name not in _host_info.TYPES:
+                raise ValueError("Unknown host info type %s" % name)
+        if agents is None:
+            agents = self.agents()
+
+        def requests():
+            for agent in agents:
+                agent = _agent.Agent.from_id(agent)
+                for name in types:
+                    yield agent, name
+
+        def fetch(request):
+            agent, name = request
+            method = getattr(agent, _host_info.TYPES[name])
+            try:
+                return utils.retry(
+                    lambda: method(self.session), attempts=retries + 1,
+                    retry_on=utils.is_retryable)
+            except Exception as e:
+                return e
+
+        return utils.imap(fetch, requests(), workers=concurrency,
+                          ordered=False)
+
+    def harvest_host_info(self, agents=None, types=("cpus", "memory"),
+                          concurrency=16, retries=3):
+        """Gather host info from many agents at once
+
+        A request is made for every type of host info for every agent, by
+        ``concurrency`` threads sharing this proxy's session, and the rows
+        are stored by column so fleet-wide figures can be computed without
+        walking every row in Python, for example::
+
+            info = conn.monitoring.harvest_host_info(types=["filesystems"])
+            usage = info["filesystems"].ratio("used", "total")
+            p95 = host_info.percentile(usage, 95)
+
+        :param agents: An iterable of agents, each either the ID of an agent
+            or a :class:`~rackspace.monitoring.v1.agent.Agent` instance.
+            Defaults to every agent on the account.
+        :param types: The types of host info to gather, from
+            :data:`~rackspace.monitoring.v1.host_info.TYPES`.
+        :param int concurrency: The number of requests to make at a time.
+        :param int retries: How many times to retry a request which fails
+            with a status in
+            :data:`~rackspace.utils.RETRY_CODES`.
+
+        :returns: :class:`~rackspace.monitoring.v1.host_info.HostInfo`
+        :raises: ``ValueError`` for an unknown type of host info.
+        """
+        fetched = self._fetch_host_info(agents, types, concurrency, retries)
+        result = _host_info.HostInfo(types)
+        for (agent, name), info in fetched:
+            result.add(agent.id, name, info)
+        return result
+
+    def host_info_changes(self, store, agents=None, types=("processes",),
+                          concurrency=16, retries=3):
+        """Gather host info from many agents and report what changed
+
+        Each snapshot is recorded in ``store``. One with the same content
+        as the last snapshot of its agent and type is recognised by its
+        hash and skipped without comparing any rows.
+
+        :param store: The
+            :class:`~rackspace.monitoring.v1.snapshot.SnapshotStore` holding
+            the last snapshots. It is not saved.
+        :param agents: An iterable of agents, each either the ID of an agent
+            or a :class:`~rackspace.monitoring.v1.agent.Agent` instance.
+            Defaults to every agent on the account.
+        :param types: The types of host info to gather, from
+            :data:`~rackspace.monitoring.v1.host_info.TYPES`.
+        :param int concurrency: The number of requests to make at a time.
+        :param int retries: How many times to retry a request which fails
+            with a status in
+            :data:`~rackspace.utils.RETRY_CODES`.
+
+        :returns: A generator of ``((agent_id, type), delta)`` tuples, one
+                  for each snapshot which changed, as they are found.
+                  ``delta`` is a
+                  :class:`~rackspace.monitoring.v1.snapshot.Delta`, or the
+                  exception the last attempt raised when the agent could
+                  not be read, which leaves its snapshot as it was.
+        :raises: ``ValueError`` for an unknown type of host info.
+        """
+        fetched = self._fetch_host_info(agents, types, concurrency, retries)
+        for (agent, name), info in fetched:
+            if not isinstance(info, Exception):
+                info = store.update(agent.id, name, info)
+            if info is not None:
+                yield (agent.id, name), info
+
     def agent_host_info_types(self, agent):
         """List the types of host info data supported by the agent
 
@@ -206,7 +543,7 @@ class Proxy(proxy.BaseProxy):
         :returns: A generator of agent token objects
         :rtype: :class:`~rackspace.monitoring.v1.agent_token.AgentToken`
         """
-        return self._list(_agent_token.AgentToken, paginated=False, **query)
+        return self._list(_agent_token.AgentToken, paginated=True, **query)
 
     def create_agent_token(self, **attrs):
         """Create a new agent token from attributes
@@ -289,7 +626,7 @@ class Proxy(proxy.BaseProxy):
         """
         entity_id = resource.Resource.get_id(entity)
         return self._list(_alarm.Alarm, path_args={'entity_id': entity_id},
-                          paginated=False, **query)
+                          paginated=True, **query)
 
     def alarm_changelog(self, entity):
         """Return alarm changelog for an entity
@@ -304,6 +641,54 @@ class Proxy(proxy.BaseProxy):
         entity = _entity.Entity.from_id(entity)
         return entity.alarm_changelog(self.session)
 
+    def alarm_changelogs(self, start=None, end=None, entity=None, **query):
+        """Return a generator of alarm state changes across the account
+
+        :param int start: The earliest change to include, in milliseconds
+                          since the epoch.
+        :param int end: The latest change to include, in milliseconds since
+                        the epoch.
+        :param entity: Only include the changes of this entity. The value
+            can be either the ID of an entity or a
+            :class:`~rackspace.monitoring.v1.entity.Entity` instance.
+        :param kwargs \*\*query: Optional query parameters to be sent to limit
+                                 the resources being returned.
+
+        :returns: A generator of alarm changelog objects
+        :rtype: :class:`~rackspace.monitoring.v1.changelog.AlarmChangelog`
+        """
+        if start is not None:
+            query["from"] = start
+        if end is not None:
+            query["to"] = end
+        if entity is not None:
+            query["entityId"] = resource.Resource.get_id(entity)
+        return self._list(_changelog.AlarmChangelog, paginated=True, **query)
+
+    def follow_alarm_changes(self, cursor_path=None, since=None,
+                             overlap=_changelog.OVERLAP):
+        """Follow alarm state changes across the account
+
+        One poll of the follower costs a request per page of new changes,
+        however many entities there are.
+
+        :param str cursor_path: Where to keep how far the follower has
+                                read, so it carries on from there when
+                                started again.
+        :param int since: Where to start, in milliseconds since the epoch,
+                          when there is no saved cursor. Defaults to now.
+        :param int overlap: How far, in milliseconds, each poll reaches
+                            back before the end of the last one, to catch
+                            changes recorded late.
+
+        :returns: A
+            :class:`~rackspace.monitoring.v1.changelog.ChangelogFollower`,
+            whose ``poll`` returns the new changes and whose ``follow``
+            yields them as they come.
+        """
+        return _changelog.ChangelogFollower(self, cursor_path=cursor_path,
+                                            since=since, overlap=overlap)
+
     def alarm_notification_history(self, alarm):
         """Lists alarm notification history for the alarm
 
@@ -428,8 +813,8 @@ class Proxy(proxy.BaseProxy):
         :rtype: :class:`~rackspace.monitoring.v1.check.Check`
         """
         entity = _entity.Entity.from_id(entity)
-        checks = _check.Check.list(self.session,
-                                   path_args={"entity_id": entity.id}, **query)
+        checks = self._list(_check.Check, path_args={"entity_id": entity.id},
+                            paginated=True, **query)
 
         # Checks have to know their entity at this point, otherwise further
         # operations like getting their metrics or testing them is a hassle
@@ -466,6 +851,52 @@ class Proxy(proxy.BaseProxy):
         check.entity_id = self._get_entity_id(check, entity)
         return check.metrics(self.session)
 
+    def metrics_for(self, entities_or_checks, concurrency=8, retries=3):
+        """List the metrics of many checks at once
+
+        Requests are made by ``concurrency`` threads sharing this proxy's
+        session, so its connection pool should allow that many
+        connections. Entities are expanded into their checks as the work
+        is handed out, so the listing and the metric requests overlap.
+
+        :param entities_or_checks: An iterable of checks, which must know
+            their entity, and entities, whose checks are all included.
+            Each may be a :class:`~rackspace.monitoring.v1.check.Check`,
+            a :class:`~rackspace.monitoring.v1.entity.Entity` or the ID
+            of an entity.
+        :param int concurrency: The number of requests to make at a time.
+        :param int retries: How many times to retry a request which fails
+            with a status in :data:`~rackspace.utils.RETRY_CODES`
+            before giving up on that check.
+
+        :returns: A generator of ``((entity_id, check_id), metrics)``
+                  tuples, in the order the requests finish. ``metrics`` is
+                  the ``list`` :meth:`check_metrics` returns, or the
+                  exception the last attempt raised, which does not stop
+                  the other checks.
+        """
+        def checks():
+            for value in entities_or_checks:
+                if isinstance(value, _check.Check):
+                    value.entity_id = self._get_entity_id(value, None)
+                    yield value
+                else:
+                    for check in self.checks(value):
+                        yield check
+
+        def fetch(check):
+            try:
+                return utils.retry(
+                    lambda: check.metrics(self.session),
+                    attempts=retries + 1,
+                    retry_on=utils.is_retryable)
+            except Exception as e:
+                return e
+
+        for check, metrics in utils.imap(fetch, checks(), workers=concurrency,
+                                         ordered=False):
+            yield (check.entity_id, check.id), metrics
+
     def check_test(self, check, entity=None):
         """Test an existing check
 
@@ -577,7 +1008,7 @@ class Proxy(proxy.BaseProxy):
         :returns: A generator of check types objects
         :rtype: :class:`~rackspace.monitoring.v1.check_type.CheckType`
         """
-        return self._list(_check_type.CheckType, paginated=False, **query)
+        return self._list(_check_type.CheckType, paginated=True, **query)
 
     def check_type_targets(self, check_type, entity):
         """Lists agent check type targets for an entity
@@ -635,7 +1066,7 @@ class Proxy(proxy.BaseProxy):
         :returns: A generator of entity objects
         :rtype: :class:`~rackspace.monitoring.v1.entity.Entity`
         """
-        return self._list(_entity.Entity, paginated=False, **query)
+        return self._list(_entity.Entity, paginated=True, **query)
 
     def create_entity(self, **attrs):
         """Create a new entity from attributes
@@ -713,7 +1144,7 @@ class Proxy(proxy.BaseProxy):
                          .v1.monitoring_zone.MonitoringZone`
         """
         return self._list(_monitoring_zone.MonitoringZone,
-                          paginated=False, **query)
+                          paginated=True, **query)
 
     def find_monitoring_zone(self, name_or_id, ignore_missing=True):
         """Find a single monitoring zone
@@ -754,7 +1185,7 @@ class Proxy(proxy.BaseProxy):
         :returns: A generator of notification objects
         :rtype: :class:`~rackspace.monitoring.v1.notification.Notification`
         """
-        return self._list(_notification.Notification, paginated=False, **query)
+        return self._list(_notification.Notification, paginated=True, **query)
 
     def create_notification(self, **attrs):
         """Create a new notification from attributes
@@ -836,7 +1267,7 @@ class Proxy(proxy.BaseProxy):
                          .notification_plan.NotificationPlan`
         """
         return self._list(_notification_plan.NotificationPlan,
-                          paginated=False, **query)
+                          paginated=True, **query)
 
     def create_notification_plan(self, **attrs):
         """Create a new notification plan from attributes
@@ -925,7 +1356,7 @@ class Proxy(proxy.BaseProxy):
                          .notification_type.NotificationType`
         """
         return self._list(_notification_type.NotificationType,
-                          paginated=False, **query)
+                          paginated=True, **query)
 
     def find_notification_type(self, name_or_id, ignore_missing=True):
         """Find a single notification type
@@ -966,7 +1397,50 @@ class Proxy(proxy.BaseProxy):
         :returns: A generator of overview objects
         :rtype: :class:`~rackspace.monitoring.v1.overview.Overview`
         """
-        return self._list(_overview.Overview, paginated=False, **query)
+        return self._list(_overview.Overview, paginated=True, **query)
+
+    def fleet_snapshot(self, prefetch=True, **query):
+        """Read every entity with its checks and alarms in one pass
+
+        The overview view is paged through, rather than listing checks and
+        alarms entity by entity, which takes a request per page instead of
+        two per entity.
+
+        :param bool prefetch: Fetch each next page of the view in the
+                              background while the current one is indexed.
+        :param kwargs \*\*query: Optional query parameters for the view, such
+                                 as ``entity`` to read only some entities.
+
+        :returns: :class:`~rackspace.monitoring.v1.fleet.FleetSnapshot`
+        """
+        return _fleet.FleetSnapshot.from_overviews(
+            self.overviews(prefetch=prefetch, **query))
+
+    def reconcile(self, desired, dry_run=False, workers=8, prune=False):
+        """Bring monitoring resources in line with a desired state
+
+        What exists is read with a few paginated listings, compared with
+        ``desired`` by label, and only the resources which are missing or
+        differ are written, so running it again makes no writes at all.
+        See :class:`~rackspace.monitoring.v1.reconcile.Reconciler` for the
+        form of ``desired``.
+
+        :param dict desired: The desired state.
+        :param bool dry_run: Only work out the changes, and make none of
+                             them.
+        :param int workers: The number of writes to make at a time.
+        :param bool prune: Delete resources the desired state does not
+                           list.
+
+        :returns: A ``(plan, result)`` tuple of the
+                  :class:`~rackspace.monitoring.v1.reconcile.Plan` and the
+                  :class:`~rackspace.monitoring.v1.reconcile.ApplyResult`,
+                  which is ``None`` for a dry run or when nothing needed to
+                  change.
+        """
+        reconciler = _reconcile.Reconciler(self, workers=workers,
+                                           prune=prune)
+        return reconciler.reconcile(desired, dry_run=dry_run)
 
     def test_alarm(self, entity, check_data, criteria):
         """Test an alarm
@@ -995,6 +1469,34 @@ class Proxy(proxy.BaseProxy):
         entity = _entity.Entity.from_id(entity)
         return entity.test_alarm(self.session, check_data, criteria)
 
+    def evaluate_alarms(self, alarms, check_data):
+        """Evaluate many alarms against check data locally
+
+        Each alarm's criteria is compiled once, and reused for any alarm
+        with the same criteria, then run without a request to the API.
+
+        :param alarms: An iterable of
+            :class:`~rackspace.monitoring.v1.alarm.Alarm` instances, or of
+            criteria strings.
+        :param list check_data: Observations as :meth:`check_test` or
+            :meth:`test_new_check` return them, or recorded ones in the
+            same form.
+
+        :returns: A ``dict`` of what :meth:`test_alarm` would return for
+                  each alarm, keyed by the alarm's ID, or by the criteria
+                  when a string was given.
+        :raises: :class:`~rackspace.monitoring.v1.criteria.CriteriaError`
+                 if any criteria can't be parsed.
+        """
+        results = collections.OrderedDict()
+        for alarm in alarms:
+            if isinstance(alarm, _alarm.Alarm):
+                results[alarm.id] = alarm.evaluate(check_data)
+            else:
+                results[alarm] = _criteria.compile_criteria(
+                    alarm).evaluate(check_data)
+        return results
+
     def test_new_check(self, entity, attributes):
         """Test a new check
 
@@ -1057,6 +1559,67 @@ class Proxy(proxy.BaseProxy):
         return monitoring_zone.traceroute(self.session,
                                           target, target_resolver)
 
+    def latency_matrix(self, targets, zones=None, target_resolver="IPv4",
+                       concurrency=8, rate=_latency.RATE, retries=3):
+        """Run traceroutes from many monitoring zones to many targets
+
+        Traceroutes are run by ``concurrency`` threads sharing this proxy's
+        session, started no faster than ``rate`` a second. Each result is
+        kept in :attr:`traceroutes`, so a zone and target measured within
+        its time to live are not run again.
+
+        :param targets: An iterable of hostnames or IP addresses.
+        :param zones: An iterable of monitoring zones, each either the ID of
+                      one or a :class:`~rackspace.monitoring.v1
+                      .monitoring_zone.MonitoringZone` instance. Defaults
+                      to every monitoring zone.
+        :param str target_resolver: `IPv4` or `IPv6`
+        :param int concurrency: The number of traceroutes to run at a time.
+        :param float rate: The most traceroutes to start per second.
+        :param int retries: How many times to retry a traceroute which
+            fails with a status in
+            :data:`~rackspace.utils.RETRY_CODES` before
+            giving up on it.
+
+        :returns: A :class:`~rackspace.monitoring.v1.latency.LatencyMatrix`
+                  with a row per zone and a column per target. Traceroutes
+                  which fail are in its ``errors`` rather than raised.
+        """
+        if zones is None:
+            zones = self.monitoring_zones()
+        zone_ids = [resource.Resource.get_id(zone) for zone in zones]
+        result = _latency.LatencyMatrix(zone_ids, targets)
+        limiter = utils.RateLimiter(rate)
+
+        def run(pair):
+            zone_id, target = pair
+
+            def attempt():
+                limiter.wait()
+                return self.traceroute(zone_id, target, target_resolver)
+            try:
+                hops = utils.retry(
+                    attempt, attempts=retries + 1,
+                    retry_on=utils.is_retryable)
+            except Exception as e:
+                return e
+            self.traceroutes.put(zone_id, target, hops)
+            return hops
+
+        pending = []
+        for zone_id in result.zone_ids:
+            for target in result.targets:
+                hops = self.traceroutes.get(zone_id, target)
+                if hops is None:
+                    pending.append((zone_id, target))
+                else:
+                    result.add(zone_id, target, hops)
+
+        for (zone_id, target), hops in utils.imap(
+                run, pending, workers=concurrency, ordered=False):
+            result.add(zone_id, target, hops)
+        return result
+
     def suppressions(self, **query):
         """Return a generator of suppressions
 
@@ -1066,7 +1629,7 @@ class Proxy(proxy.BaseProxy):
         :returns: A generator of suppression objects
         :rtype: :class:`~rackspace.monitoring.v1.suppression.Suppression`
         """
-        return self._list(_suppression.Suppression, paginated=False, **query)
+        return self._list(_suppression.Suppression, paginated=True, **query)
 
     def create_suppression(self, **attrs):
         """Create a new suppression from attributes
@@ -1150,7 +1713,7 @@ class Proxy(proxy.BaseProxy):
                          .v1.suppression_log.SuppressionLog`
         """
         return self._list(_suppression_log.SuppressionLog,
-                          paginated=False, **query)
+                          paginated=True, **query)
 
     def find_suppression_log(self, name_or_id, ignore_missing=True):
         """Find a single suppression log
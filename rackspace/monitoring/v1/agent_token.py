@@ -12,9 +12,10 @@
 
 from openstack import resource
 from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
 
 
-class AgentToken(resource.Resource):
+class AgentToken(_base.BaseResource):
     base_path = 'agent_tokens'
     resources_key = 'values'
     service = monitoring_service.MonitoringService()
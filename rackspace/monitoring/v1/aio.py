@@ -0,0 +1,145 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import sys
+
+import requests
+
+if sys.version_info < (3, 5):
+    raise ImportError("rackspace.monitoring.v1.aio needs Python 3.5 or later")
+
+#: The proxy methods which return a generator, and so are iterated with
+#: ``async for`` rather than awaited.
+LIST_METHODS = frozenset([
+    "agents", "agent_tokens", "alarm_changelogs", "alarms", "check_types",
+    "checks", "entities", "host_info_changes", "metrics_for",
+    "monitoring_zones", "notification_plans", "notification_types",
+    "notifications", "overviews", "suppression_logs", "suppressions",
+])
+#: The number of calls an :class:`AsyncProxy` runs at a time by default.
+WORKERS = 32
+
+
+class AsyncIterator(object):
+    """Iterate a listing of the monitoring proxy with ``async for``
+
+    Each step runs on the proxy's threads, so a page is fetched without
+    blocking the event loop, and items from a page already fetched are
+    handed over straight away.
+    """
+
+    def __init__(self, proxy, func, args, kwargs):
+        self._proxy = proxy
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._iterator = None
+
+    def _step(self):
+        if self._iterator is None:
+            self._iterator = iter(self._func(*self._args, **self._kwargs))
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration()  # noqa
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        return self._proxy._run(self._step)
+
+
+class AsyncProxy(object):
+    """An asyncio version of the monitoring proxy
+
+    Every method of :class:`~rackspace.monitoring.v1._proxy.Proxy` is
+    available. Those in :data:`LIST_METHODS` return an
+    :class:`AsyncIterator` to use with ``async for``, and the rest return
+    an awaitable for their result::
+
+        aproxy = AsyncProxy(conn.monitoring)
+        async for entity in aproxy.entities():
+            checks = await aproxy.get_check(check_id, entity)
+
+    Calls run on a pool of threads which share the proxy's session. By
+    default the session's connection pool is grown to hold a keep-alive
+    connection for every thread, so thousands of calls can be awaited at
+    once without opening a connection for each.
+
+    It needs Python 3.5 or later.
+
+    :param proxy: The :class:`~rackspace.monitoring.v1._proxy.Proxy` to
+                  wrap.
+    :param int workers: The most calls to run at a time.
+    :param bool size_pool: Whether to grow the session's connection pool to
+                           ``workers`` connections.
+    :param loop: The event loop to use. Defaults to the current one.
+    """
+
+    def __init__(self, proxy, workers=WORKERS, size_pool=True, loop=None):
+        self.proxy = proxy
+        self._loop = loop
+        self._executor = concurrent.futures.ThreadPoolExecutor(workers)
+        if size_pool:
+            self._size_pool(workers)
+
+    def _size_pool(self, size):
+        session = getattr(self.proxy.session, "session", None)
+        if not isinstance(session, requests.Session):
+            return
+        for prefix in ("https://", "http://"):
+            adapter = session.get_adapter(prefix)
+            if getattr(adapter, "_pool_maxsize", size) < size:
+                # Keep the adapter's class, such as keystoneauth's
+                # TCPKeepAliveAdapter, and only grow its pool.
+                session.mount(prefix, type(adapter)(
+                    pool_connections=size, pool_maxsize=size,
+                    max_retries=adapter.max_retries))
+
+    def _run(self, func, *args, **kwargs):
+        loop = self._loop or asyncio.get_event_loop()
+        return loop.run_in_executor(self._executor,
+                                    functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        attr = getattr(self.proxy, name)
+        if not inspect.ismethod(attr) or name.startswith("_"):
+            return attr
+
+        if name in LIST_METHODS:
+            def method(*args, **kwargs):
+                return AsyncIterator(self, attr, args, kwargs)
+        else:
+            def method(*args, **kwargs):
+                return self._run(attr, *args, **kwargs)
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        return method
+
+    def close(self):
+        """Wait for running calls to finish and stop the threads"""
+        self._executor.shutdown(wait=True)
+
+    def __aenter__(self):
+        future = (self._loop or asyncio.get_event_loop()).create_future()
+        future.set_result(self)
+        return future
+
+    def __aexit__(self, *exc_info):
+        loop = self._loop or asyncio.get_event_loop()
+        return loop.run_in_executor(None, self.close)
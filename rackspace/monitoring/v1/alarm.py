@@ -14,9 +14,11 @@ from openstack import format
 from openstack import resource
 from openstack import utils
 from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
+from rackspace.monitoring.v1 import criteria as _criteria
 
 
-class Alarm(resource.Resource):
+class Alarm(_base.BaseResource):
     base_path = '/entities/%(entity_id)s/alarms'
     resources_key = 'values'
     service = monitoring_service.MonitoringService()
@@ -67,3 +69,18 @@ class Alarm(resource.Resource):
                             'notification_history', self.check_id)
         resp = session.get(url, endpoint_filter=self.service).json()
         return resp['values']
+
+    def evaluate(self, check_data):
+        """Evaluate the alarm's criteria against check data locally
+
+        This gives the result testing the alarm through the API would,
+        without making a request. See
+        :class:`~rackspace.monitoring.v1.criteria.Criteria` for the parts of
+        the alarm language which are supported.
+
+        :param list check_data: Observations as a check test returns them.
+        :returns: ``list``
+        :raises: :class:`~rackspace.monitoring.v1.criteria.CriteriaError`
+                 if the criteria can't be parsed.
+        """
+        return _criteria.compile_criteria(self.criteria).evaluate(check_data)
@@ -0,0 +1,169 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import collections
+import threading
+import time
+
+from openstack import resource
+
+#: How many resources a cache holds before the least recently used go.
+MAX_SIZE = 1000
+#: How many seconds a cached resource is used for, unless set per type.
+TTL = 60
+
+
+def path_key(path_args):
+    """A hashable form of path arguments, with resources replaced by IDs"""
+    if not path_args:
+        return ()
+    return tuple(sorted((key, resource.Resource.get_id(value))
+                        for key, value in path_args.items()))
+
+
+class ResourceCache(object):
+    """A least recently used cache of resources, keyed by ID and by label
+
+    Each resource is cached under the ID and the label it was read with,
+    along with the path arguments it was read under, such as the entity
+    of a check, so the same lookup can be answered without a request until
+    its time to live runs out. It is safe to share between threads.
+
+    :param int max_size: The most resources to hold.
+    :param ttl: Seconds a resource is used for.
+    :param dict ttls: Seconds a resource is used for by resource type, for
+        types which should not use ``ttl``, for example
+        ``{alarm.Alarm: 10}``. A TTL of ``0`` turns caching off for a type.
+    """
+
+    def __init__(self, max_size=MAX_SIZE, ttl=TTL, ttls=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        #: Lookups answered from the cache.
+        self.hits = 0
+        #: Lookups which had to be sent to the API.
+        self.misses = 0
+        #: Resources dropped to make room for others.
+        self.evictions = 0
+
+        self._entries = collections.OrderedDict()
+        self._keys = collections.defaultdict(set)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _ttl(self, resource_type):
+        return self.ttls.get(resource_type, self.ttl)
+
+    def get(self, resource_type, name_or_id, path_args=None):
+        """Return a cached resource, or ``None`` on a miss
+
+        :param resource_type: The type of resource to look up.
+        :param name_or_id: The ID or label it was cached under, or a
+                           resource whose ID to use.
+        :param dict path_args: The path arguments it was read under.
+        """
+        key = (resource_type, path_key(path_args),
+               resource.Resource.get_id(name_or_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.pop(key)
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def put(self, resource_type, res, path_args=None, name_or_id=None):
+        """Cache a resource under its ID and label
+
+        :param resource_type: The type of resource.
+        :param res: The resource to cache. ``None`` is ignored.
+        :param dict path_args: The path arguments it was read under.
+        :param name_or_id: What it was looked up by, if not its ID or label.
+        """
+        ttl = self._ttl(resource_type)
+        if res is None or not ttl:
+            return
+
+        path = path_key(path_args)
+        names = set([res.id, name_or_id]) - set([None])
+        if "label" in res:
+            names.add(res["label"])
+        expires = time.time() + ttl
+        with self._lock:
+            self._discard(resource_type, path, res.id)
+            for name in names:
+                key = (resource_type, path, name)
+                self._remove(key)
+                self._entries[key] = (expires, res, res.id)
+                self._keys[(resource_type, path, res.id)].add(key)
+
+            while len(self._entries) > self.max_size:
+                key = next(iter(self._entries))
+                self._remove(key)
+                self.evictions += 1
+
+    def invalidate(self, resource_type, res, path_args=None):
+        """Drop a resource and any lookup which could now be answered wrong
+
+        Everything cached for the resource's ID goes, along with anything
+        cached under its label, which it may have made ambiguous.
+
+        :param resource_type: The type of resource.
+        :param res: The resource, or its ID.
+        :param dict path_args: The path arguments it lives under.
+        """
+        path = path_key(path_args)
+        with self._lock:
+            self._discard(resource_type, path, resource.Resource.get_id(res))
+            if isinstance(res, resource.Resource) and "label" in res:
+                self._remove((resource_type, path, res["label"]))
+
+    def invalidate_under(self, res):
+        """Drop every resource read under a resource, such as its checks
+
+        :param res: The parent resource, or its ID.
+        """
+        res_id = resource.Resource.get_id(res)
+        with self._lock:
+            for key in [key for key in self._entries
+                        if any(value == res_id for _, value in key[1])]:
+                self._remove(key)
+
+    def clear(self):
+        """Drop every cached resource"""
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+
+    def _discard(self, resource_type, path, res_id):
+        for key in list(self._keys.get((resource_type, path, res_id), ())):
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        owner = (key[0], key[1], entry[2])
+        keys = self._keys.get(owner)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[owner]
@@ -0,0 +1,175 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import hashlib
+import os
+import threading
+import time
+
+from openstack import exceptions
+from rackspace.monitoring.v1 import check_type
+from rackspace.monitoring.v1 import monitoring_zone
+from rackspace.monitoring.v1 import notification_type
+from rackspace import utils
+
+#: The resources whose listings are kept on disk.
+CATALOGS = (check_type.CheckType, notification_type.NotificationType,
+            monitoring_zone.MonitoringZone)
+#: Seconds a catalog is used for before it is fetched again.
+MAX_AGE = 24 * 60 * 60
+
+
+def default_directory():
+    """The directory catalogs are kept in unless another is given"""
+    base = (os.environ.get("XDG_CACHE_HOME") or
+            os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "rackspace", "monitoring")
+
+
+def path_for(directory, account, endpoint):
+    """The file the catalogs of an account at an endpoint are kept in"""
+    key = "%s\n%s" % (account, endpoint)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(directory, "catalogs-%s.json" % digest[:20])
+
+
+class CatalogCache(object):
+    """Listings of the monitoring catalogs, kept on disk between runs
+
+    A catalog is fetched the first time it is needed and then read from
+    the file. Once it is older than ``max_age`` it is still answered from,
+    while it is fetched again in a background thread. The thread is not a
+    daemon, so a short-lived process waits for it before exiting and the
+    next run starts with the fresh catalog. When fetching fails the old
+    catalog is kept and the exception is recorded in :attr:`errors`.
+
+    The file holds the attributes of every resource as compact JSON, and
+    is replaced in a single step, so processes sharing it never read a
+    partial one.
+
+    :param str path: The file to keep the catalogs in.
+    :param fetch: A callable taking a resource type from :data:`CATALOGS`
+                  and returning an iterable of every resource of that type.
+    :param max_age: Seconds a catalog is used for before it is fetched
+                    again.
+    :param bool background: When ``False``, an old catalog is fetched again
+                            before answering from it.
+    """
+
+    def __init__(self, path, fetch, max_age=MAX_AGE, background=True):
+        self.path = path
+        self.fetch = fetch
+        self.max_age = max_age
+        self.background = background
+        #: The exception the last fetch of each catalog raised, by the
+        #: catalog's ``base_path``.
+        self.errors = {}
+        entries = utils.load_json(path)
+        self._entries = entries if isinstance(entries, dict) else {}
+        self._resources = {}
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def save(self):
+        """Write the catalogs, replacing the old file in a single step"""
+        with self._lock:
+            entries = dict(self._entries)
+        utils.save_json(self.path, entries)
+
+    def age(self, resource_type):
+        """Seconds since a catalog was fetched, or ``None`` if it never was"""
+        entry = self._entries.get(resource_type.base_path)
+        return None if entry is None else time.time() - entry["fetched"]
+
+    def refresh(self, resource_type):
+        """Fetch a catalog now and write it to the file
+
+        :raises: Whatever fetching raises.
+        """
+        values = [res.to_dict() for res in self.fetch(resource_type)]
+        with self._lock:
+            self._entries[resource_type.base_path] = {
+                "fetched": time.time(), "values": values}
+            self._resources.pop(resource_type.base_path, None)
+        self.errors.pop(resource_type.base_path, None)
+        self.save()
+
+    def _revalidate(self, resource_type):
+        try:
+            self.refresh(resource_type)
+        except Exception as e:
+            self.errors[resource_type.base_path] = e
+        finally:
+            with self._lock:
+                self._threads.pop(resource_type.base_path, None)
+
+    def values(self, resource_type):
+        """Every resource in a catalog
+
+        :returns: A ``list`` of ``resource_type`` instances.
+        :raises: Whatever fetching raises, when the catalog has never been
+                 fetched.
+        """
+        name = resource_type.base_path
+        age = self.age(resource_type)
+        if age is None:
+            self.refresh(resource_type)
+        elif age >= self.max_age:
+            if not self.background:
+                self._revalidate(resource_type)
+            else:
+                with self._lock:
+                    if name not in self._threads:
+                        thread = threading.Thread(target=self._revalidate,
+                                                  args=(resource_type,))
+                        self._threads[name] = thread
+                        thread.start()
+
+        with self._lock:
+            resources = self._resources.get(name)
+            if resources is None:
+                resources = [resource_type.existing(**attrs)
+                             for attrs in self._entries[name]["values"]]
+                self._resources[name] = resources
+        return resources
+
+    def get(self, resource_type, res_id):
+        """The resource in a catalog with an ID, or ``None``"""
+        for res in self.values(resource_type):
+            if res.id == res_id:
+                return res
+        return None
+
+    def find(self, resource_type, name_or_id):
+        """The resource in a catalog with an ID or name, or ``None``
+
+        :raises: :class:`~openstack.exceptions.DuplicateResource` when more
+                 than one resource has the name.
+        """
+        res = self.get(resource_type, name_or_id)
+        if res is not None:
+            return res
+        found = [value for value in self.values(resource_type)
+                 if value.name == name_or_id]
+        if len(found) > 1:
+            raise exceptions.DuplicateResource(
+                "More than one %s exists with the name '%s'." %
+                (resource_type.get_resource_name(), name_or_id))
+        return found[0] if found else None
+
+    def wait(self):
+        """Wait for any background fetches to finish"""
+        with self._lock:
+            threads = list(self._threads.values())
+        for thread in threads:
+            thread.join()
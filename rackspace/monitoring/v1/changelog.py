@@ -0,0 +1,169 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import time
+
+from openstack import resource
+from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
+from rackspace import utils
+
+#: How far, in milliseconds, each poll reaches back before the end of the
+#: last one, so events the API records late are not missed.
+OVERLAP = 5 * 60 * 1000
+
+
+def _now():
+    return int(time.time() * 1000)
+
+
+class AlarmChangelog(_base.BaseResource):
+    base_path = '/changelogs/alarms'
+    resources_key = 'values'
+    service = monitoring_service.MonitoringService()
+
+    # capabilities
+    allow_list = True
+
+    # Properties
+    #: The ID of the alarm
+    alarm_id = resource.prop('alarm_id')
+    #: The ID of the monitoring zone which saw the change
+    analyzed_by_monitoring_zone_id = resource.prop(
+        'analyzed_by_monitoring_zone_id')
+    #: The ID of the check
+    check_id = resource.prop('check_id')
+    #: The ID of the entity
+    entity_id = resource.prop('entity_id')
+    #: The state before the change
+    previous_state = resource.prop('previous_state')
+    #: The state after the change
+    state = resource.prop('state')
+    #: The status message of the change
+    status = resource.prop('status')
+    #: When the change happened.
+    #: Time is shown in Coordinated Universal Time (UTC) as the number
+    #: of milliseconds that have elapsed since January 1, 1970. *Type: int*
+    timestamp = resource.prop('timestamp', type=int)
+
+    @property
+    def key(self):
+        """What identifies the event, to recognise it when seen again"""
+        if self.id is not None:
+            return self.id
+        return "%s:%s:%s:%s:%s" % (self.timestamp, self.entity_id,
+                                   self.alarm_id, self.check_id, self.state)
+
+
+class Cursor(object):
+    """How far a :class:`ChangelogFollower` has read
+
+    :param str path: Where the cursor is stored, if anywhere.
+    :param int since: The end of the last poll, in milliseconds.
+    :param dict seen: The timestamp of each event already yielded which
+        is recent enough to come up again, by :attr:`AlarmChangelog.key`.
+    """
+
+    def __init__(self, path=None, since=None, seen=None):
+        self.path = path
+        self.since = since
+        self.seen = {} if seen is None else seen
+
+    @classmethod
+    def load(cls, path):
+        """Read a cursor, starting a new one if it can't be read"""
+        data = utils.load_json(path)
+        if not isinstance(data, dict):
+            return cls(path)
+        return cls(path, data.get("since"), data.get("seen") or {})
+
+    def save(self):
+        """Write the cursor, replacing the old one in a single step"""
+        if self.path is None:
+            return
+        utils.save_json(self.path, {"since": self.since, "seen": self.seen})
+
+
+class ChangelogFollower(object):
+    """Follow alarm state changes across a whole account
+
+    Each :meth:`poll` lists the changelog between the end of the last poll,
+    less ``overlap``, and now, through every page. Events which the
+    overlap brings up again are dropped, so each is yielded once. The
+    cursor is saved after every poll, so a follower started again with the
+    same ``cursor_path`` carries on where it stopped.
+
+    :param proxy: The :class:`~rackspace.monitoring.v1._proxy.Proxy` to use.
+    :param str cursor_path: Where to keep the cursor between runs.
+    :param int since: Where to start, in milliseconds, when there is no
+        saved cursor. Defaults to now, so only changes from now on are
+        followed.
+    :param int overlap: How far, in milliseconds, each poll reaches back
+        before the end of the last one.
+    """
+
+    def __init__(self, proxy, cursor_path=None, since=None,
+                 overlap=OVERLAP):
+        self.proxy = proxy
+        self.overlap = overlap
+        self.cursor = (Cursor.load(cursor_path) if cursor_path
+                       else Cursor())
+        if self.cursor.since is None:
+            self.cursor.since = _now() if since is None else since
+
+    def poll(self):
+        """List the changes since the last poll
+
+        :returns: A ``list`` of new
+                  :class:`~rackspace.monitoring.v1.changelog.AlarmChangelog`
+                  events, oldest first.
+        """
+        cursor = self.cursor
+        end = _now()
+        start = cursor.since - self.overlap
+        events = []
+        for event in self.proxy.alarm_changelogs(start=start, end=end):
+            key = event.key
+            if key in cursor.seen:
+                continue
+            cursor.seen[key] = event.timestamp or end
+            events.append(event)
+
+        cursor.since = end
+        cursor.seen = dict((key, timestamp)
+                           for key, timestamp in cursor.seen.items()
+                           if timestamp >= end - self.overlap)
+        cursor.save()
+        events.sort(key=lambda event: event.timestamp or 0)
+        return events
+
+    def follow(self, interval=60, stop=None):
+        """Poll forever, yielding each new change as it is found
+
+        :param interval: Seconds between the start of each poll.
+        :param stop: A :class:`threading.Event` which ends the generator
+            when it is set.
+
+        :returns: A generator of
+                  :class:`~rackspace.monitoring.v1.changelog.AlarmChangelog`
+        """
+        while stop is None or not stop.is_set():
+            started = time.time()
+            for event in self.poll():
+                yield event
+            delay = interval - (time.time() - started)
+            if delay > 0:
+                if stop is not None:
+                    stop.wait(delay)
+                else:
+                    time.sleep(delay)
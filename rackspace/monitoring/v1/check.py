@@ -14,9 +14,10 @@ from openstack import format
 from openstack import resource
 from openstack import utils
 from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
 
 
-class Check(resource.Resource):
+class Check(_base.BaseResource):
     base_path = '/entities/%(entity_id)s/checks'
     resources_key = 'values'
     service = monitoring_service.MonitoringService()
@@ -13,9 +13,10 @@
 from openstack import resource
 from openstack import utils
 from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
 
 
-class CheckType(resource.Resource):
+class CheckType(_base.BaseResource):
     base_path = 'check_types'
     resources_key = 'values'
     service = monitoring_service.MonitoringService()
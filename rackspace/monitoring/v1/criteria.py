@@ -0,0 +1,527 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import operator
+import re
+import threading
+
+import six
+
+#: The states an alarm can be in.
+STATES = ("OK", "WARNING", "CRITICAL")
+#: How many compiled criteria :func:`compile_criteria` keeps.
+CACHE_SIZE = 1024
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<number>(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<string>'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*")
+  | (?P<name>[A-Za-z_]\w*)
+  | (?P<op>==|!=|<=|>=|&&|\|\||[<>!+\-*/%(){}\[\],;=:])
+""", re.S | re.X)
+_ESCAPE = re.compile(r"\\(.)", re.S)
+_TEMPLATE = re.compile(r"#\{([^}]*)\}")
+_METRIC_TYPES = {"i": int, "I": int, "l": int, "L": int, "n": float}
+
+
+class CriteriaError(ValueError):
+    """Criteria which could not be parsed
+
+    :ivar int line: The line of the criteria the error is on.
+    """
+
+    def __init__(self, message, line):
+        super(CriteriaError, self).__init__("line %d: %s" % (line, message))
+        self.line = line
+
+
+def _tokenize(text):
+    tokens = []
+    line = 1
+    position = 0
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise CriteriaError("unexpected %r" % text[position], line)
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            value = float(value) if re.search("[.eE]", value) else int(value)
+        elif kind == "string":
+            value = _ESCAPE.sub(r"\1", value[1:-1])
+        if kind not in ("space", "comment"):
+            tokens.append((kind, value, line))
+        line += match.group(0).count("\n")
+        position = match.end()
+    tokens.append(("end", None, line))
+    return tokens
+
+
+def metric_value(metric):
+    """The value of a metric as it appears in check data
+
+    Metrics from a check test are a ``dict`` of their ``type`` and
+    ``data``, which is converted according to the type. Any other value is
+    used as it is, so recorded observations can hold plain values.
+    """
+    if isinstance(metric, dict) and "data" in metric:
+        convert = _METRIC_TYPES.get(metric.get("type"))
+        if convert is not None:
+            try:
+                return convert(metric["data"])
+            except (TypeError, ValueError):
+                return None
+        return metric["data"]
+    return metric
+
+
+class _Context(object):
+
+    def __init__(self, observation, previous):
+        self.metrics = dict(
+            (name, metric_value(value))
+            for name, value in (observation.get("metrics") or {}).items())
+        self.timestamp = observation.get("timestamp")
+        self.previous = previous
+
+    def metric(self, name):
+        return self.metrics.get(name)
+
+    def previous_metric(self, name):
+        if self.previous is None:
+            return None
+        return self.previous.metric(name)
+
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _arithmetic(op):
+    def apply(a, b):
+        if not (_number(a) and _number(b)):
+            if op is operator.add and isinstance(a, six.string_types) and \
+                    isinstance(b, six.string_types):
+                return a + b
+            return None
+        if op in (operator.truediv, operator.mod) and b == 0:
+            return None
+        return op(a, b)
+    return apply
+
+
+def _comparison(op):
+    def apply(a, b):
+        if a is None or b is None:
+            return op is operator.ne and a is not b
+        if _number(a) != _number(b):
+            return op is operator.ne
+        return op(a, b)
+    return apply
+
+
+def _regex(negate):
+    def apply(a, b):
+        if a is None or b is None:
+            return False
+        return bool(re.search(str(b), str(a))) != negate
+    return apply
+
+
+_BINARY = {
+    "+": _arithmetic(operator.add),
+    "-": _arithmetic(operator.sub),
+    "*": _arithmetic(operator.mul),
+    "/": _arithmetic(operator.truediv),
+    "%": _arithmetic(operator.mod),
+    "==": _comparison(operator.eq),
+    "!=": _comparison(operator.ne),
+    "<": _comparison(operator.lt),
+    "<=": _comparison(operator.le),
+    ">": _comparison(operator.gt),
+    ">=": _comparison(operator.ge),
+    "regex": _regex(False),
+    "nregex": _regex(True),
+}
+
+
+class _Parser(object):
+
+    def __init__(self, text):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self, value=None, kind=None):
+        token_kind, token_value, _ = self.tokens[self.position]
+        if kind is not None and token_kind != kind:
+            return False
+        if value is not None and (token_kind not in ("op", "name") or
+                                  token_value != value):
+            return False
+        return True
+
+    def take(self, value=None, kind=None):
+        if not self.peek(value, kind):
+            token_kind, token_value, line = self.tokens[self.position]
+            found = "end of criteria" if token_kind == "end" else \
+                repr(token_value)
+            raise CriteriaError("expected %s but found %s" %
+                                (value or kind, found), line)
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    @property
+    def line(self):
+        return self.tokens[self.position][2]
+
+    def program(self):
+        options = {}
+        while self.peek(":"):
+            line = self.line
+            self.take(":")
+            self.take("set")
+            name = self.take(kind="name")[1]
+            self.take("=")
+            value = self.take(kind="number")[1]
+            if name != "consecutiveCount" or not isinstance(value, int) \
+                    or value < 1:
+                raise CriteriaError("unsupported option %s=%s" %
+                                    (name, value), line)
+            options[name] = value
+        body = self.statements("end")
+        return options, body
+
+    def statements(self, closing):
+        statements = []
+        while not (self.peek(kind="end") if closing == "end"
+                   else self.peek(closing)):
+            statements.append(self.statement())
+        return _block(statements)
+
+    def block(self):
+        self.take("{")
+        body = self.statements("}")
+        self.take("}")
+        return body
+
+    def statement(self):
+        line = self.line
+        if self.peek("if"):
+            self.take("if")
+            self.take("(")
+            condition = self.expression()
+            self.take(")")
+            then = self.block()
+            otherwise = None
+            if self.peek("else"):
+                self.take("else")
+                otherwise = (_block([self.statement()]) if self.peek("if")
+                             else self.block())
+            return _if(condition, then, otherwise)
+
+        if self.peek("return"):
+            self.take("return")
+            if self.peek("new"):
+                self.take("new")
+                self.take("AlarmStatus")
+                self.take("(")
+                state, message = self.status()
+                self.take(")")
+            else:
+                state, message = self.status()
+            if self.peek(";"):
+                self.take(";")
+            return _return(state, message, line)
+
+        if self.peek(kind="end"):
+            raise CriteriaError("unexpected end of criteria", line)
+        raise CriteriaError("unexpected %r" % self.tokens[self.position][1],
+                            line)
+
+    def status(self):
+        line = self.line
+        state = self.take(kind="name")[1]
+        if state not in STATES:
+            raise CriteriaError("unknown state %s" % state, line)
+        message = None
+        if self.peek(","):
+            self.take(",")
+            message = self.take(kind="string")[1]
+        return state, message
+
+    def expression(self):
+        return self.either()
+
+    def either(self):
+        left = self.both()
+        while self.peek("||"):
+            self.take("||")
+            left = _or(left, self.both())
+        return left
+
+    def both(self):
+        left = self.negation()
+        while self.peek("&&"):
+            self.take("&&")
+            left = _and(left, self.negation())
+        return left
+
+    def negation(self):
+        if self.peek("!"):
+            self.take("!")
+            inner = self.negation()
+            return lambda ctx: not inner(ctx)
+        return self.comparison()
+
+    def comparison(self):
+        left = self.sum()
+        for op in ("==", "!=", "<=", ">=", "<", ">", "regex", "nregex"):
+            if self.peek(op):
+                self.take(op)
+                return _binary(_BINARY[op], left, self.sum())
+        return left
+
+    def sum(self):
+        left = self.term()
+        while self.peek("+") or self.peek("-"):
+            op = self.take()[1]
+            left = _binary(_BINARY[op], left, self.term())
+        return left
+
+    def term(self):
+        left = self.unary()
+        while self.peek("*") or self.peek("/") or self.peek("%"):
+            op = self.take()[1]
+            left = _binary(_BINARY[op], left, self.unary())
+        return left
+
+    def unary(self):
+        if self.peek("-"):
+            self.take("-")
+            inner = self.unary()
+            return lambda ctx: _BINARY["-"](0, inner(ctx))
+        return self.primary()
+
+    def metric_name(self):
+        self.take("metric")
+        self.take("[")
+        name = self.take(kind="string")[1]
+        self.take("]")
+        return name
+
+    def primary(self):
+        line = self.line
+        if self.peek(kind="number") or self.peek(kind="string"):
+            value = self.take()[1]
+            return lambda ctx: value
+        if self.peek("("):
+            self.take("(")
+            inner = self.expression()
+            self.take(")")
+            return inner
+        if self.peek("metric"):
+            name = self.metric_name()
+            return lambda ctx: ctx.metric(name)
+        if self.peek("previous") or self.peek("rate"):
+            function = self.take()[1]
+            self.take("(")
+            name = self.metric_name()
+            self.take(")")
+            if function == "previous":
+                return lambda ctx: ctx.previous_metric(name)
+            return _rate(name)
+        if self.peek("percentage"):
+            self.take("percentage")
+            self.take("(")
+            part = self.expression()
+            self.take(",")
+            whole = self.expression()
+            self.take(")")
+            return _binary(_percentage, part, whole)
+        if self.peek(kind="end"):
+            raise CriteriaError("unexpected end of criteria", line)
+        raise CriteriaError("unexpected %r" % self.tokens[self.position][1],
+                            line)
+
+
+def _block(statements):
+    def run(ctx):
+        for statement in statements:
+            result = statement(ctx)
+            if result is not None:
+                return result
+    return run
+
+
+def _if(condition, then, otherwise):
+    def run(ctx):
+        if condition(ctx):
+            return then(ctx)
+        if otherwise is not None:
+            return otherwise(ctx)
+    return run
+
+
+def _return(state, message, line):
+    def run(ctx):
+        if message is None:
+            status = "Matched return statement on line %d" % line
+        else:
+            status = _TEMPLATE.sub(
+                lambda m: str(ctx.metric(m.group(1).strip())), message)
+        return state, status
+    return run
+
+
+def _binary(op, left, right):
+    return lambda ctx: op(left(ctx), right(ctx))
+
+
+def _percentage(part, whole):
+    return _BINARY["*"](_BINARY["/"](part, whole), 100)
+
+
+def _and(left, right):
+    return lambda ctx: bool(left(ctx)) and bool(right(ctx))
+
+
+def _or(left, right):
+    return lambda ctx: bool(left(ctx)) or bool(right(ctx))
+
+
+def _rate(name):
+    def run(ctx):
+        current, previous = ctx.metric(name), ctx.previous_metric(name)
+        if not (_number(current) and _number(previous)):
+            return None
+        elapsed = (ctx.timestamp or 0) - (ctx.previous.timestamp or 0)
+        if elapsed <= 0:
+            return None
+        # Timestamps are in milliseconds, rates are per second.
+        return (current - previous) * 1000.0 / elapsed
+    return run
+
+
+class Criteria(object):
+    """Compiled alarm criteria
+
+    Criteria are parsed once into Python closures, which can then be run over
+    check data from :meth:`~rackspace.monitoring.v1._proxy.Proxy.check_test`
+    or :meth:`~rackspace.monitoring.v1._proxy.Proxy.test_new_check`, or over
+    recorded observations, without asking the API. The supported language is:
+
+    * ``:set consecutiveCount=N`` at the start of the criteria.
+    * ``if (condition) { ... } else if (condition) { ... } else { ... }``
+    * ``return new AlarmStatus(STATE, 'message');`` where ``STATE`` is one of
+      ``OK``, ``WARNING`` or ``CRITICAL`` and the message is optional.
+      ``return STATE, 'message';`` is accepted too.
+    * Conditions built from ``metric['name']``, numbers and strings with
+      ``+ - * / %``, ``== != < <= > >=``, ``regex`` and ``nregex``, ``&&``,
+      ``||`` and ``!``, and the functions ``previous(metric['name'])``,
+      ``rate(metric['name'])`` and ``percentage(a, b)``.
+    * ``#{name}`` in a message is replaced with the value of metric ``name``.
+    * ``//`` and ``/* */`` comments.
+
+    :ivar str text: The criteria.
+    :ivar int consecutive_count: How many observations in a row must reach
+        a new state before the alarm changes to it.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        options, self._body = _Parser(text).program()
+        self.consecutive_count = options.get("consecutiveCount", 1)
+
+    def __call__(self, observation, previous=None):
+        """Evaluate the criteria against one observation
+
+        :param dict observation: The ``timestamp`` and ``metrics`` of one
+                                 observation.
+        :param dict previous: The observation before it from the same
+                              monitoring zone, for ``previous()`` and
+                              ``rate()``.
+
+        :returns: A ``(state, status)`` tuple
+        """
+        ctx = _Context(observation, None if previous is None else
+                       _Context(previous, None))
+        result = self._body(ctx)
+        if result is None:
+            return "OK", "Matched default return statement"
+        return result
+
+    def evaluate(self, check_data):
+        """Evaluate the criteria against a series of observations
+
+        Each monitoring zone is evaluated separately: ``previous()`` and
+        ``rate()`` refer to the observation before from the same zone, and
+        a zone only changes state once ``consecutive_count`` observations
+        in a row call for it. Every zone starts out ``OK``.
+
+        :param list check_data: Observations as a check test returns them,
+            each a ``dict`` of its ``timestamp`` in milliseconds, its
+            ``metrics`` and optionally its ``monitoring_zone_id``, in the
+            order they were made.
+
+        :returns: A ``list`` with a ``dict`` of the ``timestamp``, ``state``
+                  and ``status`` for each observation, like
+                  :meth:`~rackspace.monitoring.v1.entity.Entity.test_alarm`
+                  returns.
+        """
+        zones = {}
+        results = []
+        for observation in check_data:
+            zone = observation.get("monitoring_zone_id")
+            previous, state, pending, count = zones.get(
+                zone, (None, "OK", None, 0))
+
+            computed, status = self(observation, previous)
+            if computed == state:
+                pending, count = None, 0
+            else:
+                count = count + 1 if computed == pending else 1
+                pending = computed
+                if count >= self.consecutive_count:
+                    state, pending, count = computed, None, 0
+                else:
+                    status = ("%s for %d of %d consecutive observations, "
+                              "still %s" % (computed, count,
+                                            self.consecutive_count, state))
+
+            zones[zone] = (observation, state, pending, count)
+            results.append({"timestamp": observation.get("timestamp"),
+                            "state": state, "status": status})
+        return results
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def compile_criteria(text):
+    """Compile criteria, reusing what was compiled for the same text
+
+    :returns: :class:`Criteria`
+    :raises: :class:`CriteriaError` if the criteria can't be parsed.
+    """
+    with _cache_lock:
+        criteria = _cache.get(text)
+    if criteria is None:
+        criteria = Criteria(text)
+        with _cache_lock:
+            if len(_cache) >= CACHE_SIZE:
+                _cache.clear()
+            _cache[text] = criteria
+    return criteria
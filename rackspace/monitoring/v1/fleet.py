@@ -0,0 +1,150 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import collections
+
+from openstack import resource
+from rackspace.monitoring.v1 import alarm as _alarm
+from rackspace.monitoring.v1 import check as _check
+from rackspace.monitoring.v1 import entity as _entity
+
+
+class FleetSnapshot(object):
+    """Entities, checks and alarms read from the overview view
+
+    Checks and alarms are linked to their entity, and alarms to their check
+    and latest state, all by ID. Entities, checks and alarms can be looked
+    up by label, and alarms and entities by the state of their alarms.
+    """
+
+    def __init__(self):
+        #: Entities by ID. *Type: dict*
+        self.entities = collections.OrderedDict()
+        #: Checks by ID. *Type: dict*
+        self.checks = collections.OrderedDict()
+        #: Alarms by ID. *Type: dict*
+        self.alarms = collections.OrderedDict()
+        #: The latest state of each alarm, by alarm ID. Each is a ``dict``
+        #: with the ``state``, ``previous_state``, ``status`` and
+        #: ``timestamp`` the overview reported. *Type: dict*
+        self.states = {}
+
+        self._checks_by_entity = collections.defaultdict(list)
+        self._alarms_by_entity = collections.defaultdict(list)
+        self._alarms_by_check = collections.defaultdict(list)
+        self._labels = {"entity": collections.defaultdict(list),
+                        "check": collections.defaultdict(list),
+                        "alarm": collections.defaultdict(list)}
+        self._alarms_by_state = collections.defaultdict(list)
+
+    @classmethod
+    def from_overviews(cls, overviews):
+        """Build a snapshot from overview objects
+
+        :param overviews: An iterable of
+            :class:`~rackspace.monitoring.v1.overview.Overview` objects.
+
+        :returns: :class:`FleetSnapshot`
+        """
+        snapshot = cls()
+        for value in overviews:
+            snapshot.add(value)
+        return snapshot
+
+    def add(self, overview):
+        """Add the entity of one overview with its checks and alarms"""
+        entity = _entity.Entity.existing(**overview.entity)
+        self.entities[entity.id] = entity
+        self._labels["entity"][entity.name].append(entity)
+
+        for data in overview.checks or []:
+            check = _check.Check.existing(**dict(data, entity_id=entity.id))
+            self.checks[check.id] = check
+            self._checks_by_entity[entity.id].append(check)
+            self._labels["check"][check.name].append(check)
+
+        for data in overview.alarms or []:
+            alarm = _alarm.Alarm.existing(**dict(data, entity_id=entity.id))
+            self.alarms[alarm.id] = alarm
+            self._alarms_by_entity[entity.id].append(alarm)
+            self._alarms_by_check[alarm.check_id].append(alarm)
+            self._labels["alarm"][alarm.name].append(alarm)
+
+        for state in overview.latest_alarm_states or []:
+            self.states[state["alarm_id"]] = state
+            alarm = self.alarms.get(state["alarm_id"])
+            if alarm is not None:
+                self._alarms_by_state[state["state"]].append(alarm)
+
+    def checks_for(self, entity):
+        """The checks of an entity
+
+        :param entity: Either the ID of an entity or a
+                       :class:`~rackspace.monitoring.v1.entity.Entity`.
+
+        :returns: ``list`` of :class:`~rackspace.monitoring.v1.check.Check`
+        """
+        return list(self._checks_by_entity[resource.Resource.get_id(entity)])
+
+    def alarms_for(self, entity=None, check=None):
+        """The alarms of an entity or of a check
+
+        :param entity: Either the ID of an entity or a
+                       :class:`~rackspace.monitoring.v1.entity.Entity`.
+        :param check: Either the ID of a check or a
+                      :class:`~rackspace.monitoring.v1.check.Check`.
+
+        :returns: ``list`` of :class:`~rackspace.monitoring.v1.alarm.Alarm`
+        """
+        if check is not None:
+            alarms = self._alarms_by_check[resource.Resource.get_id(check)]
+        else:
+            alarms = self._alarms_by_entity[resource.Resource.get_id(entity)]
+        return list(alarms)
+
+    def state_of(self, alarm):
+        """The latest state of an alarm, or ``None`` if it has none
+
+        :param alarm: Either the ID of an alarm or a
+                      :class:`~rackspace.monitoring.v1.alarm.Alarm`.
+        """
+        state = self.states.get(resource.Resource.get_id(alarm))
+        return state["state"] if state else None
+
+    def find_entities(self, label):
+        """The entities with a label, as a ``list``"""
+        return list(self._labels["entity"].get(label, ()))
+
+    def find_checks(self, label):
+        """The checks with a label, as a ``list``"""
+        return list(self._labels["check"].get(label, ()))
+
+    def find_alarms(self, label):
+        """The alarms with a label, as a ``list``"""
+        return list(self._labels["alarm"].get(label, ()))
+
+    def alarms_in_state(self, state):
+        """The alarms whose latest state is ``state``, such as ``CRITICAL``
+
+        :returns: ``list`` of :class:`~rackspace.monitoring.v1.alarm.Alarm`
+        """
+        return list(self._alarms_by_state.get(state, ()))
+
+    def entities_in_state(self, state):
+        """The entities with at least one alarm in ``state``
+
+        :returns: ``list`` of :class:`~rackspace.monitoring.v1.entity.Entity`
+        """
+        ids = collections.OrderedDict(
+            (alarm.entity_id, None) for alarm in self.alarms_in_state(state))
+        return [self.entities[entity_id] for entity_id in ids]
@@ -0,0 +1,210 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import array
+import collections
+import math
+import numbers
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#: The :class:`~rackspace.monitoring.v1.agent.Agent` method for each type
+#: of host info, by the name the API gives the type.
+TYPES = collections.OrderedDict([
+    ("cpus", "host_cpus"),
+    ("disks", "host_disks"),
+    ("filesystems", "host_filesystems"),
+    ("memory", "host_memory"),
+    ("network_interfaces", "host_nics"),
+    ("processes", "host_processes"),
+    ("system", "host_system"),
+    ("who", "host_users"),
+])
+
+_NAN = float("nan")
+
+
+def _is_number(value):
+    return (isinstance(value, numbers.Real) and
+            not isinstance(value, bool))
+
+
+def _finite(values):
+    return [value for value in values if not math.isnan(value)]
+
+
+def percentile(values, q):
+    """The ``q``-th percentile of some numbers, ignoring NaN
+
+    Values between two numbers are interpolated linearly, as
+    ``numpy.percentile`` does.
+
+    :param values: A sequence of numbers, such as a :class:`Table` column.
+    :param q: The percentile, from 0 to 100.
+
+    :returns: ``float``, or NaN when there are no numbers.
+    """
+    if numpy is not None:
+        values = numpy.asarray(values, dtype=float)
+        if numpy.isnan(values).all():
+            return _NAN
+        return float(numpy.nanpercentile(values, q))
+
+    values = sorted(_finite(values))
+    if not values:
+        return _NAN
+    rank = (len(values) - 1) * q / 100.0
+    low = int(math.floor(rank))
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class Table(object):
+    """Rows of one type of host info for many agents, stored by column
+
+    Numeric fields are kept in arrays of doubles, with NaN where a row has
+    no value, so aggregates run over contiguous memory, and when NumPy is
+    installed :meth:`column` returns NumPy arrays. Other fields are kept in
+    lists with ``None`` where a row has no value.
+
+    :param str name: The type of host info, such as ``filesystems``.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        #: The ID of the agent each row came from. *Type: list*
+        self.agent_ids = []
+        self._columns = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.agent_ids)
+
+    @property
+    def fields(self):
+        """The names of the columns, in the order they were first seen"""
+        return list(self._columns)
+
+    def append(self, agent_id, row):
+        """Add a row reported by an agent
+
+        :param str agent_id: The ID of the agent.
+        :param dict row: The fields of the row.
+        """
+        count = len(self.agent_ids)
+        for field, value in row.items():
+            column = self._columns.get(field)
+            if column is None:
+                # A missing value doesn't decide the type of a column, so
+                # it starts numeric until a value which isn't turns up.
+                if value is None or _is_number(value):
+                    column = array.array("d", [_NAN] * count)
+                else:
+                    column = [None] * count
+                self._columns[field] = column
+            elif isinstance(column, array.array) and not (
+                    value is None or _is_number(value)):
+                # A field which is not always numeric is kept as a list.
+                column = [None if math.isnan(item) else item
+                          for item in column]
+                self._columns[field] = column
+
+            if isinstance(column, array.array):
+                column.append(_NAN if value is None else value)
+            else:
+                column.append(value)
+
+        self.agent_ids.append(agent_id)
+        for field, column in self._columns.items():
+            if len(column) == count:
+                column.append(_NAN if isinstance(column, array.array)
+                              else None)
+
+    def column(self, field):
+        """The values of a field, one per row
+
+        :returns: A NumPy array when NumPy is installed and the field is
+                  numeric, otherwise an ``array.array`` of doubles or a
+                  ``list``.
+        :raises: ``KeyError`` if no row has the field.
+        """
+        column = self._columns[field]
+        if numpy is not None:
+            if isinstance(column, array.array):
+                return numpy.array(column, dtype=float)
+            return numpy.array(column, dtype=object)
+        return column
+
+    def sum(self, field):
+        """The total of a numeric field over every row, ignoring NaN"""
+        values = self.column(field)
+        if numpy is not None:
+            return float(numpy.nansum(values))
+        return math.fsum(_finite(values))
+
+    def percentile(self, field, q):
+        """The ``q``-th percentile of a numeric field, ignoring NaN"""
+        return percentile(self.column(field), q)
+
+    def ratio(self, numerator, denominator):
+        """Divide one numeric field by another, row by row
+
+        Rows where the denominator is zero or missing get NaN. For
+        ``filesystems``, ``ratio("used", "total")`` is how full each one is.
+
+        :returns: A column of the same kind :meth:`column` returns.
+        """
+        top = self.column(numerator)
+        bottom = self.column(denominator)
+        if numpy is not None:
+            result = numpy.full(len(top), _NAN)
+            numpy.divide(top, bottom, out=result,
+                         where=~numpy.isnan(bottom) & (bottom != 0))
+            return result
+        return array.array("d", [
+            a / b if b and not math.isnan(b) else _NAN
+            for a, b in zip(top, bottom)])
+
+
+class HostInfo(object):
+    """Host info gathered from many agents
+
+    :ivar dict tables: A :class:`Table` for each type of host info.
+    :ivar dict errors: For each agent which failed to report a type, a
+        ``dict`` of the exception raised by type.
+    """
+
+    def __init__(self, types):
+        self.tables = collections.OrderedDict(
+            (name, Table(name)) for name in types)
+        self.errors = collections.defaultdict(dict)
+
+    def __getitem__(self, name):
+        return self.tables[name]
+
+    def add(self, agent_id, name, info):
+        """Record what an agent reported for one type of host info
+
+        :param info: The ``info`` of the response, either one ``dict`` or
+                     a ``list`` of them, or the exception the request
+                     raised.
+        """
+        if isinstance(info, Exception):
+            self.errors[agent_id][name] = info
+            return
+        if isinstance(info, dict):
+            info = [info]
+        for row in info:
+            self.tables[name].append(agent_id, row)
@@ -0,0 +1,141 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import collections
+import threading
+import time
+
+from openstack import resource
+from rackspace.monitoring.v1 import cache as _cache
+
+#: Seconds an index is used for before it is swept again.
+MAX_AGE = 300
+
+
+class _Scope(object):
+
+    def __init__(self):
+        self.built = time.time()
+        self.labels = collections.defaultdict(set)
+        self.names = {}
+
+    def add(self, res_id, label):
+        self.remove(res_id)
+        self.names[res_id] = label
+        if label is not None:
+            self.labels[label].add(res_id)
+
+    def remove(self, res_id):
+        label = self.names.pop(res_id, None)
+        ids = self.labels.get(label)
+        if ids is not None:
+            ids.discard(res_id)
+            if not ids:
+                del self.labels[label]
+
+
+class LabelIndex(object):
+    """The IDs of resources by label, for each type of resource
+
+    Each type is indexed under the path arguments it is listed with, such as
+    the entity of a check, by one sweep through every page of its listing
+    the first time it is needed. The proxy keeps the index current as it
+    creates, updates and deletes resources, and sweeps again once it is
+    older than ``max_age`` to pick up changes made any other way. It is
+    safe to share between threads.
+
+    :param max_age: Seconds an index is used for before it is swept again.
+    """
+
+    def __init__(self, max_age=MAX_AGE):
+        self.max_age = max_age
+        #: How many sweeps have been made.
+        self.sweeps = 0
+
+        self._scopes = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(resource_type, path_args):
+        return resource_type, _cache.path_key(path_args)
+
+    def lookup(self, resource_type, name_or_id, sweep, path_args=None):
+        """Resolve a label or an ID to the IDs of the resources it names
+
+        :param resource_type: The type of resource.
+        :param name_or_id: A label or an ID.
+        :param sweep: A callable taking no arguments which lists every
+                      resource of the type under ``path_args``. It is
+                      called when the index is missing or too old.
+        :param dict path_args: The path arguments to list under.
+
+        :returns: A ``list`` of IDs. ``name_or_id`` alone when it is an ID,
+                  otherwise those of every resource with that label.
+        """
+        key = self._key(resource_type, path_args)
+        with self._lock:
+            scope = self._scopes.get(key)
+        if scope is None or scope.built + self.max_age <= time.time():
+            scope = _Scope()
+            for res in sweep():
+                scope.add(res.id, getattr(res, resource_type.name_attribute,
+                                          None))
+            with self._lock:
+                self._scopes[key] = scope
+                self.sweeps += 1
+
+        with self._lock:
+            if name_or_id in scope.names:
+                return [name_or_id]
+            return sorted(scope.labels.get(name_or_id, ()))
+
+    def add(self, resource_type, res, path_args=None):
+        """Record a resource which was created or updated
+
+        Nothing is recorded for a type which has not been swept yet.
+        """
+        with self._lock:
+            scope = self._scopes.get(self._key(resource_type, path_args))
+            if scope is not None:
+                label = getattr(res, resource_type.name_attribute, None)
+                if label is None:
+                    # An update which did not change the label may not
+                    # carry it, so keep the one already known.
+                    label = scope.names.get(res.id)
+                scope.add(res.id, label)
+
+    def remove(self, resource_type, res, path_args=None):
+        """Forget a resource which was deleted
+
+        :param res: The resource, or its ID.
+        """
+        with self._lock:
+            scope = self._scopes.get(self._key(resource_type, path_args))
+            if scope is not None:
+                scope.remove(resource.Resource.get_id(res))
+
+    def remove_under(self, res):
+        """Forget every index of resources listed under a deleted resource
+
+        :param res: The parent resource, or its ID.
+        """
+        res_id = resource.Resource.get_id(res)
+        with self._lock:
+            for key in [key for key in self._scopes
+                        if any(value == res_id for _, value in key[1])]:
+                del self._scopes[key]
+
+    def clear(self):
+        """Forget every index, so each is swept again when next needed"""
+        with self._lock:
+            self._scopes.clear()
@@ -0,0 +1,172 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import array
+import math
+import threading
+import time
+
+#: Seconds a traceroute is reused for by default.
+TTL = 600
+#: The most traceroutes to start per second by default.
+RATE = 5
+
+_NAN = float("nan")
+
+
+def summarize(hops):
+    """Reduce a traceroute to its final-hop latency, length and loss
+
+    :param list hops: The hops
+        :meth:`~rackspace.monitoring.v1.monitoring_zone.MonitoringZone.traceroute`
+        returns, each with a ``number`` and the ``rtts`` of its probes.
+
+    :returns: A ``(latency, length, loss)`` tuple. ``latency`` is the
+              mean round trip time to the final hop in milliseconds, or NaN
+              when it did not answer. ``length`` is the number of hops.
+              ``loss`` is the fraction of probes to the final hop which got
+              no answer, taking the most probes any hop was sent as the
+              number sent.
+    """
+    if not hops:
+        return _NAN, 0, 1.0
+    hops = sorted(hops, key=lambda hop: hop.get("number", 0))
+    probes = max(len(hop.get("rtts") or ()) for hop in hops)
+    final = hops[-1]
+    rtts = [rtt for rtt in final.get("rtts") or () if rtt is not None]
+    length = final.get("number", len(hops))
+    if not rtts:
+        return _NAN, length, 1.0
+    return (math.fsum(rtts) / len(rtts), length,
+            1.0 - float(len(rtts)) / max(probes, 1))
+
+
+class TracerouteCache(object):
+    """Traceroutes by the monitoring zone and target they were run between
+
+    It is safe to share between threads.
+
+    :param ttl: Seconds a traceroute is used for.
+    """
+
+    def __init__(self, ttl=TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, zone_id, target):
+        """The hops of a traceroute, or ``None`` if it is missing or old"""
+        with self._lock:
+            entry = self._entries.get((zone_id, target))
+            if entry is None:
+                return None
+            if time.time() - entry[0] >= self.ttl:
+                del self._entries[zone_id, target]
+                return None
+            return entry[1]
+
+    def put(self, zone_id, target, hops):
+        with self._lock:
+            self._entries[zone_id, target] = (time.time(), hops)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class LatencyMatrix(object):
+    """Traceroute results from monitoring zones to targets
+
+    Each measure is held in an array of doubles with a cell per zone and
+    target, a row per zone, and NaN where the traceroute failed.
+
+    :param list zone_ids: The IDs of the monitoring zones, one per row.
+    :param list targets: The targets, one per column.
+
+    :ivar dict errors: The exception raised by each ``(zone_id, target)``
+        traceroute which failed.
+    """
+
+    def __init__(self, zone_ids, targets):
+        self.zone_ids = list(zone_ids)
+        self.targets = list(targets)
+        self._rows = dict((zone_id, i)
+                          for i, zone_id in enumerate(self.zone_ids))
+        self._columns = dict((target, i)
+                             for i, target in enumerate(self.targets))
+        size = len(self.zone_ids) * len(self.targets)
+        #: Mean final-hop round trip time in milliseconds.
+        self.latencies = array.array("d", [_NAN]) * size
+        #: The number of hops.
+        self.lengths = array.array("d", [_NAN]) * size
+        #: The fraction of final-hop probes lost.
+        self.losses = array.array("d", [_NAN]) * size
+        self.errors = {}
+
+    def __repr__(self):
+        return "%s(zones=%d, targets=%d, errors=%d)" % (
+            self.__class__.__name__, len(self.zone_ids), len(self.targets),
+            len(self.errors))
+
+    def _index(self, zone_id, target):
+        return (self._rows[zone_id] * len(self.targets) +
+                self._columns[target])
+
+    def add(self, zone_id, target, hops):
+        """Record a traceroute
+
+        :param hops: The hops of the traceroute, or the exception it
+                     raised.
+        """
+        if isinstance(hops, Exception):
+            self.errors[zone_id, target] = hops
+            return
+        index = self._index(zone_id, target)
+        (self.latencies[index], self.lengths[index],
+         self.losses[index]) = summarize(hops)
+
+    def get(self, zone_id, target):
+        """The measures from a zone to a target
+
+        :returns: A ``(latency, length, loss)`` tuple, as :func:`summarize`
+                  returns, with NaN for a failed traceroute.
+        :raises: ``KeyError`` for an unknown zone or target.
+        """
+        index = self._index(zone_id, target)
+        return (self.latencies[index], self.lengths[index],
+                self.losses[index])
+
+    def row(self, zone_id, measure="latencies"):
+        """The values of a measure from one zone to every target"""
+        start = self._rows[zone_id] * len(self.targets)
+        return getattr(self, measure)[start:start + len(self.targets)]
+
+    def column(self, target, measure="latencies"):
+        """The values of a measure from every zone to one target"""
+        return getattr(self, measure)[self._columns[target]::
+                                      len(self.targets)]
+
+    def nearest(self, target, count=1):
+        """The zones with the lowest latency to a target
+
+        :returns: Up to ``count`` ``(zone_id, latency)`` tuples, lowest
+                  first, leaving out zones whose traceroute failed.
+        """
+        values = [(latency, zone_id) for zone_id, latency in
+                  zip(self.zone_ids, self.column(target))
+                  if not math.isnan(latency)]
+        return [(zone_id, latency)
+                for latency, zone_id in sorted(values)[:count]]
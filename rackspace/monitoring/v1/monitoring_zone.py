@@ -13,9 +13,10 @@
 from openstack import resource
 from openstack import utils
 from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
 
 
-class MonitoringZone(resource.Resource):
+class MonitoringZone(_base.BaseResource):
     base_path = 'monitoring_zones'
     resources_key = 'values'
     service = monitoring_service.MonitoringService()
@@ -13,9 +13,10 @@
 from openstack import resource
 from openstack import utils
 from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
 
 
-class Notification(resource.Resource):
+class Notification(_base.BaseResource):
     base_path = 'notifications'
     resources_key = 'values'
     service = monitoring_service.MonitoringService()
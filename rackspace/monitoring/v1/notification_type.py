@@ -12,9 +12,10 @@
 
 from openstack import resource
 from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
 
 
-class NotificationType(resource.Resource):
+class NotificationType(_base.BaseResource):
     base_path = 'notification_types'
     resources_key = 'values'
     service = monitoring_service.MonitoringService()
@@ -0,0 +1,440 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import collections
+
+import six
+
+from rackspace import utils
+
+#: The kinds of resource a desired state can hold, in the order they are
+#: created and updated. They are deleted in the reverse order.
+KINDS = ("notification", "notification_plan", "entity", "check", "alarm",
+         "suppression")
+
+# The attributes of each kind which name other resources, and the kind of
+# resource they name. A label is replaced with the ID of the resource.
+_REFERENCES = {
+    "notification_plan": {"critical_state": "notification",
+                          "warning_state": "notification",
+                          "ok_state": "notification"},
+    "alarm": {"notification_plan_id": "notification_plan"},
+    "suppression": {"entities": "entity",
+                    "notification_plans": "notification_plan"},
+}
+# Attributes whose order does not matter.
+_UNORDERED = frozenset(["critical_state", "warning_state", "ok_state",
+                        "monitoring_zones_poll", "entities", "checks",
+                        "alarms", "notification_plans"])
+# The keys of a desired state which nest other resources.
+_CHILDREN = {"entity": "checks", "check": "alarms"}
+
+
+class _Ref(object):
+    """A resource named by label which might not exist until it is made"""
+
+    def __init__(self, kind, scope, label):
+        self.kind = kind
+        self.scope = scope
+        self.label = label
+
+    @property
+    def key(self):
+        return self.kind, self.scope, self.label
+
+
+def _normalize(value):
+    if isinstance(value, six.string_types) and value in ("true", "false"):
+        return value == "true"
+    if isinstance(value, dict):
+        return dict((k, _normalize(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+_MISSING = object()
+
+
+def _covers(have, want):
+    # Only the keys a desired dict gives are compared, at any depth, as the
+    # API fills in defaults of its own, such as the method of an HTTP check.
+    if isinstance(want, dict):
+        return isinstance(have, dict) and all(
+            _covers(have.get(key, _MISSING), value)
+            for key, value in want.items())
+    if isinstance(want, list):
+        return isinstance(have, list) and len(have) == len(want) and all(
+            _covers(item, wanted) for item, wanted in zip(have, want))
+    return have == want
+
+
+def _equal(name, have, want):
+    have, want = _normalize(have), _normalize(want)
+    if name in _UNORDERED and isinstance(have, list) and \
+            isinstance(want, list):
+        return sorted(have, key=repr) == sorted(want, key=repr)
+    return _covers(have, want)
+
+
+def _created_id(res):
+    if res.id is not None:
+        return res.id
+    headers = res.get_headers() or {}
+    for name, value in headers.items():
+        if name.lower() == "x-object-id":
+            return value
+
+
+class Change(object):
+    """One write a reconcile will make
+
+    :ivar str action: ``create``, ``update`` or ``delete``.
+    :ivar str kind: One of :data:`KINDS`.
+    :ivar tuple path: The labels leading to the resource, such as
+        ``(entity, check, alarm)`` for an alarm.
+    :ivar dict attrs: The attributes to send. Those of an update are only
+        the ones which differ.
+    :ivar current: The existing resource, for an update or delete.
+    :ivar dict diff: For an update, the ``(current, desired)`` values of
+        each attribute which differs.
+    """
+
+    def __init__(self, action, kind, path, attrs=None, current=None,
+                 diff=None):
+        self.action = action
+        self.kind = kind
+        self.path = path
+        self.attrs = attrs or {}
+        self.current = current
+        self.diff = diff or {}
+
+    def __repr__(self):
+        return "<Change %s %s %s>" % (self.action, self.kind,
+                                      "/".join(self.path))
+
+    def __str__(self):
+        sign = {"create": "+", "update": "~", "delete": "-"}[self.action]
+        line = "%s %s %s" % (sign, self.kind, "/".join(self.path))
+        if self.diff:
+            line += " (%s)" % ", ".join(sorted(self.diff))
+        return line
+
+
+class Plan(object):
+    """The changes needed to bring an account to a desired state
+
+    :ivar list changes: The :class:`Change` objects, in the order they are
+        applied.
+    """
+
+    def __init__(self, changes=None, registry=None):
+        self.changes = changes or []
+        self._registry = registry or {}
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    __nonzero__ = __bool__
+
+    def __str__(self):
+        return "\n".join(str(change) for change in self.changes)
+
+
+class ApplyResult(object):
+    """What applying a plan did
+
+    :ivar list applied: The changes which were made.
+    :ivar list failed: A ``(change, exception)`` tuple for each change the
+        API rejected.
+    :ivar list skipped: The changes which were not attempted because a
+        resource they depend on could not be made.
+    """
+
+    def __init__(self):
+        self.applied = []
+        self.failed = []
+        self.skipped = []
+
+    @property
+    def ok(self):
+        """``True`` when every change was made"""
+        return not (self.failed or self.skipped)
+
+
+class Reconciler(object):
+    """Bring monitoring resources in line with a desired state
+
+    The desired state is a ``dict`` with a list for each of
+    ``notifications``, ``notification_plans``, ``entities`` and
+    ``suppressions``. Every resource is a ``dict`` of its attributes as
+    the API names them, and must have a ``label``, which is how it is
+    matched with what exists. An entity may list its ``checks``, and a
+    check its ``alarms``. Notification plans, alarms and suppressions may
+    name the notifications, plans and entities they use by label. For
+    example::
+
+        {"notifications": [{"label": "ops", "type": "email",
+                            "details": {"address": "ops@example.com"}}],
+         "notification_plans": [{"label": "page", "critical_state": ["ops"]}],
+         "entities": [{"label": "web1", "checks": [
+             {"label": "ping", "type": "remote.ping",
+              "monitoring_zones_poll": ["mzdfw"], "target_alias": "default",
+              "alarms": [{"label": "down", "notification_plan_id": "page",
+                          "criteria": "return new AlarmStatus(OK);"}]}]}]}
+
+    Only the attributes a desired resource gives are compared, so a
+    resource which already matches is never written.
+
+    :param proxy: The :class:`~rackspace.monitoring.v1._proxy.Proxy` to use.
+    :param int workers: The number of writes to make at a time.
+    :param bool prune: Delete resources of each kind which the desired
+        state does not list, including the checks and alarms of the
+        entities it lists.
+    """
+
+    def __init__(self, proxy, workers=8, prune=False):
+        self.proxy = proxy
+        self.workers = workers
+        self.prune = prune
+
+    def _current(self):
+        current = collections.defaultdict(
+            lambda: collections.defaultdict(list))
+        for kind, listing in (("notification", self.proxy.notifications),
+                              ("notification_plan",
+                               self.proxy.notification_plans),
+                              ("suppression", self.proxy.suppressions)):
+            for res in listing():
+                current[kind, ()][res.name].append(res)
+
+        fleet = self.proxy.fleet_snapshot()
+        for entity in fleet.entities.values():
+            current["entity", ()][entity.name].append(entity)
+            scope = (entity.name,)
+            for check in fleet.checks_for(entity):
+                current["check", scope][check.name].append(check)
+            for alarm in fleet.alarms_for(entity):
+                current["alarm", scope][alarm.name].append(alarm)
+        return current
+
+    def plan(self, desired):
+        """Work out the changes needed, without making any
+
+        :param dict desired: The desired state.
+
+        :returns: :class:`Plan`
+        :raises: ``ValueError`` if a desired resource has no label, or
+                 matches more than one existing resource.
+        """
+        current = self._current()
+        registry = {}
+        for (kind, scope), by_label in current.items():
+            for label, found in by_label.items():
+                if len(found) == 1:
+                    registry[kind, scope, label] = found[0].id
+
+        wanted = []
+        for kind, key in (("notification", "notifications"),
+                          ("notification_plan", "notification_plans"),
+                          ("suppression", "suppressions")):
+            for spec in desired.get(key, ()):
+                wanted.append((kind, (), spec, {}))
+        for entity in desired.get("entities", ()):
+            wanted.append(("entity", (), entity, {}))
+            for check in entity.get("checks", ()):
+                scope = (entity.get("label"),)
+                wanted.append(("check", scope, check, {}))
+                check_ref = _Ref("check", scope, check.get("label"))
+                for alarm in check.get("alarms", ()):
+                    wanted.append(("alarm", scope, alarm,
+                                   {"check_id": check_ref}))
+
+        desired_keys = set()
+        for kind, scope, spec, _ in wanted:
+            if not spec.get("label"):
+                raise ValueError("Every %s needs a label" % kind)
+            desired_keys.add((kind, scope, spec["label"]))
+
+        changes = collections.defaultdict(list)
+        for kind, scope, spec, implied in wanted:
+            label = spec["label"]
+            attrs = dict((k, v) for k, v in spec.items()
+                         if k != _CHILDREN.get(kind))
+            attrs.update(implied)
+            for name, target in _REFERENCES.get(kind, {}).items():
+                if name in attrs:
+                    attrs[name] = self._references(
+                        attrs[name], target, desired_keys)
+
+            found = current[kind, scope].get(label, [])
+            if len(found) > 1:
+                raise ValueError("More than one %s is labelled %s" %
+                                 (kind, "/".join(scope + (label,))))
+            path = scope + (label,)
+            if not found:
+                changes[kind].append(Change("create", kind, path, attrs))
+                continue
+
+            diff = {}
+            for name, value in attrs.items():
+                resolved = self._resolve(value, registry)
+                if resolved is _MISSING:
+                    diff[name] = (found[0][name] if name in found[0]
+                                  else None, value)
+                    continue
+                have = found[0][name] if name in found[0] else None
+                if not _equal(name, have, resolved):
+                    diff[name] = (have, resolved)
+            if diff:
+                changes[kind].append(Change(
+                    "update", kind, path,
+                    dict((name, attrs[name]) for name in diff),
+                    current=found[0], diff=diff))
+
+        deletes = []
+        if self.prune:
+            managed = set([(e.get("label"),)
+                           for e in desired.get("entities", ())])
+            for (kind, scope), by_label in current.items():
+                if kind in ("check", "alarm") and scope not in managed:
+                    continue
+                for label, found in by_label.items():
+                    if (kind, scope, label) in desired_keys:
+                        continue
+                    for res in found:
+                        deletes.append(Change("delete", kind,
+                                              scope + (label,),
+                                              current=res))
+        deletes.sort(key=lambda change: (-KINDS.index(change.kind),
+                                         change.path))
+
+        ordered = []
+        for kind in KINDS:
+            ordered.extend(sorted(changes[kind],
+                                  key=lambda change: change.path))
+        return Plan(ordered + deletes, registry)
+
+    @staticmethod
+    def _references(value, kind, desired_keys):
+        def ref(item):
+            if (kind, (), item) in desired_keys:
+                return _Ref(kind, (), item)
+            return item
+        if isinstance(value, (list, tuple)):
+            return [ref(item) for item in value]
+        return ref(value)
+
+    @staticmethod
+    def _resolve(value, registry):
+        if isinstance(value, _Ref):
+            return registry.get(value.key, _MISSING)
+        if isinstance(value, list):
+            resolved = [Reconciler._resolve(item, registry)
+                        for item in value]
+            if any(item is _MISSING for item in resolved):
+                return _MISSING
+            return resolved
+        return value
+
+    def apply(self, plan):
+        """Make the changes of a plan
+
+        Changes of one kind are made concurrently, one kind after another
+        in the order of :data:`KINDS`, so that every resource exists before
+        anything which names it. Deletes are made last, in the reverse
+        order. A change which names a resource that could not be created is
+        skipped.
+
+        :param plan: A :class:`Plan` from :meth:`plan`.
+
+        :returns: :class:`ApplyResult`
+        """
+        registry = dict(plan._registry)
+        result = ApplyResult()
+
+        phases = []
+        for change in plan:
+            if not phases or phases[-1][0] != (change.action == "delete",
+                                               change.kind):
+                phases.append(((change.action == "delete", change.kind), []))
+            phases[-1][1].append(change)
+
+        for _, changes in phases:
+            ready = []
+            for change in changes:
+                attrs = dict((name, self._resolve(value, registry))
+                             for name, value in change.attrs.items())
+                parent = None
+                if change.kind in ("check", "alarm"):
+                    parent = registry.get(("entity", (), change.path[0]),
+                                          _MISSING)
+                if parent is _MISSING or any(
+                        value is _MISSING for value in attrs.values()):
+                    result.skipped.append(change)
+                else:
+                    ready.append((change, attrs, parent))
+
+            outcomes = utils.imap(self._write, ready, workers=self.workers,
+                                  ordered=False)
+            for (change, _, _), outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    result.failed.append((change, outcome))
+                    continue
+                result.applied.append(change)
+                key = (change.kind, change.path[:-1], change.path[-1])
+                if change.action == "delete":
+                    registry.pop(key, None)
+                elif change.action == "create":
+                    created = _created_id(outcome)
+                    if created is not None:
+                        registry[key] = created
+        return result
+
+    def _write(self, task):
+        change, attrs, parent = task
+        name = change.kind
+        try:
+            if change.action == "create":
+                method = getattr(self.proxy, "create_" + name)
+                if parent is not None:
+                    return method(parent, **attrs)
+                return method(**attrs)
+            if change.action == "update":
+                method = getattr(self.proxy, "update_" + name)
+                if parent is not None:
+                    return method(change.current, parent, **attrs)
+                return method(change.current, **attrs)
+            method = getattr(self.proxy, "delete_" + name)
+            if parent is not None:
+                return method(change.current, parent, ignore_missing=True)
+            return method(change.current, ignore_missing=True)
+        except Exception as e:
+            return e
+
+    def reconcile(self, desired, dry_run=False):
+        """Plan the changes needed and, unless ``dry_run``, make them
+
+        :returns: A ``(plan, result)`` tuple, where ``result`` is an
+                  :class:`ApplyResult`, or ``None`` for a dry run.
+        """
+        plan = self.plan(desired)
+        if dry_run or not plan:
+            return plan, None
+        return plan, self.apply(plan)
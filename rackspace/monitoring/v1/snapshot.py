@@ -0,0 +1,173 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import hashlib
+import json
+
+from rackspace import utils
+
+#: The field, or fields, which identify a row of each type of host info.
+#: Types which report a single ``dict`` have no key.
+KEYS = {
+    "cpus": "name",
+    "disks": "name",
+    "filesystems": "dir_name",
+    "memory": None,
+    "network_interfaces": "name",
+    "processes": "pid",
+    "system": None,
+    "who": ("user", "device"),
+}
+
+
+def content_hash(info):
+    """A hash of host info which only changes when its content does"""
+    data = json.dumps(info, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def _rows(info, key):
+    if isinstance(info, dict):
+        return {None: info}
+    rows = {}
+    for position, row in enumerate(info):
+        if isinstance(key, tuple):
+            row_key = tuple(row.get(field) for field in key)
+        elif key is not None and key in row:
+            row_key = row[key]
+        else:
+            row_key = position
+        rows[row_key] = row
+    return rows
+
+
+class Delta(object):
+    """How one type of host info of an agent changed between snapshots
+
+    Rows are keyed by the field :data:`KEYS` gives for the type, such as
+    the ``pid`` of a process, or by ``None`` for a type which reports a
+    single ``dict``.
+
+    :ivar str agent_id: The ID of the agent.
+    :ivar str name: The type of host info.
+    :ivar dict added: New rows, by key.
+    :ivar dict removed: Rows which are gone, by key.
+    :ivar dict changed: For each row which is still there but differs, a
+        ``dict`` of ``(old, new)`` values by field. A field which was added
+        or removed has ``None`` as its old or new value.
+    """
+
+    def __init__(self, agent_id, name, added=None, removed=None,
+                 changed=None):
+        self.agent_id = agent_id
+        self.name = name
+        self.added = added or {}
+        self.removed = removed or {}
+        self.changed = changed or {}
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return ("<Delta %s %s: %d added, %d removed, %d changed>" %
+                (self.agent_id, self.name, len(self.added),
+                 len(self.removed), len(self.changed)))
+
+
+def diff(agent_id, name, old, new):
+    """Compare two snapshots of one type of host info
+
+    :param str agent_id: The ID of the agent.
+    :param str name: The type of host info.
+    :param old: The earlier ``info``, or ``None`` if there was none.
+    :param new: The later ``info``.
+
+    :returns: :class:`Delta`
+    """
+    key = KEYS.get(name)
+    before = _rows(old, key) if old is not None else {}
+    after = _rows(new, key)
+
+    delta = Delta(agent_id, name)
+    for row_key, row in after.items():
+        if row_key not in before:
+            delta.added[row_key] = row
+            continue
+        previous = before[row_key]
+        if previous == row:
+            continue
+        delta.changed[row_key] = dict(
+            (field, (previous.get(field), row.get(field)))
+            for field in set(previous) | set(row)
+            if previous.get(field) != row.get(field))
+    for row_key, row in before.items():
+        if row_key not in after:
+            delta.removed[row_key] = row
+    return delta
+
+
+class SnapshotStore(object):
+    """The last snapshot of each type of host info of each agent
+
+    Each snapshot is kept with a hash of its content, so a new one which
+    is the same is recognised without comparing any rows.
+
+    :param str path: Where the store is saved, if anywhere.
+    :param dict entries: The snapshots, by agent ID then type, each a
+        ``dict`` of its ``hash`` and ``info``.
+    """
+
+    def __init__(self, path=None, entries=None):
+        self.path = path
+        self.entries = {} if entries is None else entries
+
+    @classmethod
+    def load(cls, path):
+        """Read a store, starting an empty one if it can't be read"""
+        entries = utils.load_json(path)
+        return cls(path, entries if isinstance(entries, dict) else None)
+
+    def save(self):
+        """Write the store, replacing the old one in a single step"""
+        utils.save_json(self.path, self.entries)
+
+    def get(self, agent_id, name):
+        """The last ``info`` recorded, or ``None``"""
+        entry = self.entries.get(agent_id, {}).get(name)
+        return entry["info"] if entry else None
+
+    def update(self, agent_id, name, info):
+        """Record a new snapshot and work out what changed
+
+        :param str agent_id: The ID of the agent.
+        :param str name: The type of host info.
+        :param info: The ``info`` the agent reported.
+
+        :returns: A :class:`Delta`, or ``None`` when the content is the same
+                  as the last snapshot. Every row of the first snapshot of
+                  an agent and type is added.
+        """
+        digest = content_hash(info)
+        snapshots = self.entries.setdefault(agent_id, {})
+        entry = snapshots.get(name)
+        if entry is not None and entry["hash"] == digest:
+            return None
+
+        snapshots[name] = {"hash": digest, "info": info}
+        return diff(agent_id, name, entry["info"] if entry else None, info)
+
+    def forget(self, agent_id):
+        """Drop every snapshot of an agent, such as one which was removed"""
+        self.entries.pop(agent_id, None)
@@ -12,9 +12,10 @@
 
 from openstack import resource
 from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
 
 
-class SuppressionLog(resource.Resource):
+class SuppressionLog(_base.BaseResource):
     base_path = 'suppression_logs'
     resources_key = 'values'
     service = monitoring_service.MonitoringService()
@@ -10,38 +10,541 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import itertools
+import os
+
+from openstack import exceptions
 from openstack.object_store.v1 import _proxy
 from openstack.object_store.v1 import container as _container
+from openstack.object_store.v1 import obj as _obj
+from openstack import service_filter
+import six
 
 from rackspace.object_store.v1 import bulk_delete
+from rackspace.object_store.v1 import extract_archive
+from rackspace.object_store.v1 import listing
+from rackspace.object_store.v1 import metadata as _metadata
+from rackspace.object_store.v1 import ranged_download
+from rackspace.object_store.v1 import static_large_object as _slo
+from rackspace.object_store.v1 import sync as _sync
+from rackspace.object_store.v1 import temp_url
+from rackspace.object_store.v1 import verify
+from rackspace import utils
 
 
 class Proxy(_proxy.Proxy):
 
     def __init__(self, session):
         super(Proxy, self).__init__(session)
+        self._temp_url_signer = None
 
-    # TODO(briancurtin): Bulk delete can also take a list of containers,
-    # not just empty out the objects within a container.
+    def walk_objects(self, container, prefix="", delimiter="/",
+                     prefixes=None, workers=4, names_only=False,
+                     page_size=listing.PAGE_SIZE):
+        """Return a generator that yields a container's objects, fast
 
-    def bulk_delete(self, container):
-        """Delete all objects in a container
+        Rather than one chain of requests, each waiting on the marker of
+        the page before it, the keyspace is split into partitions which are
+        listed concurrently and chained back together in lexical order. By
+        default the partitions are the pseudo-directories found by listing
+        ``prefix`` with ``delimiter``, and the objects directly below
+        ``prefix`` are yielded between them.
 
-        :param container: The container with objects to delete. You can
-            pass a container object or the name of a container.
+        Up to ``workers`` partitions are listed at once, each a page ahead
+        of where it is consumed, so memory use stays bounded however many
+        partitions there are. A single large partition is still listed one
+        page after another.
+
+        :param container: A container object or the name of a container
+            that you want to retrieve objects from.
         :type container:
             :class:`~openstack.object_store.v1.container.Container`
+        :param str prefix: Only list objects whose names start with this.
+        :param str delimiter: The character which separates the
+            pseudo-directories the keyspace is split on.
+        :param list prefixes: Partition the keyspace on these prefixes
+            instead, listing only objects whose names start with one of
+            them.
+        :param int workers: The number of partitions to list at once.
+        :param bool names_only: Yield object names rather than
+            :class:`~openstack.object_store.v1.obj.Object` resources, which
+            saves memory on very large containers.
+        :param int page_size: The number of objects to request per page.
+
+        :rtype: A generator of
+            :class:`~openstack.object_store.v1.obj.Object` objects, or of
+            ``str`` when ``names_only`` is set.
+        """
+        container = _container.Container.from_id(container)
+
+        # One more thread than partitions, for the listing which finds them.
+        with utils.Pool(workers + 1) as pool:
+            for entry in listing.walk(self.session, container.name, prefix,
+                                      delimiter, prefixes, page_size, pool,
+                                      window=workers):
+                if names_only:
+                    yield entry["name"]
+                else:
+                    yield _obj.Object.existing(container=container.name,
+                                               **entry)
+
+    def _bulk_delete_paths(self, containers, prefix=None):
+        for container in containers:
+            params = {} if prefix is None else {"prefix": prefix}
+            for obj in self.objects(container, paginated=True,
+                                    params=params):
+                yield "/{0.container}/{0.name}".format(obj)
+
+    def _bulk_delete(self, phases,
+                     batch_size=bulk_delete.MAX_DELETES_PER_REQUEST,
+                     batch_bytes=bulk_delete.MAX_BODY_SIZE, workers=1):
+        def delete(paths):
+            bodies = bulk_delete.batch_paths(paths, batch_size, batch_bytes)
+            return bulk_delete.BulkDelete.delete_batches(
+                self.session, bodies, workers=workers)
+
+        # Each phase is only started once the one before it is exhausted,
+        # so no container is deleted while its objects are still in flight.
+        return bulk_delete.BulkDelete.merge(
+            itertools.chain.from_iterable(delete(paths) for paths in phases))
+
+    def bulk_delete(self, container, prefix=None, delete_container=False,
+                    batch_size=bulk_delete.MAX_DELETES_PER_REQUEST,
+                    batch_bytes=bulk_delete.MAX_BODY_SIZE, workers=1):
+        """Delete all objects in one or more containers
+
+        The containers are listed lazily, a page at a time, and their
+        objects are deleted in batches as the listing goes, so only one
+        batch of object names is held in memory no matter how many objects
+        the containers have.
+        Batches are filled across container boundaries, so many small
+        containers are emptied with few requests.
+
+        With more than one worker, batches are sent concurrently from a pool
+        of threads while the listing fills a bounded queue of batches ahead
+        of them. Requests the server throttles are retried with an
+        exponential backoff.
+
+        When ``delete_container`` is set, the containers themselves are
+        deleted once every object batch has completed, so they are empty by
+        the time they are removed. A container which still holds objects,
+        for example because ``prefix`` did not match all of them, is
+        reported in the errors of the result.
+
+        :param container: The container or containers with objects to
+            delete. You can pass a container object or the name of a
+            container, or a list of either.
+        :type container:
+            :class:`~openstack.object_store.v1.container.Container`
+        :param str prefix: Only delete objects whose names start with this.
+        :param bool delete_container: Delete the containers after emptying
+            them.
+        :param int batch_size: The most objects to delete in one request.
+        :param int batch_bytes: The largest request body to send, in bytes.
+        :param int workers: The number of requests to have in flight at once.
 
         :returns: An object containing information about the
-            bulk delete operation
+            bulk delete operation, combined across every request made
         :rtype:
             :class:`~rackspace.object_store.v1.bulk_delete.BulkDelete`
         """
-        objects = []
+        if isinstance(container, (six.string_types, _container.Container)):
+            container = [container]
+        containers = [_container.Container.from_id(value)
+                      for value in container]
+
+        phases = [self._bulk_delete_paths(containers, prefix)]
+        if delete_container:
+            phases.append("/" + value.name for value in containers)
+
+        return self._bulk_delete(phases, batch_size, batch_bytes, workers)
+
+    def upload_archive(self, container, source, archive_format="tar"):
+        """Upload many files at once from an archive
+
+        The archive is streamed to the server, which extracts every file in
+        it into the container as an object named by its path in the archive.
+
+        :param container: The container to extract the archive into. You
+            can pass a container object or the name of a container.
+        :type container:
+            :class:`~openstack.object_store.v1.container.Container`
+        :param source: The path of a directory, which is archived on the fly
+            while it is uploaded so the archive never touches the disk, the
+            path of an existing archive, or a file object of an archive
+            opened in binary mode.
+        :param str archive_format: The format of the archive, or the format
+            to archive a directory in. Valid values are ``tar``, ``tar.gz``
+            and ``tar.bz2``.
+
+        :returns: An object containing information about the extract
+            archive operation, including any per-file errors
+        :rtype:
+            :class:`~rackspace.object_store.v1.extract_archive.ExtractArchive`
+        """
+        container = _container.Container.from_id(container)
+
+        if not isinstance(source, six.string_types):
+            body = extract_archive.iter_file(source)
+        elif os.path.isdir(source):
+            body = extract_archive.iter_tar(source, archive_format)
+        else:
+            with open(source, "rb") as archive:
+                return extract_archive.ExtractArchive.upload(
+                    self.session, container.name,
+                    extract_archive.iter_file(archive), archive_format)
+
+        return extract_archive.ExtractArchive.upload(
+            self.session, container.name, body, archive_format)
+
+    def upload_large_object(self, container, name, path,
+                            segment_size=_slo.SEGMENT_SIZE,
+                            segment_container=None, workers=4, retries=3):
+        """Upload a file as a static large object
+
+        The file is cut into segments which are uploaded concurrently, each
+        read through a reusable buffer with its MD5 checksum computed as it
+        is sent and checked against the ETag the server returns. A segment
+        which fails is retried on its own. Once every segment is stored, the
+        manifest tying them together is uploaded as the object itself.
+
+        Use this for files larger than 5 GB, which can't be uploaded in one
+        request, or to upload large files faster than one stream allows.
+
+        :param container: The container to upload the object to. You can
+            pass a container object or the name of a container.
+        :type container:
+            :class:`~openstack.object_store.v1.container.Container`
+        :param str name: The name of the object.
+        :param str path: The path of the file to upload.
+        :param int segment_size: The size of the segments in bytes. It is
+            grown if the file would otherwise need more than
+            :data:`~rackspace.object_store.v1.static_large_object.MAX_SEGMENTS`.
+        :param str segment_container: The name of the container to store
+            the segments in. Defaults to the container name with
+            ``_segments`` appended.
+        :param int workers: The number of segments to upload at once.
+        :param int retries: The most times to retry each segment.
+
+        :returns: The manifest of the uploaded object
+        :rtype: :class:`~rackspace.object_store.v1.static_large_object.
+            StaticLargeObject`
+        """
         container = _container.Container.from_id(container)
-        for obj in self.objects(container):
-            full_name = "/{0.container}/{0.name}".format(obj)
-            objects.append(full_name)
-        objects = "\n".join(objects)
+        if segment_container is None:
+            segment_container = container.name + "_segments"
+
+        size = os.path.getsize(path)
+        if not size:
+            raise ValueError("An empty file can't be uploaded in segments")
+        segment_size = _slo.segment_size_for(size, segment_size)
+
+        self.create_container(name=segment_container)
+
+        prefix = _slo.segment_prefix(name, os.path.getmtime(path), size,
+                                     segment_size)
+
+        def upload(offset):
+            length = min(segment_size, size - offset)
+            segment = "%s/%08d" % (prefix, offset // segment_size)
+            return utils.retry(
+                lambda: _slo.StaticLargeObject.upload_segment(
+                    self.session, path, segment_container, segment, offset,
+                    length),
+                attempts=retries + 1)
 
-        return bulk_delete.BulkDelete.delete(self.session, objects)
+        segments = [entry for offset, entry in
+                    utils.imap(upload, range(0, size, segment_size),
+                               workers=workers)]
+
+        manifest = _slo.StaticLargeObject.new(container=container.name,
+                                              name=name, segments=segments)
+        return manifest.create(self.session)
+
+    def download_object(self, obj, container=None, path=None, parallel=1,
+                        chunk_size=ranged_download.CHUNK_SIZE, retries=3):
+        """Download the data contained inside an object to disk.
+
+        The object is fetched in ranges, ``parallel`` at a time, each
+        written straight to its place in a file preallocated to the size of
+        the object. Progress is recorded in a checkpoint file next to
+        ``path``, so when a download is interrupted, calling this again
+        only fetches the ranges which are missing. The checkpoint is
+        discarded if the object has changed since, and removed once the
+        download completes.
+
+        :param obj: The value can be the name of an object or a
+                       :class:`~openstack.object_store.v1.obj.Object` instance.
+        :param container: The value can be the name of a container or a
+               :class:`~openstack.object_store.v1.container.Container`
+               instance.
+        :param path str: Location to write the object contents.
+        :param int parallel: The number of ranges to download at once.
+        :param int chunk_size: The size of each range in bytes.
+        :param int retries: The most times to retry each range.
+
+        :raises: :class:`~openstack.exceptions.ResourceNotFound`
+                 when no resource can be found.
+        """
+        container_name = self._get_container_name(obj, container)
+        meta = self.get_object_metadata(obj, container_name)
+        size = int(meta.content_length)
+
+        checkpoint = ranged_download.Checkpoint.load(
+            path + ranged_download.CHECKPOINT_SUFFIX)
+        resume = (checkpoint is not None and
+                  checkpoint.matches(meta.etag, size, chunk_size) and
+                  os.path.isfile(path) and os.path.getsize(path) == size)
+        if not resume:
+            checkpoint = ranged_download.Checkpoint(
+                path + ranged_download.CHECKPOINT_SUFFIX, meta.etag, size,
+                chunk_size)
+
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        fd = os.open(path, flags, 0o666)
+        try:
+            if not resume:
+                os.ftruncate(fd, size)
+                checkpoint.save()
+
+            # A range fails with 412 once the object has changed since the
+            # download began, which retrying can't fix.
+            def fetch(offset):
+                length = min(chunk_size, size - offset)
+                return utils.retry(
+                    lambda: ranged_download.fetch_range(
+                        self.session, container_name, meta.name, fd, offset,
+                        length, etag=meta.etag),
+                    attempts=retries + 1,
+                    retry_on=lambda e: getattr(e, "http_status", None) != 412)
+
+            for offset, _ in utils.imap(fetch, checkpoint.remaining(),
+                                        workers=parallel, ordered=False):
+                checkpoint.done.add(offset)
+                checkpoint.save()
+        finally:
+            os.close(fd)
+
+        checkpoint.remove()
+
+    def sync_directory(self, local_path, container, delete=True, workers=4,
+                       segment_size=_slo.SEGMENT_SIZE, index_path=None):
+        """Make a container match a local directory
+
+        Every file below ``local_path`` is stored as an object named by its
+        path relative to it. Files whose checksum doesn't match the object
+        of the same name are uploaded, ``workers`` at a time, and with
+        ``delete`` set, objects without a matching file are bulk deleted.
+        Large files are uploaded with :meth:`upload_large_object`, and the
+        segments of large objects which are replaced or deleted are bulk
+        deleted after them.
+
+        The checksums of the files are kept in an index, so only files
+        whose size or modification time changed since the last sync are
+        read. The container is listed a page at a time and only the names
+        and checksums of its objects are kept.
+
+        :param str local_path: The directory to sync.
+        :param container: The container to sync to. You can pass a
+            container object or the name of a container.
+        :type container:
+            :class:`~openstack.object_store.v1.container.Container`
+        :param bool delete: Delete objects which have no file.
+        :param int workers: The number of files to upload at once.
+        :param int segment_size: Files larger than this are uploaded as
+            static large objects in segments of this size.
+        :param str index_path: Where to keep the index. Defaults to
+            :data:`~rackspace.object_store.v1.sync.INDEX_NAME` inside
+            ``local_path``, which is never uploaded.
+
+        :returns: What the sync did
+        :rtype: :class:`~rackspace.object_store.v1.sync.SyncResult`
+        """
+        container = _container.Container.from_id(container)
+        if index_path is None:
+            index_path = os.path.join(local_path, _sync.INDEX_NAME)
+
+        index = _sync.Index.load(index_path)
+        local = index.scan(local_path)
+        remote = dict((obj.name, obj.hash) for obj in
+                      self.objects(container, paginated=True))
+
+        result = _sync.SyncResult()
+        changed = []
+        for name in sorted(local):
+            entry = local[name]
+            if name in remote and remote[name] in (entry["md5"],
+                                                   entry["etag"]):
+                result.skipped += 1
+            else:
+                changed.append(name)
+
+        def upload(name):
+            path = os.path.join(local_path, *name.split("/"))
+            if local[name]["size"] > segment_size:
+                manifest = self.upload_large_object(
+                    container, name, path, segment_size=segment_size)
+                return (manifest.get_headers().get("etag"),
+                        [entry["path"] for entry in manifest.segments])
+            with open(path, "rb") as data:
+                return self.upload_object(container=container.name,
+                                          name=name, data=data).etag, []
+
+        # The index is saved even when an upload fails so the files which
+        # were hashed and uploaded are not processed again next time.
+        kept = set()
+        try:
+            for name, (etag, segments) in utils.imap(
+                    upload, changed, workers=workers, ordered=False):
+                local[name]["etag"] = etag.strip('"') if etag else None
+                result.uploaded.append(name)
+                kept.update(segments)
+        finally:
+            index.save()
+
+        replaced = set(result.uploaded)
+        phases = []
+        if delete:
+            gone = [name for name in sorted(remote) if name not in local]
+            replaced.update(gone)
+            if gone:
+                phases.append(["/%s/%s" % (container.name, name)
+                               for name in gone])
+        # Large objects which were uploaded again or deleted leave their
+        # old segments behind, which are deleted once the manifests are.
+        segments = self._replaced_segments(container.name + "_segments",
+                                           replaced, kept)
+        if segments:
+            phases.append(segments)
+        if phases:
+            result.deleted = self._bulk_delete(phases, workers=workers)
+
+        return result
+
+    def _replaced_segments(self, segment_container, names, kept):
+        if not names:
+            return []
+        paths = []
+        try:
+            for obj in self.objects(segment_container, paginated=True):
+                path = "/%s/%s" % (segment_container, obj.name)
+                if (_slo.segment_owner(obj.name) in names and
+                        path not in kept):
+                    paths.append(path)
+        except exceptions.NotFoundException:
+            pass
+        return paths
+
+    def bulk_update_metadata(self, container, headers, names=None,
+                             prefix=None, workers=16, retries=3):
+        """Set headers on many objects at once
+
+        Each object is checked with a HEAD request first and skipped when
+        it already has the headers. Otherwise its existing metadata is
+        merged with ``headers`` and POSTed back, since a POST replaces all
+        of an object's metadata. Up to ``workers`` objects are updated at
+        once, and requests which are throttled or fail on the server are
+        retried. An object which can't be updated doesn't stop the others.
+
+        :param container: The container the objects are in. You can pass
+            a container object or the name of a container.
+        :type container:
+            :class:`~openstack.object_store.v1.container.Container`
+        :param dict headers: The headers to set, such as ``Cache-Control``,
+            ``Content-Type`` or ``X-Object-Meta-Color``. A value of ``None``
+            removes the header.
+        :param names: The names of the objects to update. When not given,
+            every object in the container is updated.
+        :param str prefix: Only update objects whose names start with this,
+            when ``names`` is not given.
+        :param int workers: The number of objects to update at once.
+        :param int retries: The most times to retry each object.
+
+        :returns: A summary of the updates
+        :rtype:
+            :class:`~rackspace.object_store.v1.metadata.MetadataUpdate`
+        """
+        container = _container.Container.from_id(container)
+        patch = _metadata.normalize(headers)
+        if names is None:
+            names = self.walk_objects(container, prefix=prefix or "",
+                                      names_only=True)
+
+        def update(name):
+            try:
+                return utils.retry(
+                    lambda: _metadata.update_object(
+                        self.session, container.name, name, patch),
+                    attempts=retries + 1,
+                    retry_on=utils.is_retryable)
+            except Exception as e:
+                return e
+
+        result = _metadata.MetadataUpdate()
+        for name, outcome in utils.imap(update, names, workers=workers,
+                                        ordered=False):
+            result.add(name, outcome)
+        return result
+
+    def get_temp_url_signer(self, refresh=False):
+        """Get a signer for the account's temporary URLs
+
+        The account key is fetched the first time and the signer is kept,
+        so later calls make no requests. Pass ``refresh`` after changing
+        the key.
+
+        :param bool refresh: Fetch the key again.
+
+        :rtype: :class:`~rackspace.object_store.v1.temp_url.TempURLSigner`
+        :raises: ``ValueError`` if the account has no temporary URL key.
+        """
+        if refresh or self._temp_url_signer is None:
+            account = self.get_account_metadata()
+            key = account.meta_temp_url_key or account.meta_temp_url_key_2
+            if not key:
+                raise ValueError("The account has no temporary URL key")
+            endpoint = self.session.get_endpoint(
+                service_type="object-store",
+                interface=service_filter.ServiceFilter.PUBLIC)
+            self._temp_url_signer = temp_url.TempURLSigner(key, endpoint)
+        return self._temp_url_signer
+
+    def generate_temp_urls(self, requests):
+        """Sign temporary URLs for many objects at once
+
+        :param requests: An iterable of ``(method, path, expires)`` tuples,
+            where ``path`` is the object as ``container/object`` and
+            ``expires`` is when the URL stops working, in seconds since
+            the epoch.
+
+        :returns: The signed URLs, in the order of ``requests``
+        """
+        return self.get_temp_url_signer().sign(requests)
+
+    def verify_container(self, container, local_root, prefix=None,
+                         processes=None, workers=4):
+        """Check that a container's objects match local files
+
+        The container is listed with :meth:`walk_objects` and the ETag of
+        each object is compared with the MD5 checksum of the file of the
+        same name below ``local_root``. Files are hashed through memory
+        maps by a pool of processes, while the listing is consumed a batch
+        at a time.
+
+        :param container: The container to verify. You can pass a
+            container object or the name of a container.
+        :type container:
+            :class:`~openstack.object_store.v1.container.Container`
+        :param str local_root: The directory holding the files.
+        :param str prefix: Only verify objects whose names start with this.
+        :param int processes: The number of processes to hash files in.
+            Defaults to the number of CPUs.
+        :param int workers: The number of listing requests to make at once.
+
+        :returns: A report of the objects which matched and which didn't
+        :rtype: :class:`~rackspace.object_store.v1.verify.VerifyReport`
+        """
+        objects = ((obj.name, obj.hash, "slo_etag" in obj)
+                   for obj in self.walk_objects(container, prefix=prefix or "",
+                                                workers=workers))
+        return verify.verify(objects, local_root, processes=processes)
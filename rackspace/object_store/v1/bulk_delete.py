@@ -10,8 +10,53 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from openstack import exceptions
 from openstack.object_store import object_store_service
 from openstack import resource
+import six
+from six.moves.urllib import parse
+
+from rackspace import utils
+
+#: The most lines the bulk delete middleware accepts in a single request.
+MAX_DELETES_PER_REQUEST = 10000
+#: The largest request body, in bytes, sent in a single request.
+MAX_BODY_SIZE = 2 * 1024 * 1024
+#: Status codes the server responds with when it is throttling requests.
+THROTTLE_CODES = (429, 498)
+
+
+def batch_paths(paths, max_lines=MAX_DELETES_PER_REQUEST,
+                max_bytes=MAX_BODY_SIZE):
+    """Group paths into bulk delete request bodies
+
+    Paths are URL encoded, as the API expects, and consumed lazily so
+    only one batch is ever held in memory.
+
+    :param paths: An iterable of paths in the format /container_name or
+        /container_name/object_name.
+    :param int max_lines: The most paths to put in one body.
+    :param int max_bytes: The largest body to build, in bytes. A path
+        longer than this is sent in a body of its own.
+
+    :returns: A generator of request bodies
+    """
+    batch = []
+    size = 0
+    for path in paths:
+        if isinstance(path, six.text_type):
+            path = path.encode("utf-8")
+        line = parse.quote(path)
+        length = len(line) + 1
+        if batch and (len(batch) >= max_lines or size + length > max_bytes):
+            yield "\n".join(batch)
+            batch = []
+            size = 0
+        batch.append(line)
+        size += length
+
+    if batch:
+        yield "\n".join(batch)
 
 
 class BulkDelete(resource.Resource):
@@ -31,6 +76,10 @@ class BulkDelete(resource.Resource):
     #: Any additional response body
     response_body = resource.prop("Response Body")
 
+    #: The results of the individual requests this result was merged from,
+    #: in the order they were sent. ``None`` unless built by :meth:`merge`.
+    batches = None
+
     @classmethod
     def delete(cls, session, body):
         """Issue a delete call on the session
@@ -46,3 +95,96 @@ class BulkDelete(resource.Resource):
         resp = session.delete(cls.base_path, service=cls.service,
                               data=body).body
         return cls.existing(**resp)
+
+    @classmethod
+    def delete_with_backoff(cls, session, body, retries=5, delay=1):
+        """Issue a delete call, retrying while the server throttles us
+
+        When the server responds with one of :data:`THROTTLE_CODES`, either
+        as the HTTP status or as the bulk delete's response status, the
+        request is sent again after an exponentially growing delay.
+
+        :param str body: The body of the bulk delete request.
+        :param int retries: The most times to resend the request.
+        :param delay: Seconds to wait before the first retry.
+
+        :rtype:`~rackspace.object_store.v1.bulk_delete.BulkDelete`
+        """
+        def send():
+            result = cls.delete(session, body)
+            code = (result.response_code or "").split(" ", 1)[0]
+            if code.isdigit() and int(code) in THROTTLE_CODES:
+                raise exceptions.HttpException(result.response_code,
+                                               http_status=int(code))
+            return result
+
+        def throttled(e):
+            return (isinstance(e, exceptions.HttpException) and
+                    e.http_status in THROTTLE_CODES)
+
+        return utils.retry(send, attempts=retries + 1, delay=delay,
+                           retry_on=throttled)
+
+    @classmethod
+    def delete_batches(cls, session, bodies, workers=1, retries=5):
+        """Issue a delete call for each of several request bodies
+
+        :param bodies: An iterable of bulk delete request bodies. It is
+            consumed lazily, no further ahead than the workers need.
+        :param int workers: The number of requests to have in flight at once.
+            When greater than one, requests are sent from a pool of threads.
+        :param int retries: The most times to resend a throttled request.
+
+        :returns: A generator of
+            :class:`~rackspace.object_store.v1.bulk_delete.BulkDelete`,
+            in the same order as ``bodies``.
+        """
+        def send(body):
+            return cls.delete_with_backoff(session, body, retries=retries)
+
+        if workers > 1:
+            return (result for body, result
+                    in utils.imap(send, bodies, workers=workers))
+        return (send(body) for body in bodies)
+
+    @classmethod
+    def merge(cls, results):
+        """Combine the results of several bulk delete requests
+
+        The counts and errors of every result are added together, while
+        the individual results are kept on :attr:`batches`. The response
+        code is that of the first request which did not succeed, or of the
+        last request if they all succeeded.
+
+        :param results: An iterable of
+            :class:`~rackspace.object_store.v1.bulk_delete.BulkDelete`.
+            It is consumed lazily, so it can be a generator which sends
+            each request as it is iterated.
+
+        :rtype:`~rackspace.object_store.v1.bulk_delete.BulkDelete`
+        """
+        deleted = 0
+        not_found = 0
+        errors = []
+        bodies = []
+        response_code = "200 OK"
+        failed = False
+        batches = []
+        for result in results:
+            batches.append(result)
+            deleted += result.deleted or 0
+            not_found += result.not_found or 0
+            errors.extend(result.errors or [])
+            if result.response_body:
+                bodies.append(result.response_body)
+            if not failed and result.response_code is not None:
+                response_code = result.response_code
+                failed = not response_code.startswith("2")
+
+        merged = cls.existing(**{"Number Deleted": deleted,
+                                 "Number Not Found": not_found,
+                                 "Errors": errors,
+                                 "Response Status": response_code,
+                                 "Response Body": "\n".join(bodies)})
+        merged.batches = batches
+        return merged
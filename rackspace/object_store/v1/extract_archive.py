@@ -0,0 +1,177 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import sys
+import tarfile
+import threading
+
+from openstack.object_store import object_store_service
+from openstack import resource
+import six
+from six.moves import queue
+
+#: The archive formats the extract archive API accepts.
+FORMATS = ("tar", "tar.gz", "tar.bz2")
+#: The size of the chunks an archive is streamed to the server in.
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_file(fileobj, chunk_size=CHUNK_SIZE):
+    """Read a file object in chunks
+
+    :param fileobj: A file object opened in binary mode.
+    :param int chunk_size: The most bytes to read at a time.
+
+    :returns: A generator of ``bytes``
+    """
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+class _QueueWriter(object):
+    """A write-only file object which hands its data to a queue"""
+
+    def __init__(self, chunks, stop, chunk_size):
+        self.chunks = chunks
+        self.stop = stop
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+
+    def _put(self, item):
+        while not self.stop.is_set():
+            try:
+                return self.chunks.put(item, timeout=0.1)
+            except queue.Full:
+                pass
+        raise IOError("The archive is no longer being read")
+
+    def write(self, data):
+        self.buffer.extend(data)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self._put(bytes(self.buffer))
+            self.buffer = bytearray()
+
+    def close(self, exc_info=None):
+        self.flush()
+        self._put(exc_info)
+
+
+def iter_tar(path, archive_format="tar", chunk_size=CHUNK_SIZE):
+    """Archive a directory, yielding the archive as it is built
+
+    The archive is written by a background thread into a small bounded
+    queue, so neither the archive nor any file in it is ever held in
+    memory or written to disk as a whole. Every regular file below
+    ``path`` is included, named by its path relative to ``path``.
+    Symbolic links are followed.
+
+    :param str path: The directory to archive.
+    :param str archive_format: One of :data:`FORMATS`.
+    :param int chunk_size: The size of the chunks to yield.
+
+    :returns: A generator of ``bytes``
+    """
+    if archive_format not in FORMATS:
+        raise ValueError("archive_format must be one of %s" % (FORMATS,))
+
+    return _iter_tar(path, "w|" + archive_format[len("tar."):], chunk_size)
+
+
+def _iter_tar(path, mode, chunk_size):
+    chunks = queue.Queue(maxsize=8)
+    stop = threading.Event()
+    writer = _QueueWriter(chunks, stop, chunk_size)
+
+    def produce():
+        exc_info = None
+        try:
+            tar = tarfile.open(fileobj=writer, mode=mode, dereference=True)
+            with tar:
+                for root, dirs, files in os.walk(path):
+                    dirs.sort()
+                    for name in sorted(files):
+                        full_path = os.path.join(root, name)
+                        if not os.path.isfile(full_path):
+                            continue
+                        arcname = os.path.relpath(full_path, path)
+                        arcname = arcname.replace(os.sep, "/")
+                        tar.add(full_path, arcname=arcname, recursive=False)
+        except Exception:
+            exc_info = sys.exc_info()
+        try:
+            writer.close(exc_info)
+        except IOError:
+            pass
+
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                return
+            if isinstance(chunk, tuple):
+                six.reraise(*chunk)
+            yield chunk
+    finally:
+        stop.set()
+
+
+class ExtractArchive(resource.Resource):
+    base_path = "/%(container)s"
+    service = object_store_service.ObjectStoreService()
+
+    allow_create = True
+
+    #: The number of files created
+    created = resource.prop("Number Files Created")
+    #: The response code returned by the extract archive operation
+    response_code = resource.prop("Response Status")
+    #: A list of errors that occurred, each a list of the path of the file
+    #: in the archive and the status it failed with
+    errors = resource.prop("Errors")
+    #: Any additional response body
+    response_body = resource.prop("Response Body")
+
+    @classmethod
+    def upload(cls, session, container, body, archive_format="tar"):
+        """Upload an archive to be extracted into a container
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param str container: The name of the container to extract into.
+            Files are created with their path in the archive as their name.
+        :param body: The archive, as ``bytes``, a file object or an iterable
+            of ``bytes``. An iterable is sent with chunked transfer encoding.
+        :param str archive_format: One of :data:`FORMATS`.
+
+        :rtype:`~rackspace.object_store.v1.extract_archive.ExtractArchive`
+        """
+        if archive_format not in FORMATS:
+            raise ValueError("archive_format must be one of %s" % (FORMATS,))
+
+        url = cls._get_url({"container": container})
+        headers = {"Accept": "application/json"}
+        resp = session.put(url, endpoint_filter=cls.service, data=body,
+                           headers=headers,
+                           params={"extract-archive": archive_format})
+        return cls.existing(**resp.json())
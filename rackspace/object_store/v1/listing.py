@@ -0,0 +1,165 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import collections
+
+from openstack.object_store.v1 import obj as _obj
+
+#: The number of entries requested per page of a listing.
+PAGE_SIZE = 1000
+
+
+def list_page(session, container, params):
+    """Fetch one page of a container listing
+
+    :returns: The raw entries of the page, a ``list`` of ``dict``. Objects
+              have a ``name``, and pseudo-directories found when listing
+              with a delimiter have a ``subdir``.
+    """
+    url = _obj.Object._get_url({"container": container})
+    resp = session.get(url, endpoint_filter=_obj.Object.service,
+                       headers={"Accept": "application/json"},
+                       params=params)
+    return resp.json()
+
+
+class _Listing(object):
+    """One listing, which follows markers from page to page
+
+    With a pool, the first page is requested as soon as the listing is
+    made, and each next page as soon as the marker for it is known, so it
+    is fetched while the page before it is consumed.
+    """
+
+    def __init__(self, session, container, params, page_size, pool):
+        self._session = session
+        self._container = container
+        self._params = dict(params or {}, limit=page_size)
+        self._page_size = page_size
+        self._pool = pool
+        self._next = None
+        self._request()
+
+    def _request(self):
+        if self._pool is not None:
+            self._next = self._pool.submit(list_page, self._session,
+                                           self._container,
+                                           dict(self._params))
+
+    def __iter__(self):
+        while True:
+            if self._pool is None:
+                page = list_page(self._session, self._container,
+                                 dict(self._params))
+            else:
+                page = self._next.result()
+            more = len(page) >= self._page_size
+            if more:
+                last = page[-1]
+                self._params["marker"] = last.get("name", last.get("subdir"))
+                self._request()
+
+            for entry in page:
+                yield entry
+            if not more:
+                return
+
+
+def iter_listing(session, container, params=None, page_size=PAGE_SIZE,
+                 pool=None):
+    """Yield every entry of a container listing, following markers
+
+    :param session: The session to use for making the requests.
+    :type session: :class:`~openstack.session.Session`
+    :param str container: The name of the container to list.
+    :param dict params: Query parameters to send, such as ``prefix``,
+        ``delimiter`` or ``end_marker``.
+    :param int page_size: The number of entries to request per page.
+    :param pool: When given, each page is fetched in the pool while the
+        one before it is being consumed.
+    :type pool: :class:`~rackspace.utils.Pool`
+
+    :returns: An iterator of raw listing entries
+    """
+    return iter(_Listing(session, container, params, page_size, pool))
+
+
+def disjoint(prefixes):
+    """Drop the prefixes another of them already covers, and sort the rest
+
+    The names starting with each of the prefixes returned sort after those
+    starting with the one before it, so their listings can simply be
+    chained.
+    """
+    result = []
+    for prefix in sorted(prefixes):
+        if not result or not prefix.startswith(result[-1]):
+            result.append(prefix)
+    return result
+
+
+def walk(session, container, prefix="", delimiter="/", prefixes=None,
+         page_size=PAGE_SIZE, pool=None, window=4):
+    """Yield the objects below a prefix, listing several partitions at once
+
+    The prefix is listed with the delimiter, and each pseudo-directory it
+    finds is listed in full in its place, so objects come out in lexical
+    order. Up to ``window`` pseudo-directories ahead of the one being
+    consumed are already being listed, so with a pool many small
+    directories are listed concurrently. Each open listing holds at most
+    the page being consumed and the next one, and the pseudo-directories
+    are only read as far ahead as the window reaches.
+
+    :param list prefixes: List the objects starting with each of these,
+        instead of the pseudo-directories below ``prefix``.
+    :param int window: The most partitions to have open at once.
+
+    :returns: A generator of raw listing entries for objects, in order
+    """
+    if prefixes is None:
+        top = iter_listing(session, container,
+                           {"prefix": prefix, "delimiter": delimiter},
+                           page_size, pool)
+    else:
+        top = iter([{"subdir": value} for value in disjoint(prefixes)])
+
+    ahead = collections.deque()
+    state = {"open": 0}
+
+    def fill():
+        # Objects directly below the prefix are queued between the
+        # partitions, but never more than a page of them.
+        while state["open"] < window and len(ahead) < page_size:
+            entry = next(top, None)
+            if entry is None:
+                return
+            if "subdir" in entry:
+                ahead.append(_Listing(session, container,
+                                      {"prefix": entry["subdir"]},
+                                      page_size, pool))
+                state["open"] += 1
+            else:
+                ahead.append(entry)
+
+    while True:
+        fill()
+        if not ahead:
+            return
+        item = ahead.popleft()
+        if not isinstance(item, _Listing):
+            yield item
+            continue
+
+        state["open"] -= 1
+        fill()
+        for entry in item:
+            yield entry
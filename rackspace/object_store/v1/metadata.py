@@ -0,0 +1,122 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from openstack.object_store.v1 import obj as _obj
+import six
+
+#: The prefix of custom object metadata headers.
+CUSTOM_PREFIX = "x-object-meta-"
+#: The system headers an object POST can set. A POST replaces every one of
+#: them along with the custom metadata, so they must all be sent again to
+#: be kept.
+POST_HEADERS = ("content-type", "content-encoding", "content-disposition",
+                "content-language", "cache-control", "expires",
+                "x-delete-at", "x-object-manifest", "x-robots-tag")
+
+
+def normalize(headers):
+    """Lower case the names of headers and make their values strings
+
+    A value of ``None`` is kept, and means the header is to be removed.
+    """
+    def text(value):
+        if value is None or isinstance(value, six.string_types):
+            return value
+        return str(value)
+
+    return dict((name.lower(), text(value))
+                for name, value in headers.items())
+
+
+def needs_update(current, patch):
+    """Whether applying a patch would change an object's headers
+
+    :param dict current: The normalized headers of the object.
+    :param dict patch: The normalized headers to apply.
+    """
+    return any(current.get(name) != value
+               for name, value in patch.items())
+
+
+def merge(current, patch):
+    """Build the headers to POST to apply a patch to an object
+
+    :param dict current: The normalized headers of the object.
+    :param dict patch: The normalized headers to apply.
+
+    :returns: The headers, a ``dict``
+    """
+    headers = dict((name, value) for name, value in current.items()
+                   if name.startswith(CUSTOM_PREFIX) or name in POST_HEADERS)
+    for name, value in patch.items():
+        if value is None:
+            headers.pop(name, None)
+        else:
+            headers[name] = value
+    return headers
+
+
+def update_object(session, container, name, patch):
+    """Apply a header patch to one object unless it already has it
+
+    :param session: The session to use for making the requests.
+    :type session: :class:`~openstack.session.Session`
+    :param str container: The name of the container the object is in.
+    :param str name: The name of the object.
+    :param dict patch: The normalized headers to apply.
+
+    :returns: ``True`` if the object was updated, ``False`` if it already
+              matched the patch
+    """
+    url = _obj.Object._get_url({"container": container}, name)
+    resp = session.head(url, endpoint_filter=_obj.Object.service,
+                        headers={"Accept": ""})
+    current = normalize(resp.headers)
+    if not needs_update(current, patch):
+        return False
+
+    session.post(url, endpoint_filter=_obj.Object.service,
+                 headers=merge(current, patch))
+    return True
+
+
+class MetadataUpdate(object):
+    """A summary of a bulk metadata update
+
+    :ivar int updated: How many objects were updated.
+    :ivar int skipped: How many objects already matched the patch.
+    :ivar list failed: A ``(name, exception)`` tuple for each object which
+        could not be updated.
+    """
+
+    def __init__(self):
+        self.updated = 0
+        self.skipped = 0
+        self.failed = []
+
+    def __repr__(self):
+        return "%s(updated=%d, skipped=%d, failed=%d)" % (
+            self.__class__.__name__, self.updated, self.skipped,
+            len(self.failed))
+
+    def add(self, name, result):
+        """Count the result of updating one object
+
+        :param result: What :func:`update_object` returned, or the
+            exception it raised.
+        """
+        if isinstance(result, Exception):
+            self.failed.append((name, result))
+        elif result:
+            self.updated += 1
+        else:
+            self.skipped += 1
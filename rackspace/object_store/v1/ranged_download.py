@@ -0,0 +1,153 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import threading
+
+from openstack import exceptions
+from openstack.object_store.v1 import obj as _obj
+from rackspace import utils
+
+#: The size of the ranges an object is downloaded in.
+CHUNK_SIZE = 16 * 1024 * 1024
+#: The most bytes read from a response at a time.
+READ_SIZE = 64 * 1024
+#: Appended to the path of a download to name its checkpoint.
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+_seek_lock = threading.Lock()
+
+
+def write_at(fd, data, offset):
+    """Write data to a file descriptor at an offset
+
+    ``os.pwrite`` is used where it exists so that many threads can write to
+    one descriptor at once. Elsewhere writes are serialized around a seek.
+    """
+    if hasattr(os, "pwrite"):
+        while data:
+            written = os.pwrite(fd, data, offset)
+            data = data[written:]
+            offset += written
+        return
+
+    with _seek_lock:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while data:
+            data = data[os.write(fd, data):]
+
+
+def fetch_range(session, container, name, fd, offset, length, etag=None):
+    """Download one range of an object into a file
+
+    The response is streamed, and each piece of it is written straight to
+    its place in the file.
+
+    :param session: The session to use for making this request.
+    :type session: :class:`~openstack.session.Session`
+    :param str container: The name of the container the object is in.
+    :param str name: The name of the object.
+    :param int fd: A file descriptor open for writing.
+    :param int offset: Where the range starts, both in the object and in
+        the file.
+    :param int length: The size of the range in bytes.
+    :param str etag: When given, the object must still have this ETag, so
+        a file is never stitched together from two versions of an object.
+
+    :raises: :class:`~openstack.exceptions.SDKException` if the server does
+             not return exactly the range that was asked for.
+    """
+    url = _obj.Object._get_url({"container": container}, name)
+    headers = {"Range": "bytes=%d-%d" % (offset, offset + length - 1)}
+    if etag is not None:
+        headers["If-Match"] = etag
+
+    resp = session.get(url, endpoint_filter=_obj.Object.service,
+                       headers=headers, stream=True)
+    try:
+        if resp.status_code != 206:
+            raise exceptions.SDKException(
+                "Expected a partial response for %s, got status %s" %
+                (headers["Range"], resp.status_code))
+
+        received = 0
+        for data in resp.iter_content(READ_SIZE):
+            if received + len(data) > length:
+                raise exceptions.SDKException(
+                    "Expected %d bytes for %s, got more" %
+                    (length, headers["Range"]))
+            write_at(fd, data, offset + received)
+            received += len(data)
+
+        if received != length:
+            raise exceptions.SDKException(
+                "Expected %d bytes for %s, got %d" %
+                (length, headers["Range"], received))
+    finally:
+        resp.close()
+
+
+class Checkpoint(object):
+    """The progress of a download, kept in a file next to it
+
+    :param str path: Where to store the checkpoint.
+    :param str etag: The ETag of the object being downloaded.
+    :param int size: The size of the object.
+    :param int chunk_size: The size of the ranges it is downloaded in.
+    :param done: The offsets of the ranges which have been written.
+    """
+
+    def __init__(self, path, etag, size, chunk_size, done=()):
+        self.path = path
+        self.etag = etag
+        self.size = size
+        self.chunk_size = chunk_size
+        self.done = set(done)
+
+    @classmethod
+    def load(cls, path):
+        """Read a checkpoint
+
+        :returns: A :class:`Checkpoint`, or ``None`` if there is no usable
+                  checkpoint at ``path``.
+        """
+        state = utils.load_json(path)
+        try:
+            return cls(path, state["etag"], state["size"],
+                       state["chunk_size"], state["done"])
+        except (KeyError, TypeError):
+            return None
+
+    def matches(self, etag, size, chunk_size):
+        return (self.etag, self.size, self.chunk_size) == (etag, size,
+                                                           chunk_size)
+
+    def remaining(self):
+        """The offsets of the ranges still to be downloaded"""
+        return [offset for offset in range(0, self.size, self.chunk_size)
+                if offset not in self.done]
+
+    def save(self):
+        """Write the checkpoint
+
+        It is written to a temporary file which is then renamed over the
+        old one, so an interruption never leaves a truncated checkpoint.
+        """
+        utils.save_json(self.path, {
+            "etag": self.etag, "size": self.size,
+            "chunk_size": self.chunk_size, "done": sorted(self.done)})
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
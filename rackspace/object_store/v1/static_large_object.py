@@ -0,0 +1,176 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import io
+import json
+
+from openstack import exceptions
+from openstack.object_store import object_store_service
+from openstack import resource
+from openstack import utils
+
+#: The largest segment the API accepts.
+MAX_SEGMENT_SIZE = 5 * 1024 * 1024 * 1024
+#: The most segments a manifest can list.
+MAX_SEGMENTS = 1000
+#: The size segments are cut to unless a file needs larger ones.
+SEGMENT_SIZE = 100 * 1024 * 1024
+#: The size of the buffer a segment is read into while it is uploaded.
+READ_SIZE = 64 * 1024
+
+
+def segment_size_for(size, segment_size=SEGMENT_SIZE):
+    """Pick a segment size for a file
+
+    :param int size: The size of the file in bytes.
+    :param int segment_size: The preferred segment size. It is grown when
+        the file would otherwise need more than :data:`MAX_SEGMENTS`.
+
+    :returns: ``int``
+    :raises: ``ValueError`` if the file is too large to be stored as a
+             static large object.
+    """
+    segment_size = max(segment_size, -(-size // MAX_SEGMENTS))
+    if segment_size > MAX_SEGMENT_SIZE:
+        raise ValueError("A file of %d bytes is too large to be uploaded "
+                         "as a static large object" % size)
+    return segment_size
+
+
+def segment_prefix(name, mtime, size, segment_size):
+    """The prefix of the names of the segments of a file
+
+    Segments are named after the file's size and modification time so
+    that uploading a changed file never overwrites the segments of a
+    manifest which still refers to them.
+    """
+    return "%s/slo/%f/%d/%d" % (name, mtime, size, segment_size)
+
+
+def segment_owner(segment):
+    """The name of the object a segment was uploaded for
+
+    :param str segment: The name of a segment, a prefix from
+        :func:`segment_prefix` followed by its index.
+
+    :returns: ``str``, or ``None`` if it is not named like a segment.
+    """
+    parts = segment.rsplit("/", 4)
+    if len(parts) == 5 and parts[0].endswith("/slo"):
+        return parts[0][:-len("/slo")]
+    return None
+
+
+class SegmentReader(object):
+    """A read-only file object over one segment of a file
+
+    Data is read into a single reusable buffer, and the MD5 checksum of the
+    segment is computed as it is read so the upload can be verified without
+    reading the segment twice.
+    """
+
+    def __init__(self, path, offset, length, read_size=READ_SIZE):
+        self.length = length
+        self.md5 = hashlib.md5()
+        self._remaining = length
+        self._buffer = bytearray(read_size)
+        self._file = io.open(path, "rb")
+        self._file.seek(offset)
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self._buffer)
+        size = min(size, self._remaining, len(self._buffer))
+        if not size:
+            return b""
+
+        view = memoryview(self._buffer)[:size]
+        count = self._file.readinto(view)
+        if not count:
+            raise IOError("File ended %d bytes before the end of the segment"
+                          % self._remaining)
+        data = view[:count].tobytes()
+        self.md5.update(data)
+        self._remaining -= count
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+class StaticLargeObject(resource.Resource):
+    base_path = "/%(container)s"
+    service = object_store_service.ObjectStoreService()
+    id_attribute = "name"
+
+    allow_create = True
+
+    #: The name of the container the object is in.
+    container = resource.prop("container")
+    #: The name of the object.
+    name = resource.prop("name")
+    #: The segments of the object, in order. Each is a dict of the ``path``
+    #: of the segment as /container/object, its ``etag`` and ``size_bytes``.
+    #: *Type: list*
+    segments = resource.prop("segments", type=list)
+
+    @classmethod
+    def upload_segment(cls, session, path, container, name, offset, length):
+        """Upload one segment of a file
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+        :param str path: The path of the file to read the segment from.
+        :param str container: The name of the container to store it in.
+        :param str name: The name to store the segment as.
+        :param int offset: Where the segment starts in the file.
+        :param int length: The size of the segment in bytes.
+
+        :returns: The manifest entry for the segment, a ``dict``
+        :raises: :class:`~openstack.exceptions.SDKException` if the ETag the
+                 server computed does not match the data that was sent.
+        """
+        url = utils.urljoin(cls._get_url({"container": container}), name)
+        reader = SegmentReader(path, offset, length)
+        try:
+            resp = session.put(url, endpoint_filter=cls.service, data=reader,
+                               headers={"Accept": ""})
+        finally:
+            reader.close()
+
+        etag = reader.md5.hexdigest()
+        if resp.headers.get("etag", "").strip('"').lower() != etag:
+            raise exceptions.SDKException(
+                "Segment %s was corrupted during upload" % name)
+
+        return {"path": "/%s/%s" % (container, name), "etag": etag,
+                "size_bytes": length}
+
+    def create(self, session):
+        """Create the object by uploading its manifest
+
+        :param session: The session to use for making this request.
+        :type session: :class:`~openstack.session.Session`
+
+        :return: This :class:`StaticLargeObject` instance.
+        """
+        url = self._get_url(self, self.id)
+        resp = session.put(url, endpoint_filter=self.service,
+                           data=json.dumps(self.segments),
+                           params={"multipart-manifest": "put"},
+                           headers={"Accept": ""})
+        self.set_headers(resp.headers)
+        return self
@@ -0,0 +1,109 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import os
+
+from rackspace import utils
+
+#: The name of the index kept in a synced directory unless told otherwise.
+INDEX_NAME = ".sync-index.json"
+#: The most bytes read from a file at a time while hashing it.
+READ_SIZE = 1024 * 1024
+
+
+def file_md5(path, read_size=READ_SIZE):
+    """Compute the MD5 checksum of a file as a hex string"""
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(read_size), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+class Index(object):
+    """What is known about the files of a directory, kept between syncs
+
+    Each entry is keyed by the object name of a file, its path relative to
+    the directory with ``/`` separators, and records the ``size``, ``mtime``
+    and ``md5`` of the file, along with the ``etag`` the server gave it
+    when it was last uploaded.
+
+    :param str path: Where the index is stored.
+    :param dict entries: The entries of the index.
+    """
+
+    def __init__(self, path, entries=None):
+        self.path = path
+        self.entries = {} if entries is None else entries
+
+    @classmethod
+    def load(cls, path):
+        """Read an index, starting an empty one if it can't be read"""
+        entries = utils.load_json(path)
+        return cls(path, entries if isinstance(entries, dict) else None)
+
+    def save(self):
+        """Write the index, replacing the old one in a single step"""
+        utils.save_json(self.path, self.entries)
+
+    def scan(self, root):
+        """Bring the index up to date with a directory
+
+        A file is only hashed when its size or modification time differ
+        from what the index recorded, and files which no longer exist are
+        dropped. The index itself is never included.
+
+        :param str root: The directory to scan.
+
+        :returns: The entries of the index, a ``dict``
+        """
+        index = os.path.abspath(self.path)
+        entries = {}
+        for parent, dirs, files in os.walk(root):
+            dirs.sort()
+            for filename in sorted(files):
+                path = os.path.join(parent, filename)
+                # The index and the temporary files it is saved through.
+                full = os.path.abspath(path)
+                if full == index or (full.startswith(index + ".") and
+                                     full.endswith(".tmp")):
+                    continue
+                st = os.stat(path)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+
+                entry = self.entries.get(name)
+                if (entry is None or entry.get("size") != st.st_size or
+                        entry.get("mtime") != st.st_mtime):
+                    entry = {"size": st.st_size, "mtime": st.st_mtime,
+                             "md5": file_md5(path), "etag": None}
+                entries[name] = entry
+
+        self.entries = entries
+        return entries
+
+
+class SyncResult(object):
+    """What a sync did
+
+    :ivar list uploaded: The names of the objects which were uploaded.
+    :ivar int skipped: How many files were already up to date.
+    :ivar deleted: The result of deleting the objects which no longer
+        exist locally, a
+        :class:`~rackspace.object_store.v1.bulk_delete.BulkDelete`, or
+        ``None`` if nothing was deleted.
+    """
+
+    def __init__(self):
+        self.uploaded = []
+        self.skipped = 0
+        self.deleted = None
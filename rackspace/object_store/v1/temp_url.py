@@ -0,0 +1,79 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import hmac
+
+import six
+from six.moves.urllib import parse
+
+#: The methods a temporary URL can be signed for.
+METHODS = ("GET", "HEAD", "PUT", "POST", "DELETE")
+
+
+def _bytes(value):
+    if isinstance(value, six.text_type):
+        return value.encode("utf-8")
+    return value
+
+
+class TempURLSigner(object):
+    """Sign temporary URLs with one account key
+
+    The key is run through HMAC once, when the signer is created, and each
+    signature starts from a copy of that state rather than from the key.
+
+    :param str key: The temporary URL key of the account.
+    :param str endpoint: The object store endpoint of the account, such as
+        ``https://storage101.dfw1.clouddrive.com/v1/MossoCloudFS_abc``.
+    """
+
+    def __init__(self, key, endpoint):
+        endpoint = endpoint.rstrip("/")
+        self.path_prefix = parse.urlparse(endpoint).path
+        self.base_url = endpoint[:len(endpoint) - len(self.path_prefix)]
+        self._hmac = hmac.new(_bytes(key), digestmod=hashlib.sha1)
+
+    def signature(self, method, path, expires):
+        """Compute the signature for one request
+
+        :param str method: One of :data:`METHODS`.
+        :param str path: The full path of the object, including the
+            version and account, such as ``/v1/AUTH_abc/container/object``.
+        :param int expires: When the URL stops working, in seconds since
+            the epoch.
+
+        :returns: The signature as a hex ``str``
+        """
+        if method not in METHODS:
+            raise ValueError("method must be one of %s" % (METHODS,))
+
+        digest = self._hmac.copy()
+        digest.update(_bytes("%s\n%d\n%s" % (method, expires, path)))
+        return digest.hexdigest()
+
+    def sign(self, requests):
+        """Sign many temporary URLs in one call
+
+        :param requests: An iterable of ``(method, path, expires)`` tuples,
+            with ``path`` the object as ``container/object``.
+
+        :returns: The signed URLs, a ``list`` of ``str`` in the order of
+                  ``requests``
+        """
+        urls = []
+        for method, path, expires in requests:
+            path = "%s/%s" % (self.path_prefix, path.lstrip("/"))
+            urls.append("%s%s?temp_url_sig=%s&temp_url_expires=%d" % (
+                self.base_url, parse.quote(_bytes(path)),
+                self.signature(method, path, expires), expires))
+        return urls
@@ -0,0 +1,143 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import hashlib
+import itertools
+import mmap
+import multiprocessing
+import os
+
+#: The most bytes of a mapped file hashed at a time.
+READ_SIZE = 8 * 1024 * 1024
+#: The number of files handed to the worker processes at a time.
+BATCH_SIZE = 1000
+
+
+def mmap_md5(path, read_size=READ_SIZE):
+    """Compute the MD5 checksum of a file through a memory map
+
+    :returns: The checksum as a hex ``str``
+    """
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return md5.hexdigest()
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for offset in range(0, size, read_size):
+                md5.update(mapped[offset:offset + read_size])
+        finally:
+            mapped.close()
+    return md5.hexdigest()
+
+
+def _hash(task):
+    name, path, etag = task
+    try:
+        return name, etag, mmap_md5(path), None
+    except (IOError, OSError, ValueError) as e:
+        return name, etag, None, str(e)
+
+
+class VerifyReport(object):
+    """The result of comparing objects with local files
+
+    :ivar int matched: How many objects matched their file.
+    :ivar list mismatched: A ``(name, local_md5, etag)`` tuple for each
+        object whose ETag differs from the checksum of its file.
+    :ivar list missing: The names of objects which have no local file.
+    :ivar list unverifiable: The names of static large objects, whose ETag
+        is not the checksum of their content.
+    :ivar list errors: A ``(name, message)`` tuple for each file which
+        could not be read.
+    """
+
+    def __init__(self):
+        self.matched = 0
+        self.mismatched = []
+        self.missing = []
+        self.unverifiable = []
+        self.errors = []
+
+    def __repr__(self):
+        return ("%s(matched=%d, mismatched=%d, missing=%d, unverifiable=%d, "
+                "errors=%d)" % (self.__class__.__name__, self.matched,
+                                len(self.mismatched), len(self.missing),
+                                len(self.unverifiable), len(self.errors)))
+
+    @property
+    def ok(self):
+        """``True`` when every verifiable object matched its file"""
+        return not (self.mismatched or self.missing or self.errors)
+
+    def add(self, name, etag, md5, error):
+        if error is not None:
+            self.errors.append((name, error))
+        elif md5 == etag:
+            self.matched += 1
+        else:
+            self.mismatched.append((name, md5, etag))
+
+
+def verify(objects, local_root, processes=None, batch_size=BATCH_SIZE):
+    """Compare objects with the files they were uploaded from
+
+    Files are hashed by a pool of worker processes, a batch at a time, so
+    ``objects`` is consumed as the hashing goes and is never held in
+    memory as a whole.
+
+    :param objects: An iterable of ``(name, etag, is_large_object)``
+        tuples.
+    :param str local_root: The directory the files are in, each named by
+        the path of its object relative to it.
+    :param int processes: The number of processes to hash files in.
+        Defaults to the number of CPUs. With ``1`` files are hashed in this
+        process.
+    :param int batch_size: The number of files to hand to the pool at
+        once.
+
+    :rtype: :class:`VerifyReport`
+    """
+    report = VerifyReport()
+
+    def tasks():
+        for name, etag, is_large_object in objects:
+            if is_large_object:
+                report.unverifiable.append(name)
+                continue
+            path = os.path.join(local_root, *name.split("/"))
+            if not os.path.isfile(path):
+                report.missing.append(name)
+                continue
+            yield name, path, etag
+
+    pool = None if processes == 1 else multiprocessing.Pool(processes)
+    try:
+        pending = tasks()
+        while True:
+            batch = list(itertools.islice(pending, batch_size))
+            if not batch:
+                break
+            if pool is None:
+                results = (_hash(task) for task in batch)
+            else:
+                results = pool.imap_unordered(_hash, batch, chunksize=16)
+            for result in results:
+                report.add(*result)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    return report
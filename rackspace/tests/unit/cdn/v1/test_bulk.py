@@ -0,0 +1,135 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import mock
+from openstack import exceptions
+import testtools
+
+from rackspace.cdn.v1 import bulk
+from rackspace.cdn.v1 import service
+
+
+class TestRun(testtools.TestCase):
+
+    @mock.patch("time.sleep")
+    def test(self, mock_sleep):
+        sess = mock.Mock()
+        throttled = []
+
+        def slow(session):
+            if not throttled:
+                throttled.append(session)
+                raise exceptions.HttpException("slow", http_status=429)
+
+        def broken(session):
+            raise exceptions.HttpException("nope", http_status=400)
+
+        result = bulk.run(sess, [("a", "/1", slow), ("b", "/2", broken),
+                                 ("c", None, lambda session: None)],
+                          rate=1000)
+
+        self.assertEqual(2, result.sent)
+        self.assertEqual([("b", "/2")],
+                         [failure[:2] for failure in result.failed])
+        self.assertEqual([sess], throttled)
+        self.assertEqual("BatchResult(sent=2, failed=1)", repr(result))
+
+
+class TestPurgeBatcher(testtools.TestCase):
+
+    def setUp(self):
+        super(TestPurgeBatcher, self).setUp()
+        self.sess = mock.Mock()
+        self.purged = []
+
+        def purge(sot, session, url=None):
+            self.assertIs(self.sess, session)
+            self.purged.append((sot.id, url))
+        patcher = mock.patch.object(service.Service, "purge", autospec=True,
+                                    side_effect=purge)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dedup(self):
+        with bulk.PurgeBatcher(self.sess, window=60, rate=1000) as batcher:
+            batcher.add("a", ["/x", "y", "/x"])
+            batcher.add(service.Service.existing(id="a"), ["/y", "/z"])
+            batcher.add("b", ["/x"])
+            self.assertEqual([], self.purged)
+
+        self.assertEqual([("a", "/x"), ("a", "/y"), ("a", "/z"),
+                          ("b", "/x")], sorted(self.purged))
+
+    def test_collapse(self):
+        batcher = bulk.PurgeBatcher(self.sess, window=60, max_paths=2,
+                                    rate=1000)
+        batcher.add("a", ["/x", "/y", "/z"])
+        batcher.add("a", ["/w"])
+        batcher.add("b", ["/x"])
+        batcher.add("b")
+        batcher.add("b", ["/y"])
+
+        result = batcher.flush()
+
+        self.assertEqual(2, result.sent)
+        self.assertEqual([("a", None), ("b", None)], sorted(self.purged))
+
+    def test_no_collapse_by_default(self):
+        with bulk.PurgeBatcher(self.sess, window=60, rate=1000) as batcher:
+            batcher.add("a", ["/%d" % i for i in range(150)])
+
+        self.assertEqual(150, len(self.purged))
+        self.assertNotIn(("a", None), self.purged)
+
+    @mock.patch.object(bulk, "run")
+    def test_nothing_expired(self, mock_run):
+        batcher = bulk.PurgeBatcher(self.sess, window=60)
+
+        for i in range(10):
+            result = batcher.add("a", ["/%d" % i])
+
+        self.assertEqual(0, result.sent)
+        self.assertFalse(mock_run.called)
+
+    @mock.patch("time.time")
+    def test_window(self, mock_time):
+        mock_time.return_value = 100
+        batcher = bulk.PurgeBatcher(self.sess, window=1, rate=1000)
+        batcher.add("a", ["/x"])
+        mock_time.return_value = 100.5
+        batcher.add("b", ["/x"])
+        batcher.add("a", ["/y"])
+        self.assertEqual([], self.purged)
+
+        mock_time.return_value = 101
+        result = batcher.add("b", ["/y"])
+
+        self.assertEqual(2, result.sent)
+        self.assertEqual([("a", "/x"), ("a", "/y")], sorted(self.purged))
+
+        self.assertEqual(2, batcher.flush().sent)
+        self.assertEqual(0, batcher.flush().sent)
+
+
+class TestGroupOperations(testtools.TestCase):
+
+    def test(self):
+        add = {"op": "add", "path": "/domains/-", "value": {}}
+        remove = {"op": "remove", "path": "/origins/0"}
+
+        grouped = bulk.group_operations([
+            ("a", add), ("b", remove), (service.Service.existing(id="a"),
+                                        remove)])
+
+        self.assertEqual([("a", [add, remove]), ("b", [remove])],
+                         list(grouped.items()))
@@ -0,0 +1,77 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import mock
+from openstack.tests.unit import test_proxy_base
+from rackspace.cdn.v1 import _proxy
+from rackspace.cdn.v1 import service
+
+
+class TestCDNProxy(test_proxy_base.TestProxyBase):
+    def setUp(self):
+        super(TestCDNProxy, self).setUp()
+        self.proxy = _proxy.Proxy(self.session)
+
+    def test_services(self):
+        self.verify_list(self.proxy.services, service.Service,
+                         paginated=True)
+
+    def test_service_get(self):
+        self.verify_get(self.proxy.get_service, service.Service)
+
+    def test_service_find(self):
+        self.verify_find(self.proxy.find_service, service.Service)
+
+    def test_service_delete(self):
+        self.verify_delete(self.proxy.delete_service, service.Service, False)
+
+    def test_service_delete_ignore(self):
+        self.verify_delete(self.proxy.delete_service, service.Service, True)
+
+    @mock.patch.object(service.Service, "purge")
+    def test_purge_assets(self, mock_purge):
+        self.proxy.purge_assets("a", "/x")
+
+        mock_purge.assert_called_with(self.session, "/x")
+
+    @mock.patch.object(service.Service, "purge", autospec=True)
+    def test_bulk_purge(self, mock_purge):
+        result = self.proxy.bulk_purge([("a", "/x"), ("b", "/x"),
+                                        ("a", "/x"), ("a", "/y")], rate=1000)
+
+        self.assertEqual(3, result.sent)
+        self.assertEqual(
+            [("a", "/x"), ("a", "/y"), ("b", "/x")],
+            sorted((call[0][0].id, call[1]["url"])
+                   for call in mock_purge.call_args_list))
+
+    def test_purge_batcher(self):
+        batcher = self.proxy.purge_batcher(window=5, max_paths=10)
+
+        self.assertIs(self.session, batcher.session)
+        self.assertEqual(5, batcher.window)
+        self.assertEqual(10, batcher.max_paths)
+
+    @mock.patch.object(service.Service, "publish", autospec=True)
+    def test_bulk_publish(self, mock_publish):
+        add = {"op": "add", "path": "/domains/-", "value": {}}
+        remove = {"op": "remove", "path": "/origins/0"}
+
+        result = self.proxy.bulk_publish([("a", add), ("b", remove),
+                                          ("a", remove)], rate=1000)
+
+        self.assertEqual(2, result.sent)
+        self.assertEqual(
+            [("a", [add, remove]), ("b", [remove])],
+            sorted((call[0][0].id, call[1]["operations"])
+                   for call in mock_publish.call_args_list))
@@ -0,0 +1,90 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import mock
+import testtools
+
+from rackspace.cdn.v1 import service
+
+EXAMPLE = {
+    "id": "96737ae3-cfc1-4c72-be88-5d0e7cc9a3f0",
+    "name": "mywebsite.com",
+    "domains": [{"domain": "www.mywebsite.com", "protocol": "http"}],
+    "origins": [{"origin": "mywebsite.com", "port": 80, "ssl": False}],
+    "caching": [{"name": "default", "ttl": 3600}],
+    "restrictions": [],
+    "flavor_id": "cdn",
+    "status": "deployed",
+    "errors": [],
+    "links": [{"href": "https://global.cdn.api.rackspacecloud.com/v1.0/"
+                       "services/96737ae3-cfc1-4c72-be88-5d0e7cc9a3f0",
+               "rel": "self"}],
+}
+
+
+class TestService(testtools.TestCase):
+
+    def test_basic(self):
+        sot = service.Service()
+        self.assertEqual('/services', sot.base_path)
+        self.assertEqual('services', sot.resources_key)
+        self.assertEqual('rax:cdn', sot.service.service_type)
+        self.assertTrue(sot.allow_list)
+        self.assertTrue(sot.allow_retrieve)
+        self.assertTrue(sot.allow_delete)
+        self.assertFalse(sot.allow_create)
+        self.assertFalse(sot.allow_update)
+
+    def test_make_it(self):
+        sot = service.Service(EXAMPLE)
+        self.assertEqual(EXAMPLE['id'], sot.id)
+        self.assertEqual(EXAMPLE['name'], sot.name)
+        self.assertEqual(EXAMPLE['domains'], sot.domains)
+        self.assertEqual(EXAMPLE['origins'], sot.origins)
+        self.assertEqual(EXAMPLE['caching'], sot.caching)
+        self.assertEqual(EXAMPLE['restrictions'], sot.restrictions)
+        self.assertEqual(EXAMPLE['flavor_id'], sot.flavor_id)
+        self.assertEqual(EXAMPLE['status'], sot.status)
+        self.assertEqual(EXAMPLE['errors'], sot.errors)
+        self.assertEqual(EXAMPLE['links'], sot.links)
+
+    def test_purge(self):
+        sot = service.Service(EXAMPLE)
+        sess = mock.Mock()
+
+        self.assertIsNone(sot.purge(sess, '/images/logo.png'))
+
+        url = 'services/%s/assets' % EXAMPLE['id']
+        sess.delete.assert_called_with(url, endpoint_filter=sot.service,
+                                       params={'url': '/images/logo.png'})
+
+    def test_purge_all(self):
+        sot = service.Service(EXAMPLE)
+        sess = mock.Mock()
+
+        sot.purge(sess)
+
+        sess.delete.assert_called_with(mock.ANY, endpoint_filter=sot.service,
+                                       params={'all': 'true'})
+
+    def test_publish(self):
+        sot = service.Service(EXAMPLE)
+        sess = mock.Mock()
+        operations = [{"op": "add", "path": "/domains/-",
+                       "value": {"domain": "cdn.mywebsite.com"}}]
+
+        self.assertIsNone(sot.publish(sess, operations))
+
+        url = 'services/%s' % EXAMPLE['id']
+        sess.patch.assert_called_with(url, endpoint_filter=sot.service,
+                                      json=operations)
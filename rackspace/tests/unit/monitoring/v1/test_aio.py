@@ -0,0 +1,137 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import sys
+import threading
+
+import mock
+import requests
+from requests import adapters
+import testtools
+
+PY35 = sys.version_info >= (3, 5)
+
+if PY35:
+    import asyncio
+
+    from rackspace.monitoring.v1 import aio
+
+
+class FakeProxy(object):
+
+    def __init__(self):
+        self.session = mock.Mock()
+        self.session.session = requests.Session()
+        self.threads = set()
+
+    def get_entity(self, entity, ignore_missing=False):
+        self.threads.add(threading.current_thread().name)
+        return ("entity", entity, ignore_missing)
+
+    def delete_entity(self, entity):
+        raise ValueError(entity)
+
+    def entities(self, **query):
+        self.threads.add(threading.current_thread().name)
+        for i in range(3):
+            yield (i, query)
+
+
+class KeepAliveAdapter(adapters.HTTPAdapter):
+    pass
+
+
+@testtools.skipUnless(PY35, "aio needs Python 3.5 or later")
+class TestAsyncProxy(testtools.TestCase):
+
+    def setUp(self):
+        super(TestAsyncProxy, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.proxy = FakeProxy()
+        self.sot = aio.AsyncProxy(self.proxy, workers=4, loop=self.loop)
+        self.addCleanup(self.sot.close)
+
+    def run_loop(self, awaitable):
+        return self.loop.run_until_complete(awaitable)
+
+    def test_awaitable(self):
+        result = self.run_loop(self.sot.get_entity("en1",
+                                                   ignore_missing=True))
+
+        self.assertEqual(("entity", "en1", True), result)
+        self.assertNotIn(threading.current_thread().name, self.proxy.threads)
+
+    def test_error(self):
+        self.assertRaises(ValueError, self.run_loop,
+                          self.sot.delete_entity("en1"))
+
+    def test_gather(self):
+        calls = [self.sot.get_entity(i) for i in range(20)]
+
+        result = self.run_loop(asyncio.gather(*calls))
+
+        self.assertEqual([("entity", i, False) for i in range(20)], result)
+
+    def test_iterate(self):
+        iterator = self.sot.entities(label="web")
+        self.assertIsInstance(iterator, aio.AsyncIterator)
+        self.assertIs(iterator, iterator.__aiter__())
+        self.assertEqual(set(), self.proxy.threads)
+
+        result = [self.run_loop(iterator.__anext__()) for _ in range(3)]
+
+        self.assertEqual([(i, {"label": "web"}) for i in range(3)], result)
+        self.assertRaises(StopAsyncIteration, self.run_loop,  # noqa
+                          iterator.__anext__())
+        self.assertNotIn(threading.current_thread().name, self.proxy.threads)
+
+    def test_attribute(self):
+        self.assertIs(self.proxy.session, self.sot.session)
+        self.assertEqual("get_entity", self.sot.get_entity.__name__)
+
+    def test_pool_size(self):
+        proxy = FakeProxy()
+
+        aio.AsyncProxy(proxy, workers=64, loop=self.loop).close()
+
+        for prefix in ("https://", "http://"):
+            adapter = proxy.session.session.get_adapter(prefix)
+            self.assertEqual(64, adapter._pool_maxsize)
+
+    def test_pool_keeps_adapter_class(self):
+        proxy = FakeProxy()
+        proxy.session.session.mount("https://", KeepAliveAdapter(
+            max_retries=3))
+
+        aio.AsyncProxy(proxy, workers=64, loop=self.loop).close()
+
+        adapter = proxy.session.session.get_adapter("https://")
+        self.assertIsInstance(adapter, KeepAliveAdapter)
+        self.assertEqual(64, adapter._pool_maxsize)
+        self.assertEqual(3, adapter.max_retries.total)
+
+    def test_pool_kept_when_large_enough(self):
+        proxy = FakeProxy()
+        adapter = proxy.session.session.get_adapter("https://")
+
+        aio.AsyncProxy(proxy, workers=4, loop=self.loop).close()
+
+        self.assertIs(adapter, proxy.session.session.get_adapter("https://"))
+
+    def test_context(self):
+        result = self.run_loop(self.sot.__aenter__())
+        self.assertIs(self.sot, result)
+
+        self.run_loop(self.sot.__aexit__(None, None, None))
+        self.assertRaises(RuntimeError, self.sot._run, self.sot.close)
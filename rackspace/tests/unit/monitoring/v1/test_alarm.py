@@ -87,3 +87,13 @@ class TestAlarm(testtools.TestCase):
         url = ("entities/%s/alarms/%s/notification_history/%s" % (
                sot.entity_id, sot.id, sot.check_id))
         session.get.assert_called_with(url, endpoint_filter=sot.service)
+
+    def test_evaluate(self):
+        sot = alarm.Alarm.existing(
+            id="alA", criteria="if (metric['size'] >= 200) "
+                               "{ return new AlarmStatus(CRITICAL); }")
+        data = [{"timestamp": 1, "metrics": {"size": 100}},
+                {"timestamp": 2, "metrics": {"size": 300}}]
+
+        self.assertEqual(["OK", "CRITICAL"],
+                         [result["state"] for result in sot.evaluate(data)])
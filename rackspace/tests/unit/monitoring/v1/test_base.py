@@ -0,0 +1,120 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import threading
+
+import mock
+from openstack import exceptions
+import testtools
+
+from rackspace.monitoring import monitoring_service
+from rackspace.monitoring.v1 import _base
+
+
+class Thing(_base.BaseResource):
+    base_path = '/things'
+    resources_key = 'values'
+    service = monitoring_service.MonitoringService()
+
+    allow_list = True
+
+
+class TestBaseResource(testtools.TestCase):
+
+    def setUp(self):
+        super(TestBaseResource, self).setUp()
+        self.pages = {
+            None: {"values": [{"id": "1"}, {"id": "2"}],
+                   "metadata": {"count": 2, "next_marker": "3"}},
+            "3": {"values": [{"id": "3"}, {"id": "4"}],
+                  "metadata": {"count": 2, "next_marker": "5"}},
+            "5": {"values": [{"id": "5", "name": "five"}],
+                  "metadata": {"count": 1, "next_marker": None}},
+        }
+        self.requests = []
+        self.threads = set()
+
+        def get(url, endpoint_filter, headers, params):
+            self.assertEqual("/things", url)
+            self.requests.append(params)
+            self.threads.add(threading.current_thread())
+            resp = mock.Mock()
+            resp.json.return_value = self.pages[params.get("marker")]
+            return resp
+        self.sess = mock.Mock()
+        self.sess.get = mock.Mock(side_effect=get)
+
+    def test_paginated(self):
+        result = list(Thing.list(self.sess, paginated=True,
+                                 params={"limit": 2}))
+
+        self.assertEqual(["1", "2", "3", "4", "5"],
+                         [value.id for value in result])
+        self.assertEqual([{"limit": 2}, {"limit": 2, "marker": "3"},
+                          {"limit": 2, "marker": "5"}], self.requests)
+
+    def test_limit_capped(self):
+        list(Thing.list(self.sess, paginated=True, params={"limit": 5000}))
+        self.assertEqual(_base.MAX_LIMIT, self.requests[0]["limit"])
+
+    def test_limit_default(self):
+        list(Thing.list(self.sess, paginated=True))
+        self.assertEqual(_base.MAX_LIMIT, self.requests[0]["limit"])
+
+    def test_not_paginated(self):
+        result = list(Thing.list(self.sess, params={"label": "x"}))
+
+        self.assertEqual(["1", "2"], [value.id for value in result])
+        self.assertEqual([{"label": "x"}], self.requests)
+
+    def test_prefetch(self):
+        result = Thing.list(self.sess, paginated=True, prefetch=True)
+
+        self.assertEqual("1", next(result).id)
+        self.assertEqual(["1", "2", "3", "4", "5"],
+                         ["1"] + [value.id for value in result])
+        self.assertNotIn(threading.current_thread(), self.threads)
+
+    def test_not_allowed(self):
+        class Unlisted(Thing):
+            allow_list = False
+
+        self.assertRaises(exceptions.MethodNotSupported, list,
+                          Unlisted.list(self.sess))
+
+    def test_find_on_last_page(self):
+        self.assertEqual("5", Thing.find(self.sess, "five").id)
+        self.assertEqual([None, "3", "5"],
+                         [params.get("marker") for params in self.requests])
+
+    def test_find_missing(self):
+        self.assertIsNone(Thing.find(self.sess, "six"))
+        self.assertRaises(exceptions.ResourceNotFound, Thing.find,
+                          self.sess, "six", ignore_missing=False)
+
+    def test_find_duplicate(self):
+        self.pages["3"]["values"][0]["name"] = "five"
+
+        self.assertRaises(exceptions.DuplicateResource, Thing.find,
+                          self.sess, "five")
+
+    def test_find_by_id(self):
+        class Retrievable(Thing):
+            allow_retrieve = True
+
+        found = Thing.existing(id="9")
+        with mock.patch.object(Retrievable, "get_by_id",
+                               return_value=found) as m:
+            self.assertIs(found, Retrievable.find(self.sess, "9"))
+        m.assert_called_once_with(self.sess, "9", path_args=None)
+        self.assertEqual([], self.requests)
@@ -0,0 +1,112 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import mock
+import testtools
+
+from rackspace.monitoring.v1 import alarm
+from rackspace.monitoring.v1 import cache
+from rackspace.monitoring.v1 import check
+from rackspace.monitoring.v1 import entity
+
+
+class TestResourceCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestResourceCache, self).setUp()
+        self.sot = cache.ResourceCache(max_size=4, ttl=10)
+        self.entity = entity.Entity.existing(id="enA", label="web")
+
+    def test_by_id_and_label(self):
+        self.sot.put(entity.Entity, self.entity)
+
+        self.assertIs(self.entity, self.sot.get(entity.Entity, "enA"))
+        self.assertIs(self.entity, self.sot.get(entity.Entity, "web"))
+        self.assertIs(self.entity, self.sot.get(entity.Entity, self.entity))
+        self.assertIsNone(self.sot.get(check.Check, "enA"))
+        self.assertEqual((3, 1), (self.sot.hits, self.sot.misses))
+
+    def test_path_args(self):
+        res = check.Check.existing(id="chA", label="ping")
+        self.sot.put(check.Check, res, {"entity_id": "enA"})
+
+        self.assertIs(res, self.sot.get(check.Check, "ping",
+                                        {"entity_id": self.entity}))
+        self.assertIsNone(self.sot.get(check.Check, "ping",
+                                       {"entity_id": "enB"}))
+
+    @mock.patch("time.time")
+    def test_ttl(self, mock_time):
+        sot = cache.ResourceCache(ttl=10, ttls={alarm.Alarm: 1,
+                                                check.Check: 0})
+        mock_time.return_value = 100
+        sot.put(entity.Entity, self.entity)
+        sot.put(alarm.Alarm, alarm.Alarm.existing(id="alA"))
+        sot.put(check.Check, check.Check.existing(id="chA"))
+        self.assertEqual(3, len(sot))
+
+        mock_time.return_value = 105
+        self.assertIsNotNone(sot.get(entity.Entity, "enA"))
+        self.assertIsNone(sot.get(alarm.Alarm, "alA"))
+        self.assertIsNone(sot.get(check.Check, "chA"))
+        self.assertEqual(2, len(sot))
+
+    def test_lru(self):
+        for i in range(3):
+            self.sot.put(entity.Entity, entity.Entity.existing(id=str(i)))
+        self.sot.get(entity.Entity, "0")
+        self.sot.put(entity.Entity, self.entity)
+
+        self.assertEqual(4, len(self.sot))
+        self.assertEqual(1, self.sot.evictions)
+        self.assertIsNotNone(self.sot.get(entity.Entity, "0"))
+        self.assertIsNone(self.sot.get(entity.Entity, "1"))
+        self.assertIsNotNone(self.sot.get(entity.Entity, "2"))
+
+    def test_invalidate(self):
+        self.sot.put(entity.Entity, self.entity, name_or_id="alias")
+        self.sot.invalidate(entity.Entity, "enA")
+
+        self.assertEqual(0, len(self.sot))
+
+    def test_invalidate_label(self):
+        self.sot.put(entity.Entity, self.entity)
+        self.sot.invalidate(entity.Entity,
+                            entity.Entity.existing(id="enB", label="web"))
+
+        self.assertIsNone(self.sot.get(entity.Entity, "web"))
+        self.assertIsNotNone(self.sot.get(entity.Entity, "enA"))
+
+    def test_relabel(self):
+        self.sot.put(entity.Entity, self.entity)
+        self.sot.put(entity.Entity,
+                     entity.Entity.existing(id="enA", label="db"))
+
+        self.assertIsNone(self.sot.get(entity.Entity, "web"))
+        self.assertEqual("db", self.sot.get(entity.Entity, "enA").name)
+
+    def test_invalidate_under(self):
+        self.sot.put(entity.Entity, self.entity)
+        self.sot.put(check.Check, check.Check.existing(id="chA"),
+                     {"entity_id": "enA"})
+        self.sot.invalidate_under(self.entity)
+
+        self.assertEqual(2, len(self.sot))
+        self.assertIsNone(self.sot.get(check.Check, "chA",
+                                       {"entity_id": "enA"}))
+
+    def test_clear(self):
+        self.sot.put(entity.Entity, self.entity)
+        self.sot.clear()
+
+        self.assertEqual(0, len(self.sot))
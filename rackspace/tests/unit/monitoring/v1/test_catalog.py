@@ -0,0 +1,172 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import os
+import shutil
+import tempfile
+import threading
+
+import mock
+from openstack import exceptions
+import testtools
+
+from rackspace.monitoring.v1 import catalog
+from rackspace.monitoring.v1 import check_type
+from rackspace.monitoring.v1 import monitoring_zone
+
+ZONES = [
+    {"id": "mzdfw", "label": "Dallas Fort Worth (DFW)",
+     "country_code": "US", "source_ips": ["2001:4800:7902:0001::/64"]},
+    {"id": "mzlon", "label": "London (LON)", "country_code": "GB",
+     "source_ips": ["2a00:1a48:7902:0001::/64"]},
+]
+
+
+class TestPaths(testtools.TestCase):
+
+    def test_path_for(self):
+        path = catalog.path_for("/cache", "123456", "https://example.com")
+
+        self.assertEqual("/cache", os.path.dirname(path))
+        self.assertEqual(path, catalog.path_for("/cache", "123456",
+                                                "https://example.com"))
+        self.assertNotEqual(path, catalog.path_for("/cache", "654321",
+                                                   "https://example.com"))
+        self.assertNotEqual(path, catalog.path_for("/cache", "123456",
+                                                   "https://example.org"))
+
+    def test_default_directory(self):
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/xdg"}):
+            self.assertEqual(os.path.join("/xdg", "rackspace", "monitoring"),
+                             catalog.default_directory())
+
+
+class TestCatalogCache(testtools.TestCase):
+
+    def setUp(self):
+        super(TestCatalogCache, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.path = os.path.join(self.root, "cache", "catalogs.json")
+        self.fetch = mock.Mock(side_effect=self.zones)
+        patcher = mock.patch("time.time", return_value=1000.0)
+        self.mock_time = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def zones(self, resource_type):
+        return [resource_type.existing(**zone) for zone in ZONES]
+
+    def cache(self, **kwargs):
+        return catalog.CatalogCache(self.path, self.fetch, max_age=60,
+                                    **kwargs)
+
+    def test_fetches_once(self):
+        sot = self.cache()
+
+        values = sot.values(monitoring_zone.MonitoringZone)
+
+        self.assertEqual(["mzdfw", "mzlon"], [zone.id for zone in values])
+        self.assertEqual("GB", values[1].country)
+        self.assertIs(values, sot.values(monitoring_zone.MonitoringZone))
+        self.assertEqual(1, self.fetch.call_count)
+        self.assertTrue(os.path.isfile(self.path))
+
+    def test_loads_from_disk(self):
+        self.cache().values(monitoring_zone.MonitoringZone)
+
+        sot = self.cache()
+        self.mock_time.return_value = 1030.0
+
+        self.assertEqual(30.0, sot.age(monitoring_zone.MonitoringZone))
+        self.assertIsNone(sot.age(check_type.CheckType))
+        self.assertEqual("London (LON)",
+                         sot.get(monitoring_zone.MonitoringZone,
+                                 "mzlon").name)
+        self.assertEqual(1, self.fetch.call_count)
+
+    def test_unreadable_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{not json")
+
+        sot = self.cache()
+
+        self.assertEqual(2, len(sot.values(monitoring_zone.MonitoringZone)))
+        self.assertEqual(1, self.fetch.call_count)
+
+    def test_find(self):
+        sot = self.cache()
+        zone = monitoring_zone.MonitoringZone
+
+        self.assertEqual("mzlon", sot.find(zone, "London (LON)").id)
+        self.assertEqual("mzdfw", sot.find(zone, "mzdfw").id)
+        self.assertIsNone(sot.find(zone, "Sydney (SYD)"))
+        self.assertIsNone(sot.get(zone, "mzsyd"))
+
+    def test_find_duplicate(self):
+        self.fetch.side_effect = lambda resource_type: [
+            resource_type.existing(id="mzA", label="same"),
+            resource_type.existing(id="mzB", label="same")]
+
+        self.assertRaises(exceptions.DuplicateResource, self.cache().find,
+                          monitoring_zone.MonitoringZone, "same")
+
+    def test_revalidates_in_background(self):
+        sot = self.cache()
+        first = sot.values(monitoring_zone.MonitoringZone)
+        release = threading.Event()
+
+        def slow(resource_type):
+            release.wait(1)
+            return [resource_type.existing(id="mzsyd", label="Sydney")]
+
+        self.fetch.side_effect = slow
+        self.mock_time.return_value = 1060.0
+
+        self.assertIs(first, sot.values(monitoring_zone.MonitoringZone))
+        self.assertIs(first, sot.values(monitoring_zone.MonitoringZone))
+        release.set()
+        sot.wait()
+
+        self.assertEqual(2, self.fetch.call_count)
+        for cache in (sot, self.cache()):
+            self.assertEqual(["mzsyd"], [
+                zone.id for zone in
+                cache.values(monitoring_zone.MonitoringZone)])
+
+    def test_revalidate_error_keeps_catalog(self):
+        sot = self.cache()
+        sot.values(monitoring_zone.MonitoringZone)
+        error = exceptions.HttpException(http_status=503)
+        self.fetch.side_effect = error
+        self.mock_time.return_value = 2000.0
+
+        values = sot.values(monitoring_zone.MonitoringZone)
+        sot.wait()
+
+        self.assertEqual(2, len(values))
+        self.assertEqual({"monitoring_zones": error}, sot.errors)
+
+    def test_revalidates_in_foreground(self):
+        sot = self.cache(background=False)
+        sot.values(monitoring_zone.MonitoringZone)
+        self.fetch.side_effect = lambda resource_type: []
+        self.mock_time.return_value = 1060.0
+
+        self.assertEqual([], sot.values(monitoring_zone.MonitoringZone))
+
+    def test_first_fetch_error(self):
+        self.fetch.side_effect = exceptions.HttpException(http_status=503)
+
+        self.assertRaises(exceptions.HttpException, self.cache().values,
+                          monitoring_zone.MonitoringZone)
@@ -0,0 +1,145 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import os
+import shutil
+import tempfile
+import threading
+
+import mock
+import testtools
+
+from rackspace.monitoring.v1 import changelog
+
+EXAMPLE = {
+    "id": "4c5e28f0-0b3f-11e1-860d-c55c4705a286",
+    "timestamp": 1320885090764,
+    "entity_id": "enPhid7noo",
+    "alarm_id": "alahf9vuNa",
+    "check_id": "chIe2Eiqu8",
+    "state": "WARNING",
+    "previous_state": "OK",
+    "status": "matched return statement on line 6",
+    "analyzed_by_monitoring_zone_id": "mzord",
+}
+
+
+def event(event_id, timestamp):
+    return changelog.AlarmChangelog.existing(id=event_id,
+                                             timestamp=timestamp)
+
+
+class TestAlarmChangelog(testtools.TestCase):
+
+    def test_basic(self):
+        sot = changelog.AlarmChangelog()
+        self.assertEqual('values', sot.resources_key)
+        self.assertEqual('/changelogs/alarms', sot.base_path)
+        self.assertEqual("cloudMonitoring", sot.service.service_name)
+        self.assertTrue(sot.allow_list)
+        self.assertFalse(sot.allow_retrieve)
+
+    def test_make_it(self):
+        sot = changelog.AlarmChangelog(EXAMPLE)
+        self.assertEqual(EXAMPLE['id'], sot.id)
+        self.assertEqual(EXAMPLE['timestamp'], sot.timestamp)
+        self.assertEqual(EXAMPLE['entity_id'], sot.entity_id)
+        self.assertEqual(EXAMPLE['alarm_id'], sot.alarm_id)
+        self.assertEqual(EXAMPLE['check_id'], sot.check_id)
+        self.assertEqual(EXAMPLE['state'], sot.state)
+        self.assertEqual(EXAMPLE['previous_state'], sot.previous_state)
+        self.assertEqual(EXAMPLE['status'], sot.status)
+        self.assertEqual(EXAMPLE['analyzed_by_monitoring_zone_id'],
+                         sot.analyzed_by_monitoring_zone_id)
+        self.assertEqual(EXAMPLE['id'], sot.key)
+
+    def test_key_without_id(self):
+        sot = changelog.AlarmChangelog.existing(
+            timestamp=1, entity_id="en", alarm_id="al", check_id="ch",
+            state="OK")
+        self.assertEqual("1:en:al:ch:OK", sot.key)
+
+
+class TestChangelogFollower(testtools.TestCase):
+
+    def setUp(self):
+        super(TestChangelogFollower, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.path = os.path.join(self.root, "cursor.json")
+        self.proxy = mock.Mock()
+        patcher = mock.patch("time.time", return_value=100.0)
+        self.mock_time = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_poll(self):
+        self.proxy.alarm_changelogs.side_effect = [
+            [event("b", 99000), event("a", 98000)],
+            [event("b", 99000), event("c", 130000)],
+        ]
+        sot = changelog.ChangelogFollower(self.proxy, self.path,
+                                          overlap=10000)
+
+        self.assertEqual(["a", "b"], [e.id for e in sot.poll()])
+        self.mock_time.return_value = 140.0
+        self.assertEqual(["c"], [e.id for e in sot.poll()])
+
+        self.assertEqual([
+            mock.call(start=90000, end=100000),
+            mock.call(start=90000, end=140000),
+        ], self.proxy.alarm_changelogs.call_args_list)
+        self.assertEqual({"c": 130000}, sot.cursor.seen)
+
+    def test_resumes_from_saved_cursor(self):
+        self.proxy.alarm_changelogs.side_effect = [[event("a", 99000)],
+                                                   [event("a", 99000)]]
+        changelog.ChangelogFollower(self.proxy, self.path,
+                                    overlap=10000).poll()
+
+        self.mock_time.return_value = 105.0
+        sot = changelog.ChangelogFollower(self.proxy, self.path, since=0,
+                                          overlap=10000)
+
+        self.assertEqual([], sot.poll())
+        self.proxy.alarm_changelogs.assert_called_with(start=90000,
+                                                       end=105000)
+
+    def test_since(self):
+        self.proxy.alarm_changelogs.return_value = []
+        changelog.ChangelogFollower(self.proxy, since=5000,
+                                    overlap=1000).poll()
+
+        self.proxy.alarm_changelogs.assert_called_with(start=4000,
+                                                       end=100000)
+
+    def test_bad_cursor(self):
+        with open(self.path, "w") as f:
+            f.write("[")
+
+        cursor = changelog.Cursor.load(self.path)
+
+        self.assertIsNone(cursor.since)
+        self.assertEqual({}, cursor.seen)
+
+    @mock.patch("time.sleep")
+    def test_follow(self, mock_sleep):
+        stop = threading.Event()
+        self.proxy.alarm_changelogs.side_effect = [[event("a", 99000)], [],
+                                                   [event("b", 99500)]]
+        sot = changelog.ChangelogFollower(self.proxy)
+        events = sot.follow(interval=0)
+
+        self.assertEqual("a", next(events).id)
+        self.assertEqual("b", next(events).id)
+        stop.set()
+        self.assertEqual([], list(sot.follow(stop=stop)))
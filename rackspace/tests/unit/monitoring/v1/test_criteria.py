@@ -0,0 +1,134 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import testtools
+
+from rackspace.monitoring.v1 import criteria
+
+HTTP = """
+:set consecutiveCount=2
+// Slow or failing responses
+if (metric['code'] nregex '^[23]..$') {
+    return new AlarmStatus(CRITICAL, 'HTTP #{code}');
+}
+if (metric["duration"] > 1000 && rate(metric['bytes']) > 0) {
+    return new AlarmStatus(WARNING);
+}
+return new AlarmStatus(OK, 'Fine');
+"""
+
+
+def observation(timestamp, zone="mzA", **metrics):
+    return {"timestamp": timestamp, "monitoring_zone_id": zone,
+            "metrics": metrics}
+
+
+class TestCriteria(testtools.TestCase):
+
+    def evaluate(self, text, **metrics):
+        return criteria.Criteria(text)(observation(1000, **metrics))
+
+    def test_metric_types(self):
+        data = {"metrics": {"code": {"type": "s", "data": "200"},
+                            "duration": {"type": "I", "data": "5"},
+                            "load": {"type": "n", "data": "0.5"},
+                            "bad": {"type": "i", "data": "x"}}}
+        sot = criteria.Criteria(
+            "if (metric['duration'] + metric['load'] == 5.5 && "
+            "metric['code'] == '200' && metric['bad'] == 1 || "
+            "metric['bad'] != 1) { return OK, 'yes'; }")
+
+        self.assertEqual(("OK", "yes"), sot(data))
+
+    def test_default(self):
+        self.assertEqual(("OK", "Matched default return statement"),
+                         self.evaluate("if (metric['a'] > 1) "
+                                       "{ return CRITICAL; }", a=1))
+
+    def test_line_in_status(self):
+        self.assertEqual(("WARNING", "Matched return statement on line 3"),
+                         self.evaluate("\n\nreturn WARNING;"))
+
+    def test_else(self):
+        text = ("if (metric['a'] > 2) { return CRITICAL; } "
+                "else if (metric['a'] > 1) { return WARNING; } "
+                "else { return OK, 'low'; }")
+
+        self.assertEqual("CRITICAL", self.evaluate(text, a=3)[0])
+        self.assertEqual("WARNING", self.evaluate(text, a=2)[0])
+        self.assertEqual(("OK", "low"), self.evaluate(text, a=1))
+
+    def test_arithmetic(self):
+        text = ("if (-metric['a'] * 2 + 10 / 4 % 2 == -7.5 && "
+                "percentage(metric['a'], 8) >= 50 && !(metric['a'] < 3)) "
+                "{ return CRITICAL; }")
+
+        self.assertEqual("CRITICAL", self.evaluate(text, a=4)[0])
+
+    def test_missing_metric(self):
+        text = ("if (metric['a'] > 1 || metric['a'] / 0 == 1) "
+                "{ return CRITICAL; }")
+
+        self.assertEqual("OK", self.evaluate(text)[0])
+        self.assertEqual("OK", self.evaluate(text, a=0)[0])
+
+    def test_previous_and_rate(self):
+        sot = criteria.Criteria(
+            "if (rate(metric['n']) >= 5 && previous(metric['n']) == 10) "
+            "{ return CRITICAL; }")
+
+        self.assertEqual("CRITICAL", sot(observation(3000, n=20),
+                                         observation(1000, n=10))[0])
+        self.assertEqual("OK", sot(observation(3000, n=20))[0])
+
+    def test_evaluate(self):
+        sot = criteria.Criteria(HTTP)
+        data = [
+            observation(1, code="500", duration=1, bytes=0),
+            observation(2, code="500", duration=1, bytes=0),
+            observation(3, zone="mzB", code="500", duration=1, bytes=0),
+            observation(4, code="200", duration=2000, bytes=10),
+            observation(5, code="200", duration=2000, bytes=20),
+        ]
+
+        self.assertEqual(2, sot.consecutive_count)
+        self.assertEqual([
+            {"timestamp": 1, "state": "OK",
+             "status": "CRITICAL for 1 of 2 consecutive observations, "
+                       "still OK"},
+            {"timestamp": 2, "state": "CRITICAL", "status": "HTTP 500"},
+            {"timestamp": 3, "state": "OK",
+             "status": "CRITICAL for 1 of 2 consecutive observations, "
+                       "still OK"},
+            {"timestamp": 4, "state": "CRITICAL",
+             "status": "WARNING for 1 of 2 consecutive observations, "
+                       "still CRITICAL"},
+            {"timestamp": 5, "state": "WARNING",
+             "status": "Matched return statement on line 8"},
+        ], sot.evaluate(data))
+
+    def test_errors(self):
+        for text, line in [("return BROKEN;", 1),
+                           ("if (metric['a'] > ) { return OK; }", 1),
+                           ("if (metric['a'] > 1) {\n return OK;", 2),
+                           ("\nreturn OK, 1;", 2),
+                           (":set consecutiveCount=0\nreturn OK;", 1),
+                           ("return OK; @", 1),
+                           ("metric['a'];", 1)]:
+            e = self.assertRaises(criteria.CriteriaError,
+                                  criteria.Criteria, text)
+            self.assertEqual(line, e.line)
+
+    def test_compile_cached(self):
+        self.assertIs(criteria.compile_criteria(HTTP),
+                      criteria.compile_criteria(HTTP))
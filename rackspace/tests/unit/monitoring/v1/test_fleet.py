@@ -0,0 +1,75 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import testtools
+
+from rackspace.monitoring.v1 import fleet
+from rackspace.monitoring.v1 import overview
+
+
+def make_overview(entity_id, label, checks, alarms, states):
+    return overview.Overview.existing(
+        entity={"id": entity_id, "label": label},
+        checks=[{"id": check_id, "label": "ping"} for check_id in checks],
+        alarms=[{"id": alarm_id, "check_id": check_id, "label": "down"}
+                for alarm_id, check_id in alarms],
+        latest_alarm_states=[{"alarm_id": alarm_id, "entity_id": entity_id,
+                              "state": state}
+                             for alarm_id, state in states])
+
+
+class TestFleetSnapshot(testtools.TestCase):
+
+    def setUp(self):
+        super(TestFleetSnapshot, self).setUp()
+        self.sot = fleet.FleetSnapshot.from_overviews([
+            make_overview("enA", "web", ["chA", "chB"],
+                          [("alA", "chA"), ("alB", "chB")],
+                          [("alA", "OK"), ("alB", "CRITICAL")]),
+            make_overview("enB", "web", ["chC"], [("alC", "chC")],
+                          [("alC", "CRITICAL")]),
+            make_overview("enC", "db", [], [], []),
+        ])
+
+    def test_indexed_by_id(self):
+        self.assertEqual(["enA", "enB", "enC"], list(self.sot.entities))
+        self.assertEqual(["chA", "chB", "chC"], list(self.sot.checks))
+        self.assertEqual(["alA", "alB", "alC"], list(self.sot.alarms))
+        self.assertEqual("enB", self.sot.checks["chC"].entity_id)
+        self.assertEqual("enB", self.sot.alarms["alC"].entity_id)
+
+    def test_links(self):
+        self.assertEqual(["chA", "chB"],
+                         [c.id for c in self.sot.checks_for("enA")])
+        self.assertEqual(["alC"], [a.id for a in self.sot.alarms_for(
+            self.sot.entities["enB"])])
+        self.assertEqual(["alB"],
+                         [a.id for a in self.sot.alarms_for(check="chB")])
+        self.assertEqual([], self.sot.checks_for("enC"))
+        self.assertEqual([], self.sot.alarms_for("missing"))
+
+    def test_labels(self):
+        self.assertEqual(["enA", "enB"],
+                         [e.id for e in self.sot.find_entities("web")])
+        self.assertEqual(3, len(self.sot.find_checks("ping")))
+        self.assertEqual(3, len(self.sot.find_alarms("down")))
+        self.assertEqual([], self.sot.find_entities("nope"))
+
+    def test_states(self):
+        self.assertEqual("CRITICAL", self.sot.state_of("alB"))
+        self.assertIsNone(self.sot.state_of("missing"))
+        self.assertEqual(["alB", "alC"], [
+            a.id for a in self.sot.alarms_in_state("CRITICAL")])
+        self.assertEqual(["enA", "enB"], [
+            e.id for e in self.sot.entities_in_state("CRITICAL")])
+        self.assertEqual([], self.sot.entities_in_state("WARNING"))
@@ -0,0 +1,111 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import math
+
+import mock
+import testtools
+
+from rackspace.monitoring.v1 import host_info
+
+FILESYSTEMS = [
+    {"dir_name": "/", "total": 100, "used": 50},
+    {"dir_name": "/var", "total": 200, "used": 20},
+    {"dir_name": "/tmp", "total": 0, "used": 0},
+    {"dir_name": "/boot"},
+]
+
+
+class TestPercentile(testtools.TestCase):
+
+    def test_interpolates(self):
+        self.assertEqual(2.5, host_info.percentile([4, 1, 3, 2], 50))
+        self.assertEqual(1, host_info.percentile([4, 1, 3, 2], 0))
+        self.assertEqual(4, host_info.percentile([4, 1, 3, 2], 100))
+
+    def test_ignores_nan(self):
+        self.assertEqual(2, host_info.percentile([1, float("nan"), 3], 50))
+
+    def test_empty(self):
+        self.assertTrue(math.isnan(host_info.percentile([float("nan")], 50)))
+
+
+class TestTable(testtools.TestCase):
+
+    def setUp(self):
+        super(TestTable, self).setUp()
+        self.sot = host_info.Table("filesystems")
+        for row in FILESYSTEMS:
+            self.sot.append("agA", row)
+        self.sot.append("agB", {"dir_name": "/", "total": 100, "used": 90,
+                                "options": "rw"})
+
+    def test_columns(self):
+        self.assertEqual(5, len(self.sot))
+        self.assertEqual(["dir_name", "total", "used", "options"],
+                         self.sot.fields)
+        self.assertEqual(["agA"] * 4 + ["agB"], self.sot.agent_ids)
+        self.assertEqual([None, None, None, None, "rw"],
+                         list(self.sot.column("options")))
+        total = list(self.sot.column("total"))
+        self.assertEqual([100, 200, 0], total[:3])
+        self.assertTrue(math.isnan(total[3]))
+        self.assertRaises(KeyError, self.sot.column, "free")
+
+    def test_aggregates(self):
+        self.assertEqual(400, self.sot.sum("total"))
+        self.assertEqual(100, self.sot.percentile("total", 50))
+
+    def test_ratio(self):
+        usage = list(self.sot.ratio("used", "total"))
+
+        self.assertEqual([0.5, 0.1, 0.9], [usage[0], usage[1], usage[4]])
+        self.assertTrue(math.isnan(usage[2]))
+        self.assertTrue(math.isnan(usage[3]))
+        self.assertEqual(0.5, host_info.percentile(usage, 50))
+
+    def test_mixed_types(self):
+        self.sot.append("agC", {"total": "unknown"})
+
+        self.assertEqual([100, 200, 0, None, 100, "unknown"],
+                         list(self.sot.column("total")))
+
+    def test_missing_first_value(self):
+        sot = host_info.Table("memory")
+        sot.append("agA", {"free": None, "state": None})
+        sot.append("agB", {"free": 5, "state": "ok"})
+
+        self.assertEqual(5, sot.sum("free"))
+        self.assertEqual(5, sot.percentile("free", 50))
+        self.assertEqual([None, "ok"], list(sot.column("state")))
+
+    @mock.patch.object(host_info, "numpy", None)
+    def test_without_numpy(self):
+        self.assertEqual(400, self.sot.sum("total"))
+        self.assertEqual(0.5, host_info.percentile(
+            self.sot.ratio("used", "total"), 50))
+
+
+class TestHostInfo(testtools.TestCase):
+
+    def test_add(self):
+        sot = host_info.HostInfo(["memory", "filesystems"])
+        error = ValueError()
+        sot.add("agA", "memory", {"total": 1024})
+        sot.add("agB", "memory", {"total": 2048})
+        sot.add("agA", "filesystems", FILESYSTEMS)
+        sot.add("agB", "filesystems", error)
+
+        self.assertEqual(3072, sot["memory"].sum("total"))
+        self.assertEqual(4, len(sot["filesystems"]))
+        self.assertEqual({"agB": {"filesystems": error}}, sot.errors)
@@ -0,0 +1,97 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import mock
+import testtools
+
+from rackspace.monitoring.v1 import check
+from rackspace.monitoring.v1 import entity
+from rackspace.monitoring.v1 import label_index
+
+
+class TestLabelIndex(testtools.TestCase):
+
+    def setUp(self):
+        super(TestLabelIndex, self).setUp()
+        self.sot = label_index.LabelIndex(max_age=10)
+        self.sweep = mock.Mock(return_value=[
+            entity.Entity.existing(id="enA", label="web"),
+            entity.Entity.existing(id="enB", label="web"),
+            entity.Entity.existing(id="enC", label="db"),
+            entity.Entity.existing(id="enD")])
+
+    def test_lookup(self):
+        self.assertEqual(["enC"],
+                         self.sot.lookup(entity.Entity, "db", self.sweep))
+        self.assertEqual(["enA", "enB"],
+                         self.sot.lookup(entity.Entity, "web", self.sweep))
+        self.assertEqual(["enD"],
+                         self.sot.lookup(entity.Entity, "enD", self.sweep))
+        self.assertEqual([],
+                         self.sot.lookup(entity.Entity, "nope", self.sweep))
+        self.assertEqual(1, self.sweep.call_count)
+        self.assertEqual(1, self.sot.sweeps)
+
+    def test_scoped_by_path_args(self):
+        self.sot.lookup(check.Check, "x", self.sweep, {"entity_id": "enA"})
+        self.sot.lookup(check.Check, "x", self.sweep, {"entity_id": "enA"})
+        self.sot.lookup(check.Check, "x", self.sweep, {"entity_id": "enB"})
+
+        self.assertEqual(2, self.sweep.call_count)
+
+    @mock.patch("time.time")
+    def test_max_age(self, mock_time):
+        mock_time.return_value = 100
+        self.sot.lookup(entity.Entity, "db", self.sweep)
+        mock_time.return_value = 109
+        self.sot.lookup(entity.Entity, "db", self.sweep)
+        mock_time.return_value = 110
+        self.sot.lookup(entity.Entity, "db", self.sweep)
+
+        self.assertEqual(2, self.sweep.call_count)
+
+    def test_add_and_remove(self):
+        self.sot.add(entity.Entity, entity.Entity.existing(id="enE",
+                                                           label="db"))
+        self.sot.lookup(entity.Entity, "db", self.sweep)
+
+        self.sot.add(entity.Entity, entity.Entity.existing(id="enE",
+                                                           label="db"))
+        self.assertEqual(["enC", "enE"],
+                         self.sot.lookup(entity.Entity, "db", self.sweep))
+
+        self.sot.add(entity.Entity, entity.Entity.existing(id="enC",
+                                                           label="cache"))
+        self.sot.add(entity.Entity, entity.Entity.existing(id="enE"))
+        self.assertEqual(["enE"],
+                         self.sot.lookup(entity.Entity, "db", self.sweep))
+        self.assertEqual(["enC"],
+                         self.sot.lookup(entity.Entity, "cache", self.sweep))
+
+        self.sot.remove(entity.Entity, "enE")
+        self.assertEqual([], self.sot.lookup(entity.Entity, "db", self.sweep))
+        self.assertEqual(1, self.sweep.call_count)
+
+    def test_remove_under(self):
+        self.sot.lookup(check.Check, "x", self.sweep, {"entity_id": "enA"})
+        self.sot.remove_under(entity.Entity.existing(id="enA"))
+        self.sot.lookup(check.Check, "x", self.sweep, {"entity_id": "enA"})
+
+        self.assertEqual(2, self.sweep.call_count)
+
+    def test_clear(self):
+        self.sot.lookup(entity.Entity, "db", self.sweep)
+        self.sot.clear()
+        self.sot.lookup(entity.Entity, "db", self.sweep)
+
+        self.assertEqual(2, self.sweep.call_count)
@@ -0,0 +1,121 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import math
+
+import mock
+import testtools
+
+from rackspace.monitoring.v1 import latency
+
+HOPS = [
+    {"number": 2, "rtts": [0.675, None, 1.083], "ip": "50.56.6.34"},
+    {"number": 1, "rtts": [3.025, 3.116, 3.189], "ip": "50.57.208.106"},
+]
+
+
+class TestSummarize(testtools.TestCase):
+
+    def test_summarize(self):
+        result = latency.summarize(HOPS)
+
+        self.assertAlmostEqual(0.879, result[0])
+        self.assertEqual(2, result[1])
+        self.assertAlmostEqual(1.0 / 3, result[2])
+
+    def test_no_answer(self):
+        latency_, length, loss = latency.summarize(
+            HOPS + [{"number": 3, "rtts": [], "ip": None}])
+
+        self.assertTrue(math.isnan(latency_))
+        self.assertEqual((3, 1.0), (length, loss))
+
+    def test_empty(self):
+        result = latency.summarize([])
+
+        self.assertTrue(math.isnan(result[0]))
+        self.assertEqual((0, 1.0), result[1:])
+
+
+class TestTracerouteCache(testtools.TestCase):
+
+    @mock.patch("time.time")
+    def test_expires(self, mock_time):
+        sot = latency.TracerouteCache(ttl=10)
+        mock_time.return_value = 100
+        sot.put("mzA", "a.example.com", HOPS)
+
+        mock_time.return_value = 109
+        self.assertIs(HOPS, sot.get("mzA", "a.example.com"))
+        self.assertIsNone(sot.get("mzB", "a.example.com"))
+
+        mock_time.return_value = 110
+        self.assertIsNone(sot.get("mzA", "a.example.com"))
+        self.assertEqual(0, len(sot))
+
+    def test_clear(self):
+        sot = latency.TracerouteCache()
+        sot.put("mzA", "a.example.com", HOPS)
+
+        sot.clear()
+
+        self.assertIsNone(sot.get("mzA", "a.example.com"))
+
+
+class TestLatencyMatrix(testtools.TestCase):
+
+    def setUp(self):
+        super(TestLatencyMatrix, self).setUp()
+        self.sot = latency.LatencyMatrix(["mzA", "mzB", "mzC"],
+                                         ["a.example.com", "b.example.com"])
+
+    def route(self, rtt, length=2):
+        return [{"number": i + 1, "rtts": [rtt]} for i in range(length)]
+
+    def test_add(self):
+        self.sot.add("mzB", "b.example.com", self.route(7.5, length=4))
+
+        self.assertEqual((7.5, 4, 0.0), self.sot.get("mzB", "b.example.com"))
+        self.assertEqual(7.5, self.sot.latencies[3])
+        self.assertTrue(math.isnan(self.sot.get("mzA", "b.example.com")[0]))
+
+    def test_error(self):
+        error = ValueError()
+
+        self.sot.add("mzA", "a.example.com", error)
+
+        self.assertEqual({("mzA", "a.example.com"): error}, self.sot.errors)
+        self.assertTrue(math.isnan(self.sot.latencies[0]))
+
+    def test_row_and_column(self):
+        self.sot.add("mzB", "a.example.com", self.route(1.0))
+        self.sot.add("mzB", "b.example.com", self.route(2.0, length=3))
+        self.sot.add("mzC", "a.example.com", self.route(3.0))
+
+        self.assertEqual([1.0, 2.0], list(self.sot.row("mzB")))
+        self.assertEqual([2.0, 3.0],
+                         list(self.sot.row("mzB", measure="lengths")))
+        self.assertEqual([1.0, 3.0],
+                         list(self.sot.column("a.example.com"))[1:])
+
+    def test_nearest(self):
+        self.sot.add("mzA", "a.example.com", self.route(9.0))
+        self.sot.add("mzB", "a.example.com", self.route(1.0))
+        self.sot.add("mzC", "a.example.com", self.route(4.0))
+
+        self.assertEqual([("mzB", 1.0), ("mzC", 4.0)],
+                         self.sot.nearest("a.example.com", count=2))
+        self.assertEqual([], self.sot.nearest("b.example.com"))
+
+    def test_unknown(self):
+        self.assertRaises(KeyError, self.sot.get, "mzD", "a.example.com")
@@ -10,12 +10,19 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import shutil
+import tempfile
+
+import mock
+from openstack import exceptions
 from openstack.tests.unit import test_proxy_base
 from rackspace.monitoring.v1 import _proxy
 
 from rackspace.monitoring.v1 import agent
 from rackspace.monitoring.v1 import agent_token
 from rackspace.monitoring.v1 import alarm
+from rackspace.monitoring.v1 import catalog
+from rackspace.monitoring.v1 import changelog
 from rackspace.monitoring.v1 import check
 from rackspace.monitoring.v1 import check_type
 from rackspace.monitoring.v1 import entity
@@ -24,6 +31,7 @@ from rackspace.monitoring.v1 import notification
 from rackspace.monitoring.v1 import notification_plan
 from rackspace.monitoring.v1 import notification_type
 from rackspace.monitoring.v1 import overview
+from rackspace.monitoring.v1 import snapshot
 from rackspace.monitoring.v1 import suppression
 from rackspace.monitoring.v1 import suppression_log
 
@@ -34,8 +42,167 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
         super(TestMonitoringProxy, self).setUp()
         self.proxy = _proxy.Proxy(self.session)
 
+    def verify_list(self, *args, **kwargs):
+        kwargs.setdefault("mock_method",
+                          "rackspace.monitoring.v1._proxy.Proxy._list")
+        super(TestMonitoringProxy, self).verify_list(*args, **kwargs)
+
+    def enable_catalog_cache(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        return self.proxy.enable_catalog_cache(directory=root,
+                                               account="123456",
+                                               endpoint="https://example.com")
+
+    def test_catalog_cache(self):
+        zone = monitoring_zone.MonitoringZone
+        zones = [zone.existing(id="mzdfw", label="Dallas"),
+                 zone.existing(id="mzlon", label="London")]
+        sot = self.enable_catalog_cache()
+
+        with mock.patch.object(monitoring_zone.MonitoringZone, "list",
+                               return_value=zones) as m:
+            self.assertEqual(["mzdfw", "mzlon"],
+                             [res.id for res in
+                              self.proxy.monitoring_zones()])
+            self.assertEqual("mzlon",
+                             self.proxy.find_monitoring_zone("London").id)
+            self.assertEqual("Dallas",
+                             self.proxy.get_monitoring_zone("mzdfw").name)
+
+        m.assert_called_once_with(self.session, paginated=True)
+        self.assertIsNotNone(sot.age(monitoring_zone.MonitoringZone))
+
+    def test_catalog_cache_misses(self):
+        self.enable_catalog_cache()
+        missing = monitoring_zone.MonitoringZone.existing(id="mzsyd")
+
+        with mock.patch.object(monitoring_zone.MonitoringZone, "list",
+                               return_value=[]), \
+                mock.patch("openstack.proxy.BaseProxy._get",
+                           return_value=missing) as m:
+            self.assertIs(missing,
+                          self.proxy.get_monitoring_zone("mzsyd"))
+        m.assert_called_once_with(monitoring_zone.MonitoringZone, "mzsyd")
+
+        with mock.patch("rackspace.monitoring.v1._base.BaseResource.list",
+                        return_value=iter([])) as m:
+            list(self.proxy.monitoring_zones(limit=10))
+        self.assertEqual(1, m.call_count)
+
+    def test_catalog_cache_default_key(self):
+        self.session.get_project_id = mock.Mock(return_value="123456")
+        self.session.get_endpoint = mock.Mock(
+            return_value="https://example.com")
+
+        sot = self.proxy.enable_catalog_cache(directory="/cache")
+
+        self.assertEqual(catalog.path_for("/cache", "123456",
+                                          "https://example.com"), sot.path)
+        self.session.get_endpoint.assert_called_once_with(
+            service_type="rax:monitor")
+        self.proxy.disable_catalog_cache()
+        self.assertIsNone(self.proxy.catalogs)
+
+    def test_cache_find(self):
+        sot = self.proxy.enable_cache()
+        found = entity.Entity.existing(id="enA", label="web")
+        with mock.patch("openstack.proxy.BaseProxy._find",
+                        return_value=found) as m:
+            self.assertIs(found, self.proxy.find_entity("web"))
+            self.assertIs(found, self.proxy.find_entity("web"))
+            self.assertIs(found, self.proxy.get_entity("enA"))
+
+        self.assertEqual(1, m.call_count)
+        self.assertEqual((2, 1), (sot.hits, sot.misses))
+
+    def test_cache_get(self):
+        self.proxy.enable_cache()
+        found = check.Check.existing(id="chA")
+        with mock.patch("openstack.proxy.BaseProxy._get",
+                        return_value=found) as m:
+            self.proxy.get_check("chA", "enA")
+            self.proxy.get_check("chA", "enA")
+            self.proxy.get_check("chA", "enB")
+
+        self.assertEqual(2, m.call_count)
+
+    def test_cache_invalidated(self):
+        self.proxy.enable_cache()
+        found = entity.Entity.existing(id="enA", label="web")
+        with mock.patch("openstack.proxy.BaseProxy._get",
+                        return_value=found) as m:
+            self.proxy.get_entity("enA")
+            with mock.patch("openstack.proxy.BaseProxy._update",
+                            return_value=found):
+                self.proxy.update_entity("enA", label="web")
+            self.proxy.get_entity("enA")
+            with mock.patch("openstack.proxy.BaseProxy._delete"):
+                self.proxy.delete_entity("enA")
+            self.proxy.get_entity("enA")
+
+        self.assertEqual(3, m.call_count)
+
+    def test_cache_disabled(self):
+        self.proxy.enable_cache()
+        self.proxy.disable_cache()
+        with mock.patch("openstack.proxy.BaseProxy._find") as m:
+            self.proxy.find_entity("web")
+            self.proxy.find_entity("web")
+
+        self.assertEqual(2, m.call_count)
+
+    def test_label_index_find(self):
+        self.proxy.enable_label_index()
+        listed = [entity.Entity.existing(id="enA", label="web"),
+                  entity.Entity.existing(id="enB", label="db"),
+                  entity.Entity.existing(id="enC", label="db")]
+        with mock.patch("rackspace.monitoring.v1._proxy.Proxy._list",
+                        return_value=listed) as mock_list, \
+                mock.patch("openstack.proxy.BaseProxy._get") as mock_get:
+            self.proxy.find_entity("web")
+            mock_get.assert_called_with(entity.Entity, "enA",
+                                        path_args=None)
+            self.proxy.find_entity("enB")
+            mock_get.assert_called_with(entity.Entity, "enB",
+                                        path_args=None)
+            self.assertRaises(exceptions.DuplicateResource,
+                              self.proxy.find_entity, "db")
+
+        mock_list.assert_called_once_with(entity.Entity, paginated=True,
+                                          path_args=None)
+
+    def test_label_index_missing(self):
+        self.proxy.enable_label_index()
+        with mock.patch("rackspace.monitoring.v1._proxy.Proxy._list",
+                        return_value=[]), \
+                mock.patch("openstack.proxy.BaseProxy._get",
+                           side_effect=exceptions.NotFoundException):
+            self.assertIsNone(self.proxy.find_entity("web"))
+            self.assertRaises(exceptions.ResourceNotFound,
+                              self.proxy.find_entity, "web",
+                              ignore_missing=False)
+
+    def test_label_index_mutations(self):
+        sot = self.proxy.enable_label_index()
+        with mock.patch("rackspace.monitoring.v1._proxy.Proxy._list",
+                        return_value=[]), \
+                mock.patch("openstack.proxy.BaseProxy._get"):
+            self.proxy.find_check("x", "enA")
+        created = check.Check.existing(id="chA", label="ping")
+        with mock.patch("openstack.proxy.BaseProxy._create",
+                        return_value=created):
+            self.proxy.create_check("enA", label="ping")
+        self.assertEqual(["chA"], sot.lookup(check.Check, "ping", None,
+                                             {"entity_id": "enA"}))
+
+        with mock.patch("openstack.proxy.BaseProxy._delete"):
+            self.proxy.delete_check("chA", "enA")
+        self.assertEqual([], sot.lookup(check.Check, "ping", None,
+                                        {"entity_id": "enA"}))
+
     def test_agents(self):
-        self.verify_list(self.proxy.agents, agent.Agent, paginated=False)
+        self.verify_list(self.proxy.agents, agent.Agent, paginated=True)
 
     def test_agent_connections(self):
         self._verify("rackspace.monitoring.v1.agent.Agent.connections",
@@ -45,6 +212,60 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
         self._verify("rackspace.monitoring.v1.agent.Agent.host_info_types",
                      self.proxy.agent_host_info_types, method_args=["value"])
 
+    @mock.patch("time.sleep")
+    def test_harvest_host_info(self, mock_sleep):
+        failures = [exceptions.HttpException(http_status=503)]
+
+        def host_memory(self, session):
+            if self.id == "agB" and failures:
+                raise failures.pop()
+            return {"total": 1024 if self.id == "agA" else 2048}
+
+        def host_cpus(self, session):
+            if self.id == "agB":
+                raise exceptions.HttpException(http_status=404)
+            return [{"mhz": 2000}, {"mhz": 3000}]
+
+        with mock.patch.object(agent.Agent, "host_memory", host_memory), \
+                mock.patch.object(agent.Agent, "host_cpus", host_cpus), \
+                mock.patch("rackspace.monitoring.v1._proxy.Proxy.agents",
+                           return_value=[agent.Agent.existing(id="agA"),
+                                         "agB"]):
+            result = self.proxy.harvest_host_info(concurrency=2)
+
+        self.assertEqual(3072, result["memory"].sum("total"))
+        self.assertEqual(["agA", "agA"], result["cpus"].agent_ids)
+        self.assertEqual(["agB"], list(result.errors))
+        self.assertEqual(["cpus"], list(result.errors["agB"]))
+
+    def test_host_info_changes(self):
+        reports = {"agA": [[{"pid": 1}], [{"pid": 1}, {"pid": 2}]],
+                   "agB": [[{"pid": 1}], [{"pid": 1}]]}
+
+        def host_processes(self, session):
+            if self.id == "agC":
+                raise exceptions.HttpException(http_status=404)
+            return reports[self.id].pop(0)
+
+        store = snapshot.SnapshotStore()
+        with mock.patch.object(agent.Agent, "host_processes",
+                               host_processes):
+            first = dict(self.proxy.host_info_changes(
+                store, agents=["agA", "agB", "agC"]))
+            second = dict(self.proxy.host_info_changes(
+                store, agents=["agA", "agB"]))
+
+        self.assertEqual([("agA", "processes"), ("agB", "processes"),
+                          ("agC", "processes")], sorted(first))
+        self.assertIsInstance(first["agC", "processes"],
+                              exceptions.HttpException)
+        self.assertEqual([("agA", "processes")], list(second))
+        self.assertEqual([2], list(second["agA", "processes"].added))
+
+    def test_harvest_host_info_unknown_type(self):
+        self.assertRaises(ValueError, self.proxy.harvest_host_info,
+                          agents=["agA"], types=["gpus"])
+
     def test_agent_host_cpus(self):
         self._verify("rackspace.monitoring.v1.agent.Agent.host_cpus",
                      self.proxy.agent_host_cpus, method_args=["value"])
@@ -85,7 +306,7 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
 
     def test_agent_tokens(self):
         self.verify_list(
-            self.proxy.agent_tokens, agent_token.AgentToken, paginated=False)
+            self.proxy.agent_tokens, agent_token.AgentToken, paginated=True)
 
     def test_agent_token_create(self):
         self.verify_create(
@@ -111,7 +332,7 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
 
     def test_alarms(self):
         self.verify_list(
-            self.proxy.alarms, alarm.Alarm, paginated=False,
+            self.proxy.alarms, alarm.Alarm, paginated=True,
             method_args=["test_id"],
             expected_kwargs={"path_args": {"entity_id": "test_id"}})
 
@@ -234,6 +455,28 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
             returned_checks.append(chk)
         self.assertEqual(len(checks_body), len(returned_checks))
 
+    def test_checks_paginated(self):
+        with mock.patch("rackspace.monitoring.v1._proxy.Proxy._list") as m:
+            m.return_value = iter([check.Check.existing(id="a")])
+
+            result = list(self.proxy.checks("test_entity_id", limit=2))
+
+        m.assert_called_with(check.Check,
+                             path_args={"entity_id": "test_entity_id"},
+                             paginated=True, limit=2)
+        self.assertEqual(["test_entity_id"],
+                         [value.entity_id for value in result])
+
+    def test_list_prefetch(self):
+        with mock.patch.object(entity.Entity, "list") as m:
+            m.return_value = ["result"]
+
+            self.assertEqual(["result"],
+                             self.proxy.entities(limit=5, prefetch=True))
+
+        m.assert_called_with(self.session, path_args=None, paginated=True,
+                             params={"limit": 5}, prefetch=True)
+
     def test_check_metrics(self):
         test_check = check.Check.from_id("test_check_id")
         test_check.entity_id = "test_entity_id"
@@ -242,6 +485,40 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
             "rackspace.monitoring.v1.check.Check.metrics",
             self.proxy.check_metrics, method_args=[test_check])
 
+    @mock.patch("time.sleep")
+    def test_metrics_for(self, mock_sleep):
+        listed = [check.Check.existing(id="chB", entity_id="enB"),
+                  check.Check.existing(id="chC", entity_id="enB")]
+        responses = {
+            "chA": [["a"]],
+            "chB": [exceptions.HttpException(http_status=503), ["b"]],
+            "chC": [exceptions.HttpException(http_status=400)],
+        }
+
+        def metrics(self, session):
+            result = responses[self.id].pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with mock.patch("rackspace.monitoring.v1._proxy.Proxy.checks",
+                        return_value=listed) as mock_checks, \
+                mock.patch.object(check.Check, "metrics", metrics):
+            result = dict(self.proxy.metrics_for(
+                [check.Check.existing(id="chA", entity_id="enA"), "enB"],
+                concurrency=2))
+
+        mock_checks.assert_called_once_with("enB")
+        self.assertEqual(["a"], result["enA", "chA"])
+        self.assertEqual(["b"], result["enB", "chB"])
+        self.assertIsInstance(result["enB", "chC"],
+                              exceptions.HttpException)
+        self.assertEqual(1, mock_sleep.call_count)
+
+    def test_metrics_for_needs_entity(self):
+        self.assertRaises(ValueError, list, self.proxy.metrics_for(
+            [check.Check.existing(id="chA")]))
+
     def test_check_test(self):
         test_check = check.Check.from_id("test_check_id")
         test_check.entity_id = "test_entity_id"
@@ -330,7 +607,7 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
 
     def test_check_types(self):
         self.verify_list(self.proxy.check_types, check_type.CheckType,
-                         paginated=False)
+                         paginated=True)
 
     def test_check_type_targets(self):
         test_checktype = check_type.CheckType.from_id("test_checktype_id")
@@ -355,7 +632,7 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
         self.verify_get(self.proxy.get_check_type, check_type.CheckType)
 
     def test_entities(self):
-        self.verify_list(self.proxy.entities, entity.Entity, paginated=False)
+        self.verify_list(self.proxy.entities, entity.Entity, paginated=True)
 
     def test_entity_create(self):
         self.verify_create(self.proxy.create_entity, entity.Entity)
@@ -377,7 +654,7 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
 
     def test_monitoring_zones(self):
         self.verify_list(self.proxy.monitoring_zones,
-                         monitoring_zone.MonitoringZone, paginated=False)
+                         monitoring_zone.MonitoringZone, paginated=True)
 
     def test_monitoring_zone_find(self):
         self.verify_find(self.proxy.find_monitoring_zone,
@@ -389,7 +666,7 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
 
     def test_notifications(self):
         self.verify_list(self.proxy.notifications,
-                         notification.Notification, paginated=False)
+                         notification.Notification, paginated=True)
 
     def test_notification_create(self):
         self.verify_create(self.proxy.create_notification,
@@ -417,7 +694,7 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
 
     def test_notification_plans(self):
         self.verify_list(self.proxy.notification_plans,
-                         notification_plan.NotificationPlan, paginated=False)
+                         notification_plan.NotificationPlan, paginated=True)
 
     def test_notification_plan_create(self):
         self.verify_create(self.proxy.create_notification_plan,
@@ -445,7 +722,7 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
 
     def test_notification_types(self):
         self.verify_list(self.proxy.notification_types,
-                         notification_type.NotificationType, paginated=False)
+                         notification_type.NotificationType, paginated=True)
 
     def test_notification_type_find(self):
         self.verify_find(self.proxy.find_notification_type,
@@ -457,11 +734,62 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
 
     def test_suppressions(self):
         self.verify_list(self.proxy.suppressions,
-                         suppression.Suppression, paginated=False)
+                         suppression.Suppression, paginated=True)
 
     def test_overviews(self):
         self.verify_list(
-            self.proxy.overviews, overview.Overview, paginated=False)
+            self.proxy.overviews, overview.Overview, paginated=True)
+
+    def test_fleet_snapshot(self):
+        with mock.patch("rackspace.monitoring.v1._proxy.Proxy._list") as m:
+            m.return_value = [overview.Overview.existing(
+                entity={"id": "enA"}, checks=[{"id": "chA"}],
+                alarms=[{"id": "alA", "check_id": "chA"}],
+                latest_alarm_states=[{"alarm_id": "alA", "state": "OK"}])]
+
+            result = self.proxy.fleet_snapshot(entity="enA")
+
+        m.assert_called_with(overview.Overview, paginated=True,
+                             prefetch=True, entity="enA")
+        self.assertEqual(["alA"],
+                         [a.id for a in result.alarms_for(check="chA")])
+        self.assertEqual("OK", result.state_of("alA"))
+
+    def test_evaluate_alarms(self):
+        data = [{"timestamp": 1, "metrics": {"a": 2}}]
+
+        result = self.proxy.evaluate_alarms(
+            [alarm.Alarm.existing(id="alA", criteria="return WARNING;"),
+             "if (metric['a'] > 1) { return CRITICAL, 'big'; }"], data)
+
+        self.assertEqual(["alA", "if (metric['a'] > 1) "
+                                 "{ return CRITICAL, 'big'; }"],
+                         list(result))
+        self.assertEqual([{"timestamp": 1, "state": "CRITICAL",
+                           "status": "big"}], list(result.values())[1])
+
+    def test_reconcile(self):
+        with mock.patch("rackspace.monitoring.v1.reconcile.Reconciler."
+                        "reconcile", return_value="done") as m:
+            self.assertEqual("done", self.proxy.reconcile({}, dry_run=True))
+
+        m.assert_called_once_with({}, dry_run=True)
+
+    def test_alarm_changelogs(self):
+        with mock.patch("rackspace.monitoring.v1._proxy.Proxy._list") as m:
+            self.proxy.alarm_changelogs(start=1, end=2, entity="enA",
+                                        limit=10)
+
+        m.assert_called_once_with(changelog.AlarmChangelog, paginated=True,
+                                  limit=10, entityId="enA",
+                                  **{"from": 1, "to": 2})
+
+    def test_follow_alarm_changes(self):
+        sot = self.proxy.follow_alarm_changes(since=5, overlap=1)
+
+        self.assertIs(self.proxy, sot.proxy)
+        self.assertEqual(5, sot.cursor.since)
+        self.assertEqual(1, sot.overlap)
 
     def test_alarm_test(self):
         test_entity_id = "test_entity_id"
@@ -501,6 +829,41 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
                 test_monitoring_zone, example_target, example_target_resolver],
             expected_args=["www.rackspace.com", "IPv6"])
 
+    @mock.patch("time.sleep")
+    def test_latency_matrix(self, mock_sleep):
+        failures = [exceptions.HttpException(http_status=503)]
+        calls = []
+
+        def traceroute(self, session, target, target_resolver="IPv4"):
+            calls.append((self.id, target))
+            if self.id == "mzB" and target == "b.example.com":
+                if failures:
+                    raise failures.pop()
+                raise exceptions.HttpException(http_status=400)
+            return [{"number": 1, "rtts": [1.0, 1.0, 1.0]},
+                    {"number": 2, "rtts": [4.0, 6.0]}]
+
+        targets = ["a.example.com", "b.example.com"]
+        with mock.patch.object(monitoring_zone.MonitoringZone, "traceroute",
+                               traceroute), \
+                mock.patch("rackspace.monitoring.v1._proxy.Proxy"
+                           ".monitoring_zones",
+                           return_value=[monitoring_zone.MonitoringZone
+                                         .existing(id="mzA"), "mzB"]):
+            result = self.proxy.latency_matrix(targets, concurrency=2,
+                                               rate=1000)
+            self.assertEqual(5, len(calls))
+            self.assertEqual(["mzA", "mzB"], result.zone_ids)
+            latency, length, loss = result.get("mzA", targets[0])
+            self.assertEqual((5.0, 2), (latency, length))
+            self.assertAlmostEqual(1.0 / 3, loss)
+            self.assertEqual([("mzB", targets[1])], list(result.errors))
+            self.assertEqual(3, len(self.proxy.traceroutes))
+
+            again = self.proxy.latency_matrix(targets, zones=["mzA"])
+            self.assertEqual(5, len(calls))
+            self.assertEqual([5.0, 5.0], list(again.row("mzA")))
+
     def test_suppression_create(self):
         self.verify_create(self.proxy.create_suppression,
                            suppression.Suppression)
@@ -525,7 +888,7 @@ class TestMonitoringProxy(test_proxy_base.TestProxyBase):
 
     def test_suppression_logs(self):
         self.verify_list(self.proxy.suppression_logs,
-                         suppression_log.SuppressionLog, paginated=False)
+                         suppression_log.SuppressionLog, paginated=True)
 
     def test_suppression_log_find(self):
         self.verify_find(self.proxy.find_suppression_log,
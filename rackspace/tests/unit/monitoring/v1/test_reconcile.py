@@ -0,0 +1,221 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import testtools
+
+from rackspace.monitoring.v1 import alarm
+from rackspace.monitoring.v1 import check
+from rackspace.monitoring.v1 import entity
+from rackspace.monitoring.v1 import fleet
+from rackspace.monitoring.v1 import notification
+from rackspace.monitoring.v1 import notification_plan
+from rackspace.monitoring.v1 import overview
+from rackspace.monitoring.v1 import reconcile
+
+CRITERIA = "return new AlarmStatus(OK);"
+
+
+def desired():
+    return {
+        "notifications": [{"label": "ops", "type": "email",
+                           "details": {"address": "ops@example.com"}}],
+        "notification_plans": [{"label": "page",
+                                "critical_state": ["ops"]}],
+        "entities": [{"label": "web1", "checks": [
+            {"label": "ping", "type": "remote.ping", "disabled": False,
+             "monitoring_zones_poll": ["mzdfw", "mzord"],
+             "alarms": [{"label": "down", "criteria": CRITERIA,
+                         "notification_plan_id": "page"}]}]}],
+    }
+
+
+class FakeProxy(object):
+    """Records writes and serves what exists"""
+
+    def __init__(self):
+        self.notification_list = []
+        self.plan_list = []
+        self.overviews = []
+        self.writes = []
+        self.fail = set()
+        self.count = 0
+
+    def notifications(self):
+        return self.notification_list
+
+    def notification_plans(self):
+        return self.plan_list
+
+    def suppressions(self):
+        return []
+
+    def fleet_snapshot(self):
+        return fleet.FleetSnapshot.from_overviews(self.overviews)
+
+    def __getattr__(self, name):
+        action, kind = name.split("_", 1)
+        types = {"notification": notification.Notification,
+                 "notification_plan": notification_plan.NotificationPlan,
+                 "entity": entity.Entity, "check": check.Check,
+                 "alarm": alarm.Alarm}
+
+        def write(*args, **attrs):
+            self.writes.append((name, args, attrs))
+            if attrs.get("label") in self.fail:
+                raise ValueError(attrs["label"])
+            if action == "create":
+                self.count += 1
+                return types[kind].existing(id="%s%d" % (kind, self.count),
+                                            **attrs)
+            return args[0]
+        return write
+
+
+class TestReconciler(testtools.TestCase):
+
+    def setUp(self):
+        super(TestReconciler, self).setUp()
+        self.proxy = FakeProxy()
+        self.sot = reconcile.Reconciler(self.proxy, workers=2)
+
+    def existing(self):
+        self.proxy.notification_list = [notification.Notification.existing(
+            id="ntA", label="ops", type="email",
+            details={"address": "ops@example.com"})]
+        self.proxy.plan_list = [notification_plan.NotificationPlan.existing(
+            id="npA", label="page", critical_state=["ntA"])]
+        self.proxy.overviews = [overview.Overview.existing(
+            entity={"id": "enA", "label": "web1"},
+            checks=[{"id": "chA", "label": "ping", "type": "remote.ping",
+                     "disabled": "false",
+                     "monitoring_zones_poll": ["mzord", "mzdfw"]},
+                    {"id": "chB", "label": "old", "type": "remote.ping"}],
+            alarms=[{"id": "alA", "label": "down", "check_id": "chA",
+                     "criteria": CRITERIA, "notification_plan_id": "npA"}],
+            latest_alarm_states=[])]
+
+    def test_create_everything(self):
+        plan, result = self.sot.reconcile(desired())
+
+        self.assertEqual(["+ notification ops", "+ notification_plan page",
+                          "+ entity web1", "+ check web1/ping",
+                          "+ alarm web1/down"], str(plan).splitlines())
+        self.assertTrue(result.ok)
+        writes = dict((name, (args, attrs))
+                      for name, args, attrs in self.proxy.writes)
+        self.assertEqual(["notification1"],
+                         writes["create_notification_plan"][1][
+                             "critical_state"])
+        self.assertEqual(("entity3",), writes["create_check"][0])
+        self.assertEqual(("entity3",), writes["create_alarm"][0])
+        self.assertEqual("check4", writes["create_alarm"][1]["check_id"])
+        self.assertEqual("notification_plan2",
+                         writes["create_alarm"][1]["notification_plan_id"])
+
+    def test_idempotent(self):
+        self.existing()
+
+        plan, result = self.sot.reconcile(desired())
+
+        self.assertEqual([], plan.changes)
+        self.assertIsNone(result)
+        self.assertEqual([], self.proxy.writes)
+
+    def test_minimal_update(self):
+        self.existing()
+        state = desired()
+        state["entities"][0]["checks"][0]["alarms"][0]["criteria"] = "x"
+        state["entities"][0]["checks"][0]["disabled"] = True
+
+        plan, result = self.sot.reconcile(state)
+
+        self.assertEqual(["~ check web1/ping (disabled)",
+                          "~ alarm web1/down (criteria)"],
+                         str(plan).splitlines())
+        self.assertEqual([
+            ("update_check", ("enA",), {"disabled": True}),
+            ("update_alarm", ("enA",), {"criteria": "x"}),
+        ], [(name, args[1:], attrs)
+            for name, args, attrs in self.proxy.writes])
+        self.assertEqual("chA", self.proxy.writes[0][1][0].id)
+
+    def test_details_defaults(self):
+        self.existing()
+        self.proxy.overviews[0]["checks"][0]["details"] = {
+            "url": "http://example.com", "method": "GET",
+            "follow_redirects": "true", "headers": {"Host": "example.com"}}
+        state = desired()
+        details = {"url": "http://example.com", "headers": {}}
+        state["entities"][0]["checks"][0]["details"] = details
+
+        plan, result = self.sot.reconcile(state)
+
+        self.assertEqual([], plan.changes)
+
+        details["follow_redirects"] = False
+        plan, result = self.sot.reconcile(state)
+
+        self.assertEqual(["~ check web1/ping (details)"],
+                         str(plan).splitlines())
+
+    def test_dry_run(self):
+        plan, result = self.sot.reconcile(desired(), dry_run=True)
+
+        self.assertEqual(5, len(plan))
+        self.assertIsNone(result)
+        self.assertEqual([], self.proxy.writes)
+
+    def test_prune(self):
+        self.existing()
+        self.proxy.notification_list.append(
+            notification.Notification.existing(id="ntB", label="stale"))
+        self.sot.prune = True
+
+        plan, result = self.sot.reconcile(desired())
+
+        self.assertEqual(["- check web1/old", "- notification stale"],
+                         str(plan).splitlines())
+        self.assertEqual([("delete_check", ("enA",)),
+                          ("delete_notification", ())],
+                         [(name, args[1:])
+                          for name, args, _ in self.proxy.writes])
+
+    def test_failure_skips_dependents(self):
+        self.proxy.fail.add("web1")
+
+        plan, result = self.sot.reconcile(desired())
+
+        self.assertFalse(result.ok)
+        self.assertEqual(["web1"], [change.path[-1]
+                                    for change, _ in result.failed])
+        self.assertEqual(["ping", "down"], [change.path[-1]
+                                            for change in result.skipped])
+        self.assertEqual(2, len(result.applied))
+
+    def test_needs_label(self):
+        self.assertRaises(ValueError, self.sot.plan,
+                          {"notifications": [{"type": "email"}]})
+
+    def test_ambiguous(self):
+        self.existing()
+        self.proxy.overviews.append(overview.Overview.existing(
+            entity={"id": "enB", "label": "web1"}, checks=[], alarms=[],
+            latest_alarm_states=[]))
+
+        self.assertRaises(ValueError, self.sot.plan, desired())
+
+    def test_created_id_from_header(self):
+        res = entity.Entity.existing()
+        res.set_headers({"X-Object-ID": "enZ"})
+
+        self.assertEqual("enZ", reconcile._created_id(res))
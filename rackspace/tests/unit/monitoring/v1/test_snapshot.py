@@ -0,0 +1,123 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import os
+import shutil
+import tempfile
+
+import testtools
+
+from rackspace.monitoring.v1 import snapshot
+
+PROCESSES = [
+    {"pid": 1, "exe_name": "init", "memory_resident": 100},
+    {"pid": 2, "exe_name": "sshd", "memory_resident": 200},
+    {"pid": 3, "exe_name": "cron", "memory_resident": 300},
+]
+
+
+class TestDiff(testtools.TestCase):
+
+    def test_keyed_rows(self):
+        new = [
+            {"pid": 1, "exe_name": "init", "memory_resident": 100},
+            {"pid": 2, "exe_name": "sshd", "memory_resident": 250,
+             "state": "S"},
+            {"pid": 4, "exe_name": "nginx", "memory_resident": 400},
+        ]
+
+        sot = snapshot.diff("agA", "processes", PROCESSES, new)
+
+        self.assertEqual({4: new[2]}, sot.added)
+        self.assertEqual({3: PROCESSES[2]}, sot.removed)
+        self.assertEqual({2: {"memory_resident": (200, 250),
+                              "state": (None, "S")}}, sot.changed)
+        self.assertTrue(sot)
+
+    def test_compound_key(self):
+        old = [{"user": "root", "device": "tty1", "time": 1}]
+        new = [{"user": "root", "device": "tty1", "time": 2},
+               {"user": "root", "device": "pts/0", "time": 3}]
+
+        sot = snapshot.diff("agA", "who", old, new)
+
+        self.assertEqual([("root", "pts/0")], list(sot.added))
+        self.assertEqual({("root", "tty1"): {"time": (1, 2)}}, sot.changed)
+
+    def test_single_dict(self):
+        sot = snapshot.diff("agA", "memory", {"total": 1, "free": 1},
+                            {"total": 1, "free": 0})
+
+        self.assertEqual({None: {"free": (1, 0)}}, sot.changed)
+
+    def test_unkeyed_rows(self):
+        sot = snapshot.diff("agA", "unknown", [{"a": 1}],
+                            [{"a": 1}, {"a": 2}])
+
+        self.assertEqual({1: {"a": 2}}, sot.added)
+
+    def test_first_snapshot(self):
+        sot = snapshot.diff("agA", "processes", None, PROCESSES)
+
+        self.assertEqual([1, 2, 3], sorted(sot.added))
+        self.assertFalse(sot.removed or sot.changed)
+
+    def test_empty(self):
+        self.assertFalse(snapshot.diff("agA", "processes", PROCESSES,
+                                       list(PROCESSES)))
+
+
+class TestSnapshotStore(testtools.TestCase):
+
+    def test_update(self):
+        sot = snapshot.SnapshotStore()
+
+        first = sot.update("agA", "processes", PROCESSES)
+        self.assertEqual(3, len(first.added))
+        self.assertIsNone(sot.update("agA", "processes", list(PROCESSES)))
+        delta = sot.update("agA", "processes", PROCESSES[:2])
+        self.assertEqual([3], list(delta.removed))
+        self.assertEqual(PROCESSES[:2], sot.get("agA", "processes"))
+        self.assertIsNone(sot.get("agB", "processes"))
+
+    def test_hash_ignores_key_order(self):
+        self.assertEqual(snapshot.content_hash({"a": 1, "b": [1, 2]}),
+                         snapshot.content_hash({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(snapshot.content_hash([1, 2]),
+                            snapshot.content_hash([2, 1]))
+
+    def test_save_and_load(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        path = os.path.join(root, "snapshots.json")
+
+        sot = snapshot.SnapshotStore(path)
+        sot.update("agA", "processes", PROCESSES)
+        sot.save()
+
+        loaded = snapshot.SnapshotStore.load(path)
+        self.assertIsNone(loaded.update("agA", "processes", PROCESSES))
+        self.assertEqual(path, loaded.path)
+
+    def test_load_missing(self):
+        sot = snapshot.SnapshotStore.load("/nonexistent/snapshots.json")
+
+        self.assertEqual({}, sot.entries)
+
+    def test_forget(self):
+        sot = snapshot.SnapshotStore()
+        sot.update("agA", "processes", PROCESSES)
+        sot.forget("agA")
+
+        self.assertEqual(3, len(sot.update("agA", "processes",
+                                           PROCESSES).added))
@@ -11,6 +11,7 @@
 # under the License.
 
 import mock
+from openstack import exceptions
 import testtools
 
 from rackspace.object_store.v1 import bulk_delete
@@ -60,3 +61,118 @@ class TestBulkDelete(testtools.TestCase):
         result = sot.delete(self.sess, diplomats)
 
         self.assertEqual(result, bulk_delete.BulkDelete(BODY))
+
+    def test_merge(self):
+        other = {
+            "Number Not Found": 1,
+            "Response Status": "400 Bad Request",
+            "Errors": [["/Cam/Killa", "409 Conflict"]],
+            "Number Deleted": 9,
+            "Response Body": ""
+        }
+        results = [bulk_delete.BulkDelete(BODY),
+                   bulk_delete.BulkDelete(other),
+                   bulk_delete.BulkDelete(BODY)]
+
+        sot = bulk_delete.BulkDelete.merge(iter(results))
+
+        self.assertEqual(171, sot.deleted)
+        self.assertEqual(201, sot.not_found)
+        self.assertEqual(BODY["Errors"] + other["Errors"] + BODY["Errors"],
+                         sot.errors)
+        self.assertEqual("400 Bad Request", sot.response_code)
+        self.assertEqual("tell me a story\ntell me a story",
+                         sot.response_body)
+        self.assertEqual(results, sot.batches)
+
+    @mock.patch("time.sleep")
+    def test_delete_with_backoff_status(self, mock_sleep):
+        throttled = mock.Mock()
+        throttled.body = {"Response Status": "498 Rate Limited"}
+        self.sess.delete.side_effect = [throttled, throttled, self.resp]
+
+        result = bulk_delete.BulkDelete.delete_with_backoff(self.sess, "/Cam")
+
+        self.assertEqual(result, bulk_delete.BulkDelete(BODY))
+        self.assertEqual(3, self.sess.delete.call_count)
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         mock_sleep.call_args_list)
+
+    @mock.patch("time.sleep")
+    def test_delete_with_backoff_http(self, mock_sleep):
+        self.sess.delete.side_effect = [
+            exceptions.HttpException("slow down", http_status=429),
+            self.resp]
+
+        result = bulk_delete.BulkDelete.delete_with_backoff(self.sess, "/Cam")
+
+        self.assertEqual(result, bulk_delete.BulkDelete(BODY))
+        self.assertEqual(2, self.sess.delete.call_count)
+
+    @mock.patch("time.sleep")
+    def test_delete_with_backoff_gives_up(self, mock_sleep):
+        self.sess.delete.side_effect = exceptions.HttpException(
+            "slow down", http_status=498)
+
+        self.assertRaises(exceptions.HttpException,
+                          bulk_delete.BulkDelete.delete_with_backoff,
+                          self.sess, "/Cam", retries=2)
+        self.assertEqual(3, self.sess.delete.call_count)
+
+    def test_delete_with_backoff_other_error(self):
+        self.sess.delete.side_effect = exceptions.HttpException(
+            "nope", http_status=401)
+
+        self.assertRaises(exceptions.HttpException,
+                          bulk_delete.BulkDelete.delete_with_backoff,
+                          self.sess, "/Cam")
+        self.assertEqual(1, self.sess.delete.call_count)
+
+    def test_delete_batches(self):
+        def delete(path, service, data):
+            resp = mock.Mock()
+            resp.body = {"Number Deleted": int(data), "Errors": [data]}
+            return resp
+        self.sess.delete.side_effect = delete
+        bodies = [str(i) for i in range(20)]
+
+        for workers in (1, 4):
+            results = bulk_delete.BulkDelete.delete_batches(
+                self.sess, iter(bodies), workers=workers)
+
+            self.assertEqual(list(range(20)), [r.deleted for r in results])
+
+    def test_merge_nothing(self):
+        sot = bulk_delete.BulkDelete.merge([])
+
+        self.assertEqual(0, sot.deleted)
+        self.assertEqual(0, sot.not_found)
+        self.assertEqual([], sot.errors)
+        self.assertEqual("200 OK", sot.response_code)
+
+
+class TestBatchPaths(testtools.TestCase):
+
+    def test_max_lines(self):
+        paths = ("/c/%d" % i for i in range(5))
+
+        result = list(bulk_delete.batch_paths(paths, max_lines=2))
+
+        self.assertEqual(["/c/0\n/c/1", "/c/2\n/c/3", "/c/4"], result)
+
+    def test_max_bytes(self):
+        paths = ["/c/aaaa", "/c/bb", "/c/cccccccccc"]
+
+        result = list(bulk_delete.batch_paths(paths, max_bytes=16))
+
+        self.assertEqual(["/c/aaaa\n/c/bb", "/c/cccccccccc"], result)
+
+    def test_quoted(self):
+        paths = [u"/c/a b", u"/c/caf\xe9", "/c/100%"]
+
+        result = list(bulk_delete.batch_paths(paths))
+
+        self.assertEqual(["/c/a%20b\n/c/caf%C3%A9\n/c/100%25"], result)
+
+    def test_empty(self):
+        self.assertEqual([], list(bulk_delete.batch_paths([])))
@@ -0,0 +1,128 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+
+import mock
+import testtools
+
+from rackspace.object_store.v1 import extract_archive
+
+BODY = {
+    "Number Files Created": 2,
+    "Response Status": "400 Bad Request",
+    "Errors": [["/Nas/illmatic", "400 Bad Request"]],
+    "Response Body": "one love"
+}
+
+
+class TestExtractArchive(testtools.TestCase):
+
+    def setUp(self):
+        super(TestExtractArchive, self).setUp()
+        self.resp = mock.Mock()
+        self.resp.json = mock.Mock(return_value=BODY)
+        self.sess = mock.Mock()
+        self.sess.put = mock.Mock(return_value=self.resp)
+
+    def test_basic(self):
+        sot = extract_archive.ExtractArchive(BODY)
+        self.assertIsNone(sot.resource_key)
+        self.assertIsNone(sot.resources_key)
+        self.assertEqual("/%(container)s", sot.base_path)
+        self.assertTrue(sot.allow_create)
+        self.assertFalse(sot.allow_delete)
+        self.assertFalse(sot.allow_update)
+        self.assertFalse(sot.allow_retrieve)
+        self.assertFalse(sot.allow_list)
+
+    def test_make_it(self):
+        sot = extract_archive.ExtractArchive(BODY)
+        self.assertEqual(BODY["Number Files Created"], sot.created)
+        self.assertEqual(BODY["Response Status"], sot.response_code)
+        self.assertEqual(BODY["Errors"], sot.errors)
+        self.assertEqual(BODY["Response Body"], sot.response_body)
+
+    def test_upload(self):
+        body = iter([b"a", b"b"])
+
+        result = extract_archive.ExtractArchive.upload(
+            self.sess, "Nas", body, "tar.gz")
+
+        self.assertEqual(result, extract_archive.ExtractArchive(BODY))
+        self.sess.put.assert_called_with(
+            "/Nas", endpoint_filter=extract_archive.ExtractArchive.service,
+            data=body, headers={"Accept": "application/json"},
+            params={"extract-archive": "tar.gz"})
+
+    def test_upload_bad_format(self):
+        self.assertRaises(ValueError, extract_archive.ExtractArchive.upload,
+                          self.sess, "Nas", b"", "zip")
+
+
+class TestIterFile(testtools.TestCase):
+
+    def test_chunks(self):
+        data = io.BytesIO(b"abcdefg")
+
+        result = list(extract_archive.iter_file(data, chunk_size=3))
+
+        self.assertEqual([b"abc", b"def", b"g"], result)
+
+
+class TestIterTar(testtools.TestCase):
+
+    def setUp(self):
+        super(TestIterTar, self).setUp()
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        os.makedirs(os.path.join(self.path, "b", "c"))
+        self.files = {
+            "a.txt": b"x" * 100000,
+            "b/c/d.txt": b"hello",
+            "b/e.txt": b"",
+        }
+        for name, data in self.files.items():
+            with open(os.path.join(self.path, name), "wb") as f:
+                f.write(data)
+
+    def _read(self, chunks, mode):
+        archive = tarfile.open(fileobj=io.BytesIO(b"".join(chunks)),
+                               mode=mode)
+        return dict((member.name, archive.extractfile(member).read())
+                    for member in archive.getmembers())
+
+    def test_tar(self):
+        chunks = list(extract_archive.iter_tar(self.path, chunk_size=1024))
+
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(self.files, self._read(chunks, "r:"))
+
+    def test_compressed(self):
+        for archive_format, mode in (("tar.gz", "r:gz"),
+                                     ("tar.bz2", "r:bz2")):
+            chunks = extract_archive.iter_tar(self.path, archive_format)
+
+            self.assertEqual(self.files, self._read(chunks, mode))
+
+    def test_bad_format(self):
+        self.assertRaises(ValueError, extract_archive.iter_tar,
+                          self.path, "zip")
+
+    def test_abandoned(self):
+        chunks = extract_archive.iter_tar(self.path, chunk_size=512)
+        next(chunks)
+        chunks.close()
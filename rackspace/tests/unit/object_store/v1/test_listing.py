@@ -0,0 +1,159 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import threading
+import time
+
+import mock
+import testtools
+
+from rackspace.object_store.v1 import listing
+from rackspace import utils
+
+
+class TestListing(testtools.TestCase):
+
+    def setUp(self):
+        super(TestListing, self).setUp()
+        self.sess = mock.Mock()
+        self.pages = []
+
+        def get(url, endpoint_filter, headers, params):
+            self.assertEqual("/Clark", url)
+            self.assertEqual({"Accept": "application/json"}, headers)
+            resp = mock.Mock()
+            resp.json.return_value = self.pages.pop(0)
+            return resp
+        self.sess.get = mock.Mock(side_effect=get)
+
+    def test_list_page(self):
+        self.pages = [[{"name": "a"}]]
+
+        self.assertEqual([{"name": "a"}],
+                         listing.list_page(self.sess, "Clark", {"limit": 1}))
+
+    def test_iter_listing(self):
+        self.pages = [[{"name": "a"}, {"subdir": "b/"}], [{"name": "c"}]]
+
+        result = list(listing.iter_listing(self.sess, "Clark",
+                                           {"prefix": "x"}, page_size=2))
+
+        self.assertEqual(["a", None, "c"],
+                         [entry.get("name") for entry in result])
+        self.assertEqual(
+            [mock.call("/Clark", endpoint_filter=mock.ANY, headers=mock.ANY,
+                       params={"prefix": "x", "limit": 2}),
+             mock.call("/Clark", endpoint_filter=mock.ANY, headers=mock.ANY,
+                       params={"prefix": "x", "limit": 2, "marker": "b/"})],
+            self.sess.get.call_args_list)
+
+    def test_iter_listing_empty_last_page(self):
+        self.pages = [[{"name": "a"}], []]
+
+        with utils.Pool(2) as pool:
+            result = list(listing.iter_listing(self.sess, "Clark",
+                                               page_size=1, pool=pool))
+
+        self.assertEqual([{"name": "a"}], result)
+
+    def test_disjoint(self):
+        self.assertEqual(["a", "b/", "c"],
+                         listing.disjoint(["c", "a/", "b/", "a", "a.txt",
+                                           "b/x"]))
+
+
+class TestWalk(testtools.TestCase):
+
+    def setUp(self):
+        super(TestWalk, self).setUp()
+        self.names = sorted(["a.txt", "a/1", "a/2", "b", "b/1", "c"] +
+                            ["d%02d/%d" % (i, j) for i in range(20)
+                             for j in range(3)])
+        self.requests = []
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.most_in_flight = 0
+        patcher = mock.patch.object(listing, "list_page",
+                                    side_effect=self.list_page)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def list_page(self, session, container, params):
+        with self.lock:
+            self.requests.append(dict(params))
+            self.in_flight += 1
+            self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        time.sleep(0.01)
+        prefix = params.get("prefix", "")
+        delimiter = params.get("delimiter")
+        entries = []
+        for name in self.names:
+            if not name.startswith(prefix):
+                continue
+            rest = name[len(prefix):]
+            if delimiter and delimiter in rest:
+                subdir = prefix + rest[:rest.index(delimiter) + 1]
+                if not entries or entries[-1].get("subdir") != subdir:
+                    entries.append({"subdir": subdir})
+            else:
+                entries.append({"name": name})
+        marker = params.get("marker")
+        if marker is not None:
+            entries = [e for e in entries
+                       if e.get("name", e.get("subdir")) > marker]
+        with self.lock:
+            self.in_flight -= 1
+        return entries[:params["limit"]]
+
+    def names_of(self, entries):
+        return [entry["name"] for entry in entries]
+
+    def test_order(self):
+        with utils.Pool(5) as pool:
+            result = self.names_of(listing.walk("sess", "Clark",
+                                                page_size=2, pool=pool))
+
+        self.assertEqual(self.names, result)
+
+    def test_without_pool(self):
+        result = self.names_of(listing.walk("sess", "Clark", page_size=2))
+
+        self.assertEqual(self.names, result)
+
+    def test_concurrent(self):
+        with utils.Pool(5) as pool:
+            list(listing.walk("sess", "Clark", page_size=5, pool=pool,
+                              window=4))
+
+        self.assertTrue(self.most_in_flight > 2)
+
+    def test_window(self):
+        with utils.Pool(5) as pool:
+            result = listing.walk("sess", "Clark", page_size=100, pool=pool,
+                                  window=3)
+            self.assertEqual("a.txt", next(result)["name"])
+            time.sleep(0.05)
+            opened = [params["prefix"] for params in self.requests
+                      if "delimiter" not in params]
+            result.close()
+
+        self.assertEqual(["a/", "b/", "d00/"], opened)
+
+    def test_prefixes(self):
+        result = self.names_of(listing.walk(
+            "sess", "Clark", prefixes=["d01/", "a", "a/", "d00/"],
+            page_size=1))
+
+        self.assertEqual(["a.txt", "a/1", "a/2", "d00/0", "d00/1", "d00/2",
+                          "d01/0", "d01/1", "d01/2"], result)
+        self.assertFalse(any("delimiter" in params
+                             for params in self.requests))
@@ -0,0 +1,85 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+import testtools
+
+from rackspace.object_store.v1 import metadata
+
+CURRENT = {"content-type": "text/plain", "content-length": "10",
+           "etag": "abc", "x-object-meta-color": "blue",
+           "cache-control": "max-age=60"}
+
+
+class TestMetadata(testtools.TestCase):
+
+    def test_normalize(self):
+        self.assertEqual({"cache-control": "max-age=60",
+                          "x-delete-at": "1000", "x-object-meta-a": None},
+                         metadata.normalize({"Cache-Control": "max-age=60",
+                                             "X-Delete-At": 1000,
+                                             "X-Object-Meta-A": None}))
+
+    def test_needs_update(self):
+        self.assertFalse(metadata.needs_update(
+            CURRENT, {"cache-control": "max-age=60"}))
+        self.assertTrue(metadata.needs_update(
+            CURRENT, {"cache-control": "max-age=3600"}))
+        self.assertTrue(metadata.needs_update(
+            CURRENT, {"x-object-meta-color": None}))
+        self.assertFalse(metadata.needs_update(
+            CURRENT, {"x-object-meta-size": None}))
+
+    def test_merge(self):
+        self.assertEqual(
+            {"content-type": "text/plain", "cache-control": "no-cache",
+             "x-object-meta-size": "big"},
+            metadata.merge(CURRENT, {"cache-control": "no-cache",
+                                     "x-object-meta-color": None,
+                                     "x-object-meta-size": "big"}))
+
+    def test_update_object(self):
+        sess = mock.Mock()
+        sess.head.return_value.headers = CURRENT
+
+        self.assertTrue(metadata.update_object(
+            sess, "Clark", "Kent", {"cache-control": "no-cache"}))
+
+        sess.head.assert_called_with("Clark/Kent", endpoint_filter=mock.ANY,
+                                     headers={"Accept": ""})
+        sess.post.assert_called_with(
+            "Clark/Kent", endpoint_filter=mock.ANY,
+            headers={"content-type": "text/plain",
+                     "cache-control": "no-cache",
+                     "x-object-meta-color": "blue"})
+
+    def test_update_object_skipped(self):
+        sess = mock.Mock()
+        sess.head.return_value.headers = CURRENT
+
+        self.assertFalse(metadata.update_object(
+            sess, "Clark", "Kent", {"x-object-meta-color": "blue"}))
+        self.assertFalse(sess.post.called)
+
+    def test_summary(self):
+        result = metadata.MetadataUpdate()
+        error = ValueError()
+        result.add("a", True)
+        result.add("b", False)
+        result.add("c", True)
+        result.add("d", error)
+
+        self.assertEqual(2, result.updated)
+        self.assertEqual(1, result.skipped)
+        self.assertEqual([("d", error)], result.failed)
+        self.assertEqual("MetadataUpdate(updated=2, skipped=1, failed=1)",
+                         repr(result))
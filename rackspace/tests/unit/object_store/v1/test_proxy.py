@@ -10,11 +10,26 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+
 import mock
+from openstack import exceptions
 from openstack.object_store.v1 import container
+from openstack.object_store.v1 import obj as _obj
 from openstack.tests.unit import test_proxy_base
 
 from rackspace.object_store.v1 import _proxy
+from rackspace.object_store.v1 import bulk_delete
+from rackspace.object_store.v1 import listing
+from rackspace.object_store.v1 import metadata
+from rackspace.object_store.v1 import ranged_download
+from rackspace.object_store.v1 import static_large_object
+from rackspace.object_store.v1 import sync
+from rackspace.object_store.v1 import verify
 
 
 class TestObjectStoreProxy(test_proxy_base.TestProxyBase):
@@ -30,6 +45,8 @@ class Test_bulk_delete(TestObjectStoreProxy):
 
     @mock.patch("rackspace.object_store.v1.bulk_delete.BulkDelete.delete")
     def test(self, mock_delete):
+        mock_delete.return_value = bulk_delete.BulkDelete(
+            {"Number Deleted": 1, "Response Status": "200 OK"})
         self.proxy.objects = mock.Mock()
         container_name = "Clark"
         object_name = "Addison"
@@ -37,7 +54,593 @@ class Test_bulk_delete(TestObjectStoreProxy):
                                       container=container_name)]
         self.proxy.objects.return_value = rv
 
-        self.proxy.bulk_delete("doesn't matter")
+        result = self.proxy.bulk_delete("doesn't matter")
 
         expected = "/{0}/{1}".format(container_name, object_name)
         mock_delete.assert_called_with(self.session, expected)
+        self.assertEqual(1, result.deleted)
+        self.proxy.objects.assert_called_with(mock.ANY, paginated=True,
+                                              params={})
+
+    @mock.patch("rackspace.object_store.v1.bulk_delete.BulkDelete.delete")
+    def test_batches(self, mock_delete):
+        mock_delete.return_value = bulk_delete.BulkDelete(
+            {"Number Deleted": 2, "Number Not Found": 0, "Errors": [],
+             "Response Status": "200 OK"})
+        self.proxy.objects = mock.Mock()
+        self.proxy.objects.return_value = (
+            container.Container.new(name=str(i), container="Clark")
+            for i in range(5))
+
+        result = self.proxy.bulk_delete("Clark", batch_size=2)
+
+        self.assertEqual([mock.call(self.session, "/Clark/0\n/Clark/1"),
+                          mock.call(self.session, "/Clark/2\n/Clark/3"),
+                          mock.call(self.session, "/Clark/4")],
+                         mock_delete.call_args_list)
+        self.assertEqual(6, result.deleted)
+        self.assertEqual("200 OK", result.response_code)
+
+    @mock.patch("rackspace.object_store.v1.bulk_delete.BulkDelete."
+                "delete_batches")
+    def test_workers(self, mock_batches):
+        mock_batches.return_value = iter([])
+        self.proxy.objects = mock.Mock(return_value=[])
+
+        self.proxy.bulk_delete("Clark", workers=8)
+
+        mock_batches.assert_called_with(self.session, mock.ANY, workers=8)
+
+    @mock.patch("rackspace.object_store.v1.bulk_delete.BulkDelete.delete")
+    def test_containers(self, mock_delete):
+        mock_delete.return_value = bulk_delete.BulkDelete(
+            {"Number Deleted": 1, "Response Status": "200 OK"})
+        listings = {
+            "Clark": [container.Container.new(name="a", container="Clark")],
+            "Kent": [container.Container.new(name="b", container="Kent")],
+        }
+
+        def objects(value, paginated, params):
+            self.assertTrue(paginated)
+            self.assertEqual({"prefix": "logs/"}, params)
+            return listings[value.name]
+        self.proxy.objects = mock.Mock(side_effect=objects)
+
+        result = self.proxy.bulk_delete(
+            ["Clark", container.Container.new(name="Kent")],
+            prefix="logs/", delete_container=True)
+
+        self.assertEqual([mock.call(self.session, "/Clark/a\n/Kent/b"),
+                          mock.call(self.session, "/Clark\n/Kent")],
+                         mock_delete.call_args_list)
+        self.assertEqual(2, result.deleted)
+        self.assertEqual(2, len(result.batches))
+
+    @mock.patch("rackspace.object_store.v1.bulk_delete.BulkDelete.delete")
+    def test_containers_deleted_last(self, mock_delete):
+        sent = []
+
+        def delete(session, body):
+            sent.append(body)
+            return bulk_delete.BulkDelete({"Number Deleted": 1})
+        mock_delete.side_effect = delete
+        self.proxy.objects = mock.Mock(side_effect=lambda value, **kw: [
+            container.Container.new(name=str(i), container=value.name)
+            for i in range(10)])
+
+        self.proxy.bulk_delete(["Clark", "Kent"], delete_container=True,
+                               batch_size=3, workers=4)
+
+        self.assertEqual(8, len(sent))
+        self.assertEqual("/Clark\n/Kent", sent[-1])
+
+
+class Test_upload_archive(TestObjectStoreProxy):
+
+    @mock.patch("rackspace.object_store.v1.extract_archive.ExtractArchive."
+                "upload")
+    @mock.patch("rackspace.object_store.v1.extract_archive.iter_tar")
+    def test_directory(self, mock_tar, mock_upload):
+        path = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, path)
+
+        result = self.proxy.upload_archive("Nas", path, "tar.gz")
+
+        self.assertEqual(mock_upload.return_value, result)
+        mock_tar.assert_called_with(path, "tar.gz")
+        mock_upload.assert_called_with(self.session, "Nas",
+                                       mock_tar.return_value, "tar.gz")
+
+    @mock.patch("rackspace.object_store.v1.extract_archive.ExtractArchive."
+                "upload")
+    def test_file_object(self, mock_upload):
+        source = io.BytesIO(b"archive")
+
+        self.proxy.upload_archive(container.Container.new(name="Nas"),
+                                  source)
+
+        args = mock_upload.call_args[0]
+        self.assertEqual((self.session, "Nas"), args[:2])
+        self.assertEqual([b"archive"], list(args[2]))
+        self.assertEqual("tar", args[3])
+
+    def test_file_path(self):
+        fd, path = tempfile.mkstemp()
+        os.write(fd, b"archive")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        sent = []
+
+        def upload(session, container, body, archive_format):
+            sent.extend(body)
+        with mock.patch("rackspace.object_store.v1.extract_archive."
+                        "ExtractArchive.upload", side_effect=upload):
+            self.proxy.upload_archive("Nas", path, "tar.bz2")
+
+        self.assertEqual([b"archive"], sent)
+
+
+class Test_upload_large_object(TestObjectStoreProxy):
+
+    def setUp(self):
+        super(Test_upload_large_object, self).setUp()
+        fd, self.path = tempfile.mkstemp()
+        os.write(fd, b"x" * 2500)
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+        self.proxy.create_container = mock.Mock()
+
+    @mock.patch("rackspace.object_store.v1.static_large_object."
+                "StaticLargeObject.create", autospec=True)
+    @mock.patch("rackspace.object_store.v1.static_large_object."
+                "StaticLargeObject.upload_segment")
+    def test(self, mock_upload, mock_create):
+        mock_upload.side_effect = (
+            lambda session, path, container, name, offset, length:
+            {"path": "/%s/%s" % (container, name), "size_bytes": length})
+        mock_create.side_effect = lambda manifest, session: manifest
+
+        result = self.proxy.upload_large_object("Big", "Pun", self.path,
+                                                segment_size=1000)
+
+        self.proxy.create_container.assert_called_with(name="Big_segments")
+        self.assertEqual("Big", result.container)
+        self.assertEqual("Pun", result.name)
+        self.assertEqual([1000, 1000, 500],
+                         [s["size_bytes"] for s in result.segments])
+        names = [s["path"] for s in result.segments]
+        self.assertEqual(sorted(names), names)
+        self.assertTrue(all(name.startswith("/Big_segments/Pun/slo/")
+                            for name in names))
+        self.assertEqual(sorted(call[0][4] for call
+                                in mock_upload.call_args_list),
+                         [0, 1000, 2000])
+
+    @mock.patch("time.sleep")
+    @mock.patch("rackspace.object_store.v1.static_large_object."
+                "StaticLargeObject.create", autospec=True)
+    @mock.patch("rackspace.object_store.v1.static_large_object."
+                "StaticLargeObject.upload_segment")
+    def test_retry_segment(self, mock_upload, mock_create, mock_sleep):
+        failures = []
+
+        def upload(session, path, container, name, offset, length):
+            if offset == 1000 and not failures:
+                failures.append(offset)
+                raise IOError("connection reset")
+            return {"path": name}
+        mock_upload.side_effect = upload
+        mock_create.side_effect = lambda manifest, session: manifest
+
+        result = self.proxy.upload_large_object(
+            "Big", "Pun", self.path, segment_size=1000,
+            segment_container="elsewhere")
+
+        self.assertEqual(3, len(result.segments))
+        self.assertEqual(4, mock_upload.call_count)
+        self.assertEqual("elsewhere", mock_upload.call_args[0][2])
+
+    def test_empty(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        self.assertRaises(ValueError, self.proxy.upload_large_object,
+                          "Big", "Pun", path)
+
+    def test_segment_size_grown(self):
+        with mock.patch("os.path.getsize", return_value=(
+                static_large_object.MAX_SEGMENTS * 10 + 1)):
+            with mock.patch.object(static_large_object, "segment_size_for",
+                                   side_effect=ValueError):
+                self.assertRaises(ValueError, self.proxy.upload_large_object,
+                                  "Big", "Pun", self.path, segment_size=10)
+
+
+class Test_download_object(TestObjectStoreProxy):
+
+    data = b"0123456789" * 100
+
+    def setUp(self):
+        super(Test_download_object, self).setUp()
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "Pun")
+        self.checkpoint = self.path + ranged_download.CHECKPOINT_SUFFIX
+
+        self.proxy.get_object_metadata = mock.Mock(return_value=mock.Mock(
+            content_length=str(len(self.data)), etag="abc"))
+        self.proxy.get_object_metadata.return_value.name = "Pun"
+        self.fetched = []
+        self.fail = set()
+
+        def fetch(session, container, name, fd, offset, length, etag):
+            self.assertEqual(("Big", "Pun", "abc"), (container, name, etag))
+            if offset in self.fail:
+                raise exceptions.HttpException("changed", http_status=412)
+            self.fetched.append(offset)
+            ranged_download.write_at(fd, self.data[offset:offset + length],
+                                     offset)
+        patcher = mock.patch.object(ranged_download, "fetch_range",
+                                    side_effect=fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test(self):
+        self.proxy.download_object("Pun", container="Big", path=self.path,
+                                   parallel=4, chunk_size=300)
+
+        self.assertEqual(self.data, self._read())
+        self.assertEqual([0, 300, 600, 900], sorted(self.fetched))
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_resume(self):
+        self.fail = set([300])
+        self.assertRaises(exceptions.HttpException,
+                          self.proxy.download_object, "Pun", container="Big",
+                          path=self.path, parallel=1, chunk_size=300)
+        self.assertEqual(
+            set([0]), ranged_download.Checkpoint.load(self.checkpoint).done)
+
+        self.fail = set()
+        self.fetched = []
+        self.proxy.download_object("Pun", container="Big", path=self.path,
+                                   parallel=2, chunk_size=300)
+
+        self.assertEqual([300, 600, 900], sorted(self.fetched))
+        self.assertEqual(self.data, self._read())
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_stale_checkpoint(self):
+        with open(self.path, "wb") as f:
+            f.write(b"x" * len(self.data))
+        ranged_download.Checkpoint(self.checkpoint, "old", len(self.data),
+                                   300, [0, 300, 600]).save()
+
+        self.proxy.download_object("Pun", container="Big", path=self.path,
+                                   chunk_size=300)
+
+        self.assertEqual([0, 300, 600, 900], self.fetched)
+        self.assertEqual(self.data, self._read())
+
+    def test_empty(self):
+        self.proxy.get_object_metadata.return_value.content_length = "0"
+
+        self.proxy.download_object("Pun", container="Big", path=self.path)
+
+        self.assertEqual(b"", self._read())
+        self.assertEqual([], self.fetched)
+
+
+class Test_sync_directory(TestObjectStoreProxy):
+
+    def setUp(self):
+        super(Test_sync_directory, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        os.mkdir(os.path.join(self.root, "sub"))
+        self.files = {"same": b"same", "sub/changed": b"new",
+                      "new": b"new file", "big": b"x" * 50}
+        for name, data in self.files.items():
+            with open(os.path.join(self.root, name), "wb") as f:
+                f.write(data)
+
+        self.segments = []
+
+        def remote(container, paginated):
+            self.assertTrue(paginated)
+            if container == "Big_segments":
+                if self.segments is None:
+                    raise exceptions.NotFoundException()
+                objects = [(name, b"") for name in self.segments]
+            else:
+                self.assertEqual("Big", container.name)
+                objects = [("same", b"same"), ("sub/changed", b"old"),
+                           ("gone", b"gone")]
+            for name, data in objects:
+                obj = mock.Mock(hash=hashlib.md5(data).hexdigest())
+                obj.name = name
+                yield obj
+        self.proxy.objects = mock.Mock(side_effect=remote)
+
+        self.uploaded = {}
+
+        def upload_object(container, name, data):
+            self.uploaded[name] = data.read()
+            return mock.Mock(etag=hashlib.md5(self.uploaded[name]).hexdigest())
+        self.proxy.upload_object = mock.Mock(side_effect=upload_object)
+        manifest = mock.Mock(segments=[
+            {"path": "/Big_segments/big/slo/2.000000/50/10/00000000"}])
+        manifest.get_headers.return_value = {"etag": '"slo"'}
+        self.proxy.upload_large_object = mock.Mock(return_value=manifest)
+        self.proxy._bulk_delete = mock.Mock()
+
+    def test(self):
+        result = self.proxy.sync_directory(self.root, "Big", segment_size=10)
+
+        self.assertEqual(1, result.skipped)
+        self.assertEqual(["big", "new", "sub/changed"],
+                         sorted(result.uploaded))
+        self.assertEqual({"new": b"new file", "sub/changed": b"new"},
+                         self.uploaded)
+        self.proxy.upload_large_object.assert_called_with(
+            mock.ANY, "big", os.path.join(self.root, "big"), segment_size=10)
+        self.proxy._bulk_delete.assert_called_with([["/Big/gone"]],
+                                                   workers=4)
+        self.assertIs(self.proxy._bulk_delete.return_value, result.deleted)
+
+        index = sync.Index.load(os.path.join(self.root, sync.INDEX_NAME))
+        self.assertEqual(["big", "new", "same", "sub/changed"],
+                         sorted(index.entries))
+        self.assertEqual("slo", index.entries["big"]["etag"])
+
+    def test_uploaded_large_objects_are_skipped(self):
+        self.proxy.sync_directory(self.root, "Big", segment_size=10)
+        self.proxy.objects.side_effect = None
+        remote = [mock.Mock(hash=hashlib.md5(data).hexdigest())
+                  for name, data in sorted(self.files.items())]
+        for obj, name in zip(remote, sorted(self.files)):
+            obj.name = name
+        remote[0].hash = "slo"
+        self.proxy.objects.return_value = remote
+
+        result = self.proxy.sync_directory(self.root, "Big", segment_size=10)
+
+        self.assertEqual([], result.uploaded)
+        self.assertEqual(4, result.skipped)
+        self.assertIsNone(result.deleted)
+
+    def test_replaced_segments(self):
+        self.segments = ["big/slo/1.000000/40/10/00000000",
+                         "big/slo/2.000000/50/10/00000000",
+                         "gone/slo/1.000000/40/10/00000000",
+                         "same/slo/1.000000/40/10/00000000",
+                         "big/slo/other/slo/1.000000/40/10/00000000"]
+
+        self.proxy.sync_directory(self.root, "Big", segment_size=10)
+
+        self.proxy._bulk_delete.assert_called_with(
+            [["/Big/gone"],
+             ["/Big_segments/big/slo/1.000000/40/10/00000000",
+              "/Big_segments/gone/slo/1.000000/40/10/00000000"]],
+            workers=4)
+
+    def test_replaced_segments_kept_deleted(self):
+        self.segments = ["big/slo/1.000000/40/10/00000000",
+                         "gone/slo/1.000000/40/10/00000000"]
+
+        result = self.proxy.sync_directory(self.root, "Big", delete=False,
+                                           segment_size=10)
+
+        self.proxy._bulk_delete.assert_called_with(
+            [["/Big_segments/big/slo/1.000000/40/10/00000000"]], workers=4)
+        self.assertIs(self.proxy._bulk_delete.return_value, result.deleted)
+
+    def test_missing_segment_container(self):
+        self.segments = None
+
+        self.proxy.sync_directory(self.root, "Big", segment_size=10)
+
+        self.proxy._bulk_delete.assert_called_with([["/Big/gone"]],
+                                                   workers=4)
+
+    def test_keep_deleted(self):
+        index_path = os.path.join(tempfile.mkdtemp(), "index")
+        self.addCleanup(shutil.rmtree, os.path.dirname(index_path))
+
+        result = self.proxy.sync_directory(self.root, "Big", delete=False,
+                                           index_path=index_path)
+
+        self.assertIsNone(result.deleted)
+        self.assertFalse(self.proxy._bulk_delete.called)
+        self.assertTrue(os.path.exists(index_path))
+        self.assertFalse(os.path.exists(os.path.join(self.root,
+                                                     sync.INDEX_NAME)))
+
+    def test_index_saved_on_failure(self):
+        self.proxy.upload_object.side_effect = IOError("network")
+
+        self.assertRaises(IOError, self.proxy.sync_directory, self.root,
+                          "Big")
+
+        index = sync.Index.load(os.path.join(self.root, sync.INDEX_NAME))
+        self.assertEqual(4, len(index.entries))
+
+
+class Test_walk_objects(TestObjectStoreProxy):
+
+    def setUp(self):
+        super(Test_walk_objects, self).setUp()
+        self.names = sorted(["a.txt", "a/1", "a/2", "a/3/x", "b", "b/1",
+                             "c/1", "c/2", "c/3", "c/4", "d"])
+        self.requests = []
+
+        def list_page(session, container, params):
+            self.assertEqual("Clark", container)
+            self.requests.append(dict(params))
+            prefix = params.get("prefix", "")
+            delimiter = params.get("delimiter")
+            entries = []
+            for name in self.names:
+                if not name.startswith(prefix):
+                    continue
+                rest = name[len(prefix):]
+                if delimiter and delimiter in rest:
+                    subdir = prefix + rest[:rest.index(delimiter) + 1]
+                    if not entries or entries[-1].get("subdir") != subdir:
+                        entries.append({"subdir": subdir})
+                else:
+                    entries.append({"name": name, "bytes": 1})
+            marker = params.get("marker")
+            if marker is not None:
+                entries = [e for e in entries
+                           if e.get("name", e.get("subdir")) > marker]
+            return entries[:params["limit"]]
+        patcher = mock.patch.object(listing, "list_page",
+                                    side_effect=list_page)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test(self):
+        result = list(self.proxy.walk_objects("Clark", page_size=2))
+
+        self.assertEqual(self.names, [obj.name for obj in result])
+        self.assertTrue(all(obj.container == "Clark" for obj in result))
+        self.assertEqual(1, result[0].bytes)
+        self.assertIn({"prefix": "c/", "limit": 2, "marker": "c/2"},
+                      self.requests)
+
+    def test_names_only(self):
+        result = list(self.proxy.walk_objects("Clark", names_only=True,
+                                              workers=1))
+
+        self.assertEqual(self.names, result)
+
+    def test_prefix(self):
+        result = list(self.proxy.walk_objects("Clark", prefix="a/",
+                                              names_only=True))
+
+        self.assertEqual(["a/1", "a/2", "a/3/x"], result)
+
+    def test_prefixes(self):
+        result = list(self.proxy.walk_objects(
+            "Clark", prefixes=["c/", "a", "a/"], names_only=True,
+            page_size=1))
+
+        self.assertEqual(["a.txt", "a/1", "a/2", "a/3/x", "c/1", "c/2",
+                          "c/3", "c/4"], result)
+        self.assertFalse(any("delimiter" in params
+                             for params in self.requests))
+
+    def test_stop_early(self):
+        result = self.proxy.walk_objects("Clark", names_only=True,
+                                         page_size=1)
+
+        self.assertEqual("a.txt", next(result))
+        result.close()
+
+
+class Test_bulk_update_metadata(TestObjectStoreProxy):
+
+    @mock.patch("time.sleep")
+    @mock.patch.object(metadata, "update_object")
+    def test(self, mock_update, mock_sleep):
+        throttled = []
+
+        def update(session, container, name, patch):
+            self.assertEqual("Clark", container)
+            self.assertEqual({"cache-control": "no-cache"}, patch)
+            if name == "throttled" and not throttled:
+                throttled.append(name)
+                raise exceptions.HttpException("slow down", http_status=498)
+            if name == "missing":
+                raise exceptions.NotFoundException("gone")
+            return name != "same"
+        mock_update.side_effect = update
+
+        result = self.proxy.bulk_update_metadata(
+            "Clark", {"Cache-Control": "no-cache"},
+            names=["a", "same", "throttled", "missing", "b"])
+
+        self.assertEqual(3, result.updated)
+        self.assertEqual(1, result.skipped)
+        self.assertEqual(["missing"], [name for name, _ in result.failed])
+        self.assertEqual(2, len([call for call in mock_update.call_args_list
+                                 if call[0][2] == "throttled"]))
+        self.assertEqual(1, len([call for call in mock_update.call_args_list
+                                 if call[0][2] == "missing"]))
+
+    @mock.patch.object(metadata, "update_object", return_value=True)
+    def test_prefix(self, mock_update):
+        self.proxy.walk_objects = mock.Mock(return_value=["logs/a"])
+
+        result = self.proxy.bulk_update_metadata(
+            "Clark", {"X-Object-Meta-Kept": "yes"}, prefix="logs/")
+
+        self.assertEqual(1, result.updated)
+        self.proxy.walk_objects.assert_called_with(mock.ANY, prefix="logs/",
+                                                   names_only=True)
+        mock_update.assert_called_with(self.session, "Clark", "logs/a",
+                                       {"x-object-meta-kept": "yes"})
+
+
+class Test_temp_urls(TestObjectStoreProxy):
+
+    def setUp(self):
+        super(Test_temp_urls, self).setUp()
+        self.account = mock.Mock(meta_temp_url_key="secret",
+                                 meta_temp_url_key_2=None)
+        self.proxy.get_account_metadata = mock.Mock(
+            return_value=self.account)
+        self.session.get_endpoint.return_value = (
+            "https://storage.example.com/v1/AUTH_abc")
+
+    def test_cached(self):
+        first = self.proxy.generate_temp_urls([("GET", "Clark/a", 100)])
+        second = self.proxy.generate_temp_urls([("GET", "Clark/b", 100),
+                                                ("PUT", "Clark/c", 100)])
+
+        self.assertEqual(1, self.proxy.get_account_metadata.call_count)
+        self.assertEqual(1, self.session.get_endpoint.call_count)
+        self.assertTrue(first[0].startswith(
+            "https://storage.example.com/v1/AUTH_abc/Clark/a?temp_url_sig="))
+        self.assertEqual(2, len(second))
+
+    def test_refresh(self):
+        signer = self.proxy.get_temp_url_signer()
+        self.account.meta_temp_url_key = None
+        self.account.meta_temp_url_key_2 = "other"
+
+        refreshed = self.proxy.get_temp_url_signer(refresh=True)
+
+        self.assertIsNot(signer, refreshed)
+        self.assertNotEqual(signer.signature("GET", "/", 1),
+                            refreshed.signature("GET", "/", 1))
+
+    def test_no_key(self):
+        self.account.meta_temp_url_key = None
+
+        self.assertRaises(ValueError, self.proxy.get_temp_url_signer)
+
+
+class Test_verify_container(TestObjectStoreProxy):
+
+    @mock.patch.object(verify, "verify")
+    def test(self, mock_verify):
+        objects = [_obj.Object.existing(name="a", hash="abc"),
+                   _obj.Object.existing(name="big", hash="def",
+                                        slo_etag="ghi")]
+        self.proxy.walk_objects = mock.Mock(return_value=iter(objects))
+        mock_verify.side_effect = (
+            lambda objects, local_root, processes: list(objects))
+
+        result = self.proxy.verify_container("Clark", "/backups",
+                                             prefix="nightly/", processes=3)
+
+        self.assertEqual([("a", "abc", False), ("big", "def", True)], result)
+        self.proxy.walk_objects.assert_called_with("Clark", prefix="nightly/",
+                                                   workers=4)
@@ -0,0 +1,148 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import shutil
+import tempfile
+
+import mock
+from openstack import exceptions
+import testtools
+
+from rackspace.object_store.v1 import ranged_download
+
+DATA = b"0123456789" * 100
+
+
+def _range_response(status_code, data, read_size=64):
+    resp = mock.Mock()
+    resp.status_code = status_code
+    resp.iter_content = mock.Mock(return_value=iter(
+        [data[i:i + read_size] for i in range(0, len(data), read_size)]))
+    return resp
+
+
+class _FileTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(_FileTestCase, self).setUp()
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "out")
+
+    def _open(self, size):
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT)
+        os.ftruncate(fd, size)
+        self.addCleanup(os.close, fd)
+        return fd
+
+    def _read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+class TestWriteAt(_FileTestCase):
+
+    def test_pwrite(self):
+        fd = self._open(10)
+        ranged_download.write_at(fd, b"abc", 5)
+        ranged_download.write_at(fd, b"xy", 0)
+
+        self.assertEqual(b"xy\0\0\0abc\0\0", self._read())
+
+    def test_without_pwrite(self):
+        fd = self._open(10)
+        without_pwrite = mock.Mock(spec=["lseek", "write", "SEEK_SET"],
+                                   lseek=os.lseek, write=os.write,
+                                   SEEK_SET=os.SEEK_SET)
+        with mock.patch.object(ranged_download, "os", without_pwrite):
+            ranged_download.write_at(fd, b"abc", 5)
+
+        self.assertEqual(b"\0\0\0\0\0abc\0\0", self._read())
+
+
+class TestFetchRange(_FileTestCase):
+
+    def test_fetch(self):
+        fd = self._open(len(DATA))
+        sess = mock.Mock()
+        resp = _range_response(206, DATA[100:400])
+        sess.get = mock.Mock(return_value=resp)
+
+        ranged_download.fetch_range(sess, "Big", "Pun", fd, 100, 300,
+                                    etag="abc")
+
+        sess.get.assert_called_with(
+            "Big/Pun", endpoint_filter=ranged_download._obj.Object.service,
+            headers={"Range": "bytes=100-399", "If-Match": "abc"},
+            stream=True)
+        self.assertEqual(DATA[100:400], self._read()[100:400])
+        self.assertEqual(b"\0" * 100, self._read()[:100])
+        resp.close.assert_called_with()
+
+    def test_whole_object_returned(self):
+        fd = self._open(len(DATA))
+        sess = mock.Mock()
+        sess.get = mock.Mock(return_value=_range_response(200, DATA))
+
+        self.assertRaises(exceptions.SDKException,
+                          ranged_download.fetch_range,
+                          sess, "Big", "Pun", fd, 100, 300)
+
+    def test_short(self):
+        fd = self._open(len(DATA))
+        sess = mock.Mock()
+        sess.get = mock.Mock(return_value=_range_response(206, DATA[:10]))
+
+        self.assertRaises(exceptions.SDKException,
+                          ranged_download.fetch_range,
+                          sess, "Big", "Pun", fd, 0, 300)
+
+    def test_long(self):
+        fd = self._open(len(DATA))
+        sess = mock.Mock()
+        sess.get = mock.Mock(return_value=_range_response(206, DATA))
+
+        self.assertRaises(exceptions.SDKException,
+                          ranged_download.fetch_range,
+                          sess, "Big", "Pun", fd, 0, 300)
+
+
+class TestCheckpoint(_FileTestCase):
+
+    def test_round_trip(self):
+        checkpoint = ranged_download.Checkpoint(self.path, "abc", 25, 10)
+        checkpoint.done.add(10)
+        checkpoint.save()
+
+        loaded = ranged_download.Checkpoint.load(self.path)
+
+        self.assertTrue(loaded.matches("abc", 25, 10))
+        self.assertFalse(loaded.matches("abd", 25, 10))
+        self.assertEqual([0, 20], loaded.remaining())
+
+    def test_load_missing(self):
+        self.assertIsNone(ranged_download.Checkpoint.load(self.path))
+
+    def test_load_corrupt(self):
+        with open(self.path, "w") as f:
+            f.write('{"etag": ')
+
+        self.assertIsNone(ranged_download.Checkpoint.load(self.path))
+
+    def test_remove(self):
+        checkpoint = ranged_download.Checkpoint(self.path, "abc", 25, 10)
+        checkpoint.save()
+        checkpoint.remove()
+        checkpoint.remove()
+
+        self.assertFalse(os.path.exists(self.path))
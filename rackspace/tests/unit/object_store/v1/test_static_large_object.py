@@ -0,0 +1,151 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import json
+import os
+import tempfile
+
+import mock
+from openstack import exceptions
+import testtools
+
+from rackspace.object_store.v1 import static_large_object as slo
+
+DATA = b"".join(bytes(bytearray([i % 256])) * 1000 for i in range(100))
+
+
+def _write_data(test):
+    fd, path = tempfile.mkstemp()
+    os.write(fd, DATA)
+    os.close(fd)
+    test.addCleanup(os.remove, path)
+    return path
+
+
+class TestSegmentSizeFor(testtools.TestCase):
+
+    def test_preferred(self):
+        self.assertEqual(100, slo.segment_size_for(1000, 100))
+
+    def test_grown(self):
+        size = slo.MAX_SEGMENTS * 100 + 1
+        segment_size = slo.segment_size_for(size, 100)
+
+        self.assertEqual(101, segment_size)
+        self.assertTrue(-(-size // segment_size) <= slo.MAX_SEGMENTS)
+
+    def test_too_large(self):
+        self.assertRaises(ValueError, slo.segment_size_for,
+                          slo.MAX_SEGMENTS * slo.MAX_SEGMENT_SIZE + 1)
+
+
+class TestSegmentNames(testtools.TestCase):
+
+    def test_owner(self):
+        segment = slo.segment_prefix("a/b", 1.5, 40, 10) + "/00000003"
+
+        self.assertEqual("a/b/slo/1.500000/40/10/00000003", segment)
+        self.assertEqual("a/b", slo.segment_owner(segment))
+
+    def test_not_a_segment(self):
+        self.assertIsNone(slo.segment_owner("a/b/c/d/e"))
+        self.assertIsNone(slo.segment_owner("slo/1/2/3"))
+
+
+class TestSegmentReader(testtools.TestCase):
+
+    def test_read(self):
+        path = _write_data(self)
+        reader = slo.SegmentReader(path, 1500, 5000, read_size=1024)
+        self.addCleanup(reader.close)
+
+        self.assertEqual(5000, len(reader))
+        chunks = []
+        while True:
+            chunk = reader.read(4096)
+            if not chunk:
+                break
+            self.assertTrue(len(chunk) <= 1024)
+            chunks.append(chunk)
+
+        self.assertEqual(DATA[1500:6500], b"".join(chunks))
+        self.assertEqual(hashlib.md5(DATA[1500:6500]).hexdigest(),
+                         reader.md5.hexdigest())
+
+    def test_short_file(self):
+        path = _write_data(self)
+        reader = slo.SegmentReader(path, len(DATA) - 10, 20)
+        self.addCleanup(reader.close)
+
+        self.assertEqual(10, len(reader.read()))
+        self.assertRaises(IOError, reader.read)
+
+
+class TestStaticLargeObject(testtools.TestCase):
+
+    def setUp(self):
+        super(TestStaticLargeObject, self).setUp()
+        self.path = _write_data(self)
+        self.sent = []
+
+        def put(url, endpoint_filter, data, headers, params=None):
+            body = data
+            if hasattr(data, "read"):
+                body = b"".join(iter(lambda: data.read(8192), b""))
+            self.sent.append((url, body, params))
+            resp = mock.Mock()
+            resp.headers = {"etag": "manifest" if params else
+                            hashlib.md5(body).hexdigest()}
+            return resp
+        self.sess = mock.Mock()
+        self.sess.put = mock.Mock(side_effect=put)
+
+    def test_basic(self):
+        sot = slo.StaticLargeObject()
+        self.assertEqual("/%(container)s", sot.base_path)
+        self.assertEqual("name", sot.id_attribute)
+        self.assertTrue(sot.allow_create)
+        self.assertFalse(sot.allow_retrieve)
+        self.assertFalse(sot.allow_list)
+
+    def test_upload_segment(self):
+        entry = slo.StaticLargeObject.upload_segment(
+            self.sess, self.path, "Big_segments", "Pun/00000001", 100, 300)
+
+        self.assertEqual({"path": "/Big_segments/Pun/00000001",
+                          "etag": hashlib.md5(DATA[100:400]).hexdigest(),
+                          "size_bytes": 300}, entry)
+        self.assertEqual([("Big_segments/Pun/00000001", DATA[100:400],
+                           None)], self.sent)
+
+    def test_upload_segment_corrupted(self):
+        resp = mock.Mock()
+        resp.headers = {"etag": "nope"}
+        self.sess.put = mock.Mock(return_value=resp)
+
+        self.assertRaises(exceptions.SDKException,
+                          slo.StaticLargeObject.upload_segment,
+                          self.sess, self.path, "Big_segments", "Pun", 0, 10)
+
+    def test_create(self):
+        segments = [{"path": "/Big_segments/Pun/0", "etag": "abc",
+                     "size_bytes": 1}]
+        sot = slo.StaticLargeObject.new(container="Big", name="Pun",
+                                        segments=segments)
+
+        self.assertIs(sot, sot.create(self.sess))
+        url, body, params = self.sent[0]
+        self.assertEqual("Big/Pun", url)
+        self.assertEqual(segments, json.loads(body))
+        self.assertEqual({"multipart-manifest": "put"}, params)
+        self.assertEqual({"etag": "manifest"}, sot.get_headers())
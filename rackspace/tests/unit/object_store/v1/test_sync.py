@@ -0,0 +1,91 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+import mock
+import testtools
+
+from rackspace.object_store.v1 import sync
+
+
+class TestIndex(testtools.TestCase):
+
+    def setUp(self):
+        super(TestIndex, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        os.mkdir(os.path.join(self.root, "sub"))
+        self._write("a", b"first")
+        self._write(os.path.join("sub", "b"), b"second")
+        self.index_path = os.path.join(self.root, sync.INDEX_NAME)
+
+    def _write(self, name, data):
+        with open(os.path.join(self.root, name), "wb") as f:
+            f.write(data)
+
+    def test_file_md5(self):
+        self.assertEqual(hashlib.md5(b"first").hexdigest(),
+                         sync.file_md5(os.path.join(self.root, "a"),
+                                       read_size=2))
+
+    def test_scan(self):
+        index = sync.Index.load(self.index_path)
+        index.save()
+        # Left behind by a save that was interrupted.
+        self._write(sync.INDEX_NAME + ".x1y2z3.tmp", b"{")
+
+        entries = index.scan(self.root)
+
+        self.assertEqual(["a", "sub/b"], sorted(entries))
+        self.assertEqual(hashlib.md5(b"second").hexdigest(),
+                         entries["sub/b"]["md5"])
+        self.assertEqual(6, entries["sub/b"]["size"])
+        self.assertIsNone(entries["sub/b"]["etag"])
+
+    def test_round_trip(self):
+        index = sync.Index.load(self.index_path)
+        index.scan(self.root)
+        index.entries["a"]["etag"] = "abc"
+        index.save()
+
+        self.assertEqual(index.entries,
+                         sync.Index.load(self.index_path).entries)
+
+    @mock.patch.object(sync, "file_md5", wraps=sync.file_md5)
+    def test_scan_reuses_hashes(self, mock_md5):
+        index = sync.Index.load(self.index_path)
+        index.scan(self.root)
+        index.save()
+        index = sync.Index.load(self.index_path)
+        os.remove(os.path.join(self.root, "a"))
+        self._write(os.path.join("sub", "b"), b"changed")
+        mock_md5.reset_mock()
+
+        entries = index.scan(self.root)
+
+        self.assertEqual(["sub/b"], sorted(entries))
+        self.assertEqual(hashlib.md5(b"changed").hexdigest(),
+                         entries["sub/b"]["md5"])
+        self.assertEqual(1, mock_md5.call_count)
+
+        mock_md5.reset_mock()
+        index.scan(self.root)
+        self.assertEqual(0, mock_md5.call_count)
+
+    def test_load_corrupt(self):
+        self._write(sync.INDEX_NAME, b"[1, 2")
+
+        self.assertEqual({}, sync.Index.load(self.index_path).entries)
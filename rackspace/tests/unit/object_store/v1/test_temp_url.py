@@ -0,0 +1,57 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import hashlib
+import hmac
+
+import testtools
+
+from rackspace.object_store.v1 import temp_url
+
+ENDPOINT = "https://storage.example.com/v1/MossoCloudFS_abc/"
+
+
+def _expected(method, path, expires):
+    return hmac.new(b"secret", ("%s\n%d\n%s" % (method, expires, path))
+                    .encode("utf-8"), hashlib.sha1).hexdigest()
+
+
+class TestTempURLSigner(testtools.TestCase):
+
+    def setUp(self):
+        super(TestTempURLSigner, self).setUp()
+        self.signer = temp_url.TempURLSigner(u"secret", ENDPOINT)
+
+    def test_signature(self):
+        path = "/v1/MossoCloudFS_abc/Clark/Kent"
+
+        self.assertEqual(_expected("GET", path, 1400000000),
+                         self.signer.signature("GET", path, 1400000000))
+        self.assertEqual(_expected("PUT", path, 1400000001),
+                         self.signer.signature("PUT", path, 1400000001))
+
+    def test_bad_method(self):
+        self.assertRaises(ValueError, self.signer.signature, "PATCH", "/",
+                          1)
+
+    def test_sign(self):
+        urls = self.signer.sign([("GET", "Clark/Kent", 100),
+                                 ("HEAD", "/Clark/Super Man", 200)])
+
+        self.assertEqual(
+            ["https://storage.example.com/v1/MossoCloudFS_abc/Clark/Kent"
+             "?temp_url_sig=%s&temp_url_expires=100" %
+             _expected("GET", "/v1/MossoCloudFS_abc/Clark/Kent", 100),
+             "https://storage.example.com/v1/MossoCloudFS_abc/Clark/"
+             "Super%%20Man?temp_url_sig=%s&temp_url_expires=200" %
+             _expected("HEAD", "/v1/MossoCloudFS_abc/Clark/Super Man", 200)],
+            urls)
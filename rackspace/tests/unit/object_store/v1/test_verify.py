@@ -0,0 +1,85 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+import testtools
+
+from rackspace.object_store.v1 import verify
+
+
+def _md5(data):
+    return hashlib.md5(data).hexdigest()
+
+
+class TestVerify(testtools.TestCase):
+
+    def setUp(self):
+        super(TestVerify, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        os.mkdir(os.path.join(self.root, "sub"))
+        self.files = {"a": b"first", "sub/b": b"second" * 1000, "empty": b""}
+        for name, data in self.files.items():
+            with open(os.path.join(self.root, *name.split("/")), "wb") as f:
+                f.write(data)
+
+    def test_mmap_md5(self):
+        for name, data in self.files.items():
+            path = os.path.join(self.root, *name.split("/"))
+            self.assertEqual(_md5(data), verify.mmap_md5(path, read_size=7))
+
+    def _objects(self):
+        return iter([("a", _md5(b"first"), False),
+                     ("empty", _md5(b""), False),
+                     ("sub/b", _md5(b"changed"), False),
+                     ("gone", _md5(b""), False),
+                     ("big", "whatever", True)])
+
+    def test_verify(self):
+        report = verify.verify(self._objects(), self.root, processes=1,
+                               batch_size=2)
+
+        self.assertEqual(2, report.matched)
+        self.assertEqual([("sub/b", _md5(self.files["sub/b"]),
+                           _md5(b"changed"))], report.mismatched)
+        self.assertEqual(["gone"], report.missing)
+        self.assertEqual(["big"], report.unverifiable)
+        self.assertEqual([], report.errors)
+        self.assertFalse(report.ok)
+        self.assertEqual("VerifyReport(matched=2, mismatched=1, missing=1, "
+                         "unverifiable=1, errors=0)", repr(report))
+
+    def test_verify_processes(self):
+        report = verify.verify(self._objects(), self.root, processes=2,
+                               batch_size=2)
+
+        self.assertEqual(2, report.matched)
+        self.assertEqual(["sub/b"], [name for name, _, _ in report.mismatched])
+
+    def test_ok(self):
+        report = verify.verify([("a", _md5(b"first"), False),
+                                ("big", "whatever", True)], self.root,
+                               processes=1)
+
+        self.assertTrue(report.ok)
+
+    def test_unreadable(self):
+        report = verify.VerifyReport()
+        report.add(*verify._hash(("a", os.path.join(self.root, "nope"),
+                                  "etag")))
+
+        self.assertEqual(["a"], [name for name, _ in report.errors])
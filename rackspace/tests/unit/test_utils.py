@@ -0,0 +1,213 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import mock
+from openstack import exceptions
+import testtools
+
+from rackspace import utils
+
+
+class TestRetry(testtools.TestCase):
+
+    @mock.patch("time.sleep")
+    def test_succeeds_after_failures(self, mock_sleep):
+        func = mock.Mock(side_effect=[ValueError, ValueError, "done"])
+
+        self.assertEqual("done", utils.retry(func, attempts=3, delay=1))
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         mock_sleep.call_args_list)
+
+    @mock.patch("time.sleep")
+    def test_gives_up(self, mock_sleep):
+        func = mock.Mock(side_effect=ValueError)
+
+        self.assertRaises(ValueError, utils.retry, func, attempts=2)
+        self.assertEqual(2, func.call_count)
+
+    @mock.patch("time.sleep")
+    def test_retry_on(self, mock_sleep):
+        func = mock.Mock(side_effect=[KeyError, ValueError])
+
+        self.assertRaises(ValueError, utils.retry, func, attempts=5,
+                          retry_on=lambda e: isinstance(e, KeyError))
+        self.assertEqual(2, func.call_count)
+
+
+class TestIsRetryable(testtools.TestCase):
+
+    def test_status(self):
+        self.assertTrue(utils.is_retryable(
+            exceptions.HttpException(http_status=503)))
+        self.assertTrue(utils.is_retryable(
+            exceptions.HttpException(http_status=498)))
+        self.assertFalse(utils.is_retryable(
+            exceptions.HttpException(http_status=404)))
+
+    def test_no_status(self):
+        self.assertFalse(utils.is_retryable(ValueError()))
+
+
+class TestJson(testtools.TestCase):
+
+    def setUp(self):
+        super(TestJson, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.path = os.path.join(self.root, "sub", "state.json")
+
+    def test_round_trip(self):
+        utils.save_json(self.path, {"a": [1, 2]})
+        utils.save_json(self.path, {"b": None})
+
+        self.assertEqual({"b": None}, utils.load_json(self.path))
+        self.assertEqual(["state.json"],
+                         os.listdir(os.path.join(self.root, "sub")))
+
+    def test_missing(self):
+        self.assertIsNone(utils.load_json(self.path))
+
+    def test_corrupt(self):
+        os.mkdir(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{")
+
+        self.assertIsNone(utils.load_json(self.path))
+
+    def test_failed_write_keeps_old(self):
+        utils.save_json(self.path, {"a": 1})
+
+        self.assertRaises(TypeError, utils.save_json, self.path,
+                          {"a": object()})
+        self.assertEqual({"a": 1}, utils.load_json(self.path))
+        self.assertEqual(["state.json"],
+                         os.listdir(os.path.join(self.root, "sub")))
+
+
+class TestImap(testtools.TestCase):
+
+    def test_ordered(self):
+        def slow_first(item):
+            if item == 0:
+                time.sleep(0.05)
+            return item * 2
+
+        result = list(utils.imap(slow_first, range(10), workers=3))
+
+        self.assertEqual([(i, i * 2) for i in range(10)], result)
+
+    def test_unordered(self):
+        result = utils.imap(lambda item: item, range(10), workers=3,
+                            ordered=False)
+
+        self.assertEqual(set((i, i) for i in range(10)), set(result))
+
+    def test_error(self):
+        def fail(item):
+            if item == 3:
+                raise ValueError(item)
+            return item
+
+        result = utils.imap(fail, range(10), workers=2)
+
+        self.assertEqual((0, 0), next(result))
+        self.assertRaises(ValueError, list, result)
+
+    def test_error_waits_for_running_calls(self):
+        started = threading.Event()
+        finished = []
+
+        def work(item):
+            if item == 0:
+                started.wait(1)
+                raise ValueError(item)
+            started.set()
+            time.sleep(0.05)
+            finished.append(item)
+
+        self.assertRaises(ValueError, list,
+                          utils.imap(work, range(2), workers=2))
+        self.assertEqual([1], finished)
+
+    def test_consumes_lazily(self):
+        consumed = []
+        lock = threading.Lock()
+
+        def items():
+            for i in range(100):
+                with lock:
+                    consumed.append(i)
+                yield i
+
+        result = utils.imap(lambda item: item, items(), workers=2, backlog=1)
+        next(result)
+        time.sleep(0.05)
+
+        self.assertTrue(len(consumed) <= 4)
+        result.close()
+
+    def test_empty(self):
+        self.assertEqual([], list(utils.imap(lambda item: item, [])))
+
+
+class TestPool(testtools.TestCase):
+
+    def test_submit(self):
+        with utils.Pool(2) as pool:
+            futures = [pool.submit(lambda x, y=0: x * 2 + y, i, y=1)
+                       for i in range(5)]
+            self.assertEqual([1, 3, 5, 7, 9],
+                             [future.result() for future in futures])
+        self.assertTrue(all(future.done() for future in futures))
+
+    def test_error(self):
+        def fail():
+            raise ValueError()
+
+        with utils.Pool(1) as pool:
+            future = pool.submit(fail)
+            self.assertRaises(ValueError, future.result)
+
+    def test_close_waits(self):
+        finished = []
+
+        def work():
+            time.sleep(0.05)
+            finished.append(True)
+
+        pool = utils.Pool(1)
+        pool.submit(work)
+        pool.submit(work)
+        pool.close()
+
+        self.assertEqual([True, True], finished)
+
+
+class TestRateLimiter(testtools.TestCase):
+
+    @mock.patch("time.sleep")
+    @mock.patch("time.time", return_value=100.0)
+    def test_wait(self, mock_time, mock_sleep):
+        limiter = utils.RateLimiter(4)
+
+        limiter.wait()
+        limiter.wait()
+        limiter.wait()
+
+        self.assertEqual([mock.call(0.25), mock.call(0.5)],
+                         mock_sleep.call_args_list)
@@ -0,0 +1,273 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import six
+from six.moves import queue
+
+#: HTTP statuses worth retrying a request after: throttling, including
+#: Swift's 498, and server errors which are usually transient.
+RETRY_CODES = (429, 498, 500, 502, 503, 504)
+
+
+def is_retryable(exc):
+    """Whether a request which raised an exception is worth retrying
+
+    Pass it as the ``retry_on`` of :func:`retry`.
+
+    :returns: ``True`` if the exception carries an ``http_status`` in
+              :data:`RETRY_CODES`.
+    """
+    return getattr(exc, "http_status", None) in RETRY_CODES
+
+
+def load_json(path):
+    """Read a JSON file
+
+    :returns: What the file holds, or ``None`` if it is missing or can't
+              be parsed.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def save_json(path, data):
+    """Write data to a JSON file, replacing the old one in a single step
+
+    The data is written compactly to a temporary file in the same
+    directory, named after ``path`` and ending in ``.tmp``, which is then
+    renamed over ``path``. Neither an interruption nor another thread or
+    process writing the file at the same time can leave a partial one. The
+    directory is created if it doesn't exist.
+    """
+    directory = os.path.dirname(path) or os.curdir
+    try:
+        os.makedirs(directory)
+    except OSError:
+        if not os.path.isdir(directory):
+            raise
+    fd, temp = tempfile.mkstemp(prefix=os.path.basename(path) + ".",
+                                suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        getattr(os, "replace", os.rename)(temp, path)
+    except Exception:
+        os.remove(temp)
+        raise
+
+
+def retry(func, attempts=3, delay=1, backoff=2, retry_on=None):
+    """Call a function until it succeeds or runs out of attempts
+
+    :param func: A callable taking no arguments.
+    :param int attempts: The most times to call ``func``.
+    :param delay: Seconds to wait before the first retry.
+    :param backoff: What to multiply ``delay`` by after each retry.
+    :param retry_on: A callable taking the exception ``func`` raised and
+        returning ``True`` if the call should be retried. By default every
+        exception is retried.
+
+    :returns: The result of ``func``
+    :raises: The last exception raised by ``func`` once it has been called
+             ``attempts`` times, or the first one ``retry_on`` rejects.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == attempts or (retry_on and not retry_on(e)):
+                raise
+        time.sleep(delay)
+        delay *= backoff
+
+
+def imap(func, iterable, workers=4, ordered=True, backlog=None):
+    """Apply a function to every item of an iterable in worker threads
+
+    The iterable is consumed lazily. No more than ``workers + backlog``
+    items are queued, being worked on or, when ``ordered``, finished but
+    held back, so memory use stays flat however long the iterable is.
+
+    :param func: A callable taking one item.
+    :param iterable: The items to call ``func`` with.
+    :param int workers: The number of threads to run ``func`` in.
+    :param bool ordered: When ``True`` results are yielded in the order of
+        ``iterable``, otherwise they are yielded as soon as they finish.
+    :param int backlog: The number of items to queue up for the workers
+        beyond those being worked on. Defaults to ``workers``.
+
+    :returns: A generator of ``(item, result)`` tuples. An exception raised
+              by ``func`` is re-raised where its result would have been
+              yielded, and the remaining work is abandoned. Whether it
+              finishes or not, the generator only returns once no call to
+              ``func`` is running, so resources they share can be released.
+    """
+    limit = workers + (workers if backlog is None else backlog)
+    tasks = queue.Queue()
+    done = queue.Queue()
+    stop = threading.Event()
+
+    def work():
+        while True:
+            task = tasks.get()
+            if task is None or stop.is_set():
+                return
+            index, item = task
+            try:
+                done.put((index, item, func(item), None))
+            except Exception:
+                done.put((index, item, None, sys.exc_info()))
+
+    threads = [threading.Thread(target=work) for _ in range(workers)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    items = enumerate(iterable)
+    pending = 0
+    finished = {}
+    next_index = 0
+    try:
+        while True:
+            for task in itertools.islice(items,
+                                         limit - pending - len(finished)):
+                tasks.put(task)
+                pending += 1
+            if not pending:
+                break
+
+            index, item, result, exc_info = done.get()
+            pending -= 1
+            if not ordered:
+                next_index = index
+            finished[index] = (item, result, exc_info)
+
+            while next_index in finished:
+                item, result, exc_info = finished.pop(next_index)
+                if exc_info is not None:
+                    six.reraise(*exc_info)
+                yield item, result
+                next_index += 1
+    finally:
+        stop.set()
+        for thread in threads:
+            tasks.put(None)
+        for thread in threads:
+            thread.join()
+
+
+class Future(object):
+    """The eventual result of a call submitted to a :class:`Pool`"""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._exc_info = None
+
+    def done(self):
+        return self._done.is_set()
+
+    def result(self):
+        """Wait for the call to finish and return what it returned
+
+        :raises: Whatever the call raised.
+        """
+        self._done.wait()
+        if self._exc_info is not None:
+            six.reraise(*self._exc_info)
+        return self._result
+
+    def _run(self, func, args, kwargs):
+        try:
+            self._result = func(*args, **kwargs)
+        except Exception:
+            self._exc_info = sys.exc_info()
+        self._done.set()
+
+
+class Pool(object):
+    """A fixed number of worker threads which run calls submitted to them
+
+    :param int workers: The number of threads.
+    """
+
+    def __init__(self, workers=4):
+        self._tasks = queue.Queue()
+        self._threads = [threading.Thread(target=self._work)
+                         for _ in range(workers)]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            future, func, args, kwargs = task
+            future._run(func, args, kwargs)
+
+    def submit(self, func, *args, **kwargs):
+        """Queue a call to be run by the next free thread
+
+        :returns: A :class:`Future` for the result of the call
+        """
+        future = Future()
+        self._tasks.put((future, func, args, kwargs))
+        return future
+
+    def close(self):
+        """Wait for every queued call to finish and stop the threads"""
+        for thread in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RateLimiter(object):
+    """Space calls out so no more than a given number start each second
+
+    Call :meth:`wait` before each call. It is safe to share between
+    threads.
+
+    :param float rate: The most calls to start per second.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.time()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)